@@ -5,6 +5,7 @@ Replaces JSON-based user_management.py with SQLAlchemy database operations.
 
 import hashlib
 import json
+import threading
 from datetime import datetime
 from typing import Optional, Dict, List
 from sqlalchemy.exc import IntegrityError
@@ -12,6 +13,25 @@ from sqlalchemy.exc import IntegrityError
 from database.models import User
 from database.db_config import get_session
 
+try:
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
+
+
+# Short-lived cache of profile bundles keyed by username; entries are dropped
+# whenever the user is updated through UserService
+USER_BUNDLE_TTL = 30
+_user_bundle_cache = TTLCache(maxsize=4096, ttl=USER_BUNDLE_TTL) if TTLCache is not None else None
+_user_bundle_lock = threading.Lock()
+
+
+def _invalidate_user_bundle(username: str):
+    """Drop a cached profile bundle after the user changes."""
+    if _user_bundle_cache is not None:
+        with _user_bundle_lock:
+            _user_bundle_cache.pop(username, None)
+
 
 def hash_password(password: str) -> str:
     """Hash password using SHA-256 (upgrade to bcrypt in production)."""
@@ -119,6 +139,38 @@ class UserService:
         finally:
             session.close()
     
+    @staticmethod
+    def get_user_bundle(username: str) -> Dict:
+        """Get name, description and transcript fields in a single query."""
+        if _user_bundle_cache is not None:
+            with _user_bundle_lock:
+                cached = _user_bundle_cache.get(username)
+            if cached is not None:
+                return dict(cached)
+        
+        session = get_session()
+        try:
+            row = session.query(
+                User.name, User.description, User.transcript_file, User.transcript_data
+            ).filter(User.username == username).first()
+        finally:
+            session.close()
+        
+        if row:
+            bundle = {
+                'name': row.name,
+                'description': row.description,
+                'transcript_file': row.transcript_file,
+                'transcript_data': row.transcript_data
+            }
+        else:
+            bundle = {'name': 'Full Name', 'description': '', 'transcript_file': '', 'transcript_data': {}}
+        
+        if _user_bundle_cache is not None:
+            with _user_bundle_lock:
+                _user_bundle_cache[username] = bundle
+        return dict(bundle)
+    
     @staticmethod
     def update_user_transcript(username: str, transcript_file: str, transcript_data: Dict = None):
         """Update user's transcript file and data."""
@@ -133,6 +185,7 @@ class UserService:
                 session.commit()
         finally:
             session.close()
+            _invalidate_user_bundle(username)
     
     @staticmethod
     def update_user_description(username: str, description: str):
@@ -146,6 +199,7 @@ class UserService:
                 session.commit()
         finally:
             session.close()
+            _invalidate_user_bundle(username)
     
     @staticmethod
     def get_user_description(username: str) -> str:
@@ -215,6 +269,7 @@ class UserService:
             return False
         finally:
             session.close()
+            _invalidate_user_bundle(username)
     
     @staticmethod
     def delete_user(username: str) -> bool:
@@ -229,6 +284,7 @@ class UserService:
             return False
         finally:
             session.close()
+            _invalidate_user_bundle(username)
 
 
 # Backward compatibility functions (same interface as old user_management.py)
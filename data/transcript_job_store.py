@@ -0,0 +1,84 @@
+"""
+Transcript Job Storage for EdFast Application.
+Keeps background transcript job status per job ID, in process memory or in Redis.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class InMemoryTranscriptJobStore:
+    """Jobs held in a dict; private to one worker process."""
+
+    shared = False
+
+    def __init__(self, ttl: int):
+        self._ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return one job record, or None if it does not exist or has expired."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def put(self, job_id: str, job: Dict):
+        """Store a job record, forgetting jobs older than the TTL."""
+        now = time.time()
+        with self._lock:
+            for old_id in [jid for jid, old in self._jobs.items() if now - old['created'] > self._ttl]:
+                del self._jobs[old_id]
+            self._jobs[job_id] = dict(job)
+
+
+class RedisTranscriptJobStore:
+    """Jobs stored as JSON strings with a TTL, shared by all workers."""
+
+    shared = True
+
+    def __init__(self, client, ttl: int, prefix: str = "transcript_job:"):
+        self._client = client
+        self._ttl = ttl
+        self._prefix = prefix
+
+    def _key(self, job_id: str) -> str:
+        return f"{self._prefix}{job_id}"
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return one job record, or None if it does not exist or has expired."""
+        payload = self._client.get(self._key(job_id))
+        return json.loads(payload) if payload is not None else None
+
+    def put(self, job_id: str, job: Dict):
+        """Store a job record; Redis drops it after the TTL."""
+        self._client.set(self._key(job_id), json.dumps(job), ex=self._ttl)
+
+
+def create_transcript_job_store(ttl: int):
+    """Create the transcript job store for this process.
+
+    Uses Redis when REDIS_URL is set and the redis package is installed,
+    otherwise falls back to process memory.
+    """
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url and redis is not None:
+        try:
+            client = redis.Redis.from_url(redis_url)
+            client.ping()
+            print(f"Transcript job store: Redis at {redis_url}")
+            return RedisTranscriptJobStore(client, ttl)
+        except Exception as e:
+            print(f"Could not connect to Redis ({str(e)}), storing transcript jobs in memory")
+    elif redis_url:
+        print("Warning: REDIS_URL is set but redis is not installed, storing transcript jobs in memory")
+
+    return InMemoryTranscriptJobStore(ttl)
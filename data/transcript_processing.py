@@ -3,13 +3,25 @@ Transcript processing module for EdFast application.
 Handles transcript processing using Google's Gemini AI.
 """
 
+import io
 import json
 import logging
 import google.generativeai as genai
+from PIL import Image
 from config.constants import GEMINI_API_KEY, GEMINI_MODEL_NAME
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 logger = logging.getLogger(__name__)
 
+# Transcript images are downscaled and re-encoded before being sent to Gemini
+TRANSCRIPT_MAX_SIDE = 1600
+TRANSCRIPT_JPEG_QUALITY = 85
+PDF_RENDER_DPI = 150
+
 
 def initialize_gemini_api():
     """Initialize Gemini API with the configured API key."""
@@ -71,8 +83,62 @@ Return ONLY the JSON object without any additional explanation.
     return prompt_text
 
 
+def _render_pdf_pages(file_path):
+    """Rasterize every PDF page and stack them into one image.
+    
+    Returns:
+        Tuple of (image, page count)
+    """
+    if pdfium is None:
+        raise ValueError("PDF transcripts require pypdfium2 to be installed")
+    
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        pages = [pdf[i].render(scale=PDF_RENDER_DPI / 72).to_pil() for i in range(len(pdf))]
+    finally:
+        pdf.close()
+    
+    if not pages:
+        raise ValueError("PDF transcript has no pages")
+    if len(pages) == 1:
+        return pages[0], 1
+    
+    width = max(page.width for page in pages)
+    stacked = Image.new('RGB', (width, sum(page.height for page in pages)), 'white')
+    offset = 0
+    for page in pages:
+        stacked.paste(page, (0, offset))
+        offset += page.height
+    return stacked, len(pages)
+
+
+def prepare_transcript_image(file_path):
+    """Load a transcript upload as a single downscaled JPEG.
+    
+    Images are shrunk to at most TRANSCRIPT_MAX_SIDE pixels per page side;
+    PDFs are rendered at PDF_RENDER_DPI with pages stacked vertically.
+    
+    Returns:
+        JPEG bytes ready for extract_transcript_with_gemini
+    """
+    if file_path.lower().endswith('.pdf'):
+        image, pages = _render_pdf_pages(file_path)
+    else:
+        image = Image.open(file_path)
+        pages = 1
+    
+    image.thumbnail((TRANSCRIPT_MAX_SIDE, TRANSCRIPT_MAX_SIDE * pages), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.convert('RGB').save(buffer, format='JPEG', quality=TRANSCRIPT_JPEG_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
 def extract_transcript_with_gemini(image):
-    """Extract transcript data from an image using Gemini."""
+    """Extract transcript data from an image using Gemini.
+    
+    Args:
+        image: PIL image, or JPEG bytes from prepare_transcript_image
+    """
     model = initialize_gemini_api()
     if model is None:
         logger.error("Gemini API key is not set or invalid.")
@@ -80,6 +146,8 @@ def extract_transcript_with_gemini(image):
     
     try:
         prompt = make_transcript_prompt()
+        if isinstance(image, bytes):
+            image = {'mime_type': 'image/jpeg', 'data': image}
         response = model.generate_content([prompt, image])
         extracted_text = response.text
         
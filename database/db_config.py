@@ -4,13 +4,15 @@ Supports both PostgreSQL (production) and SQLite (development).
 """
 
 import os
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, delete, event, func, inspect, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.pool import StaticPool
 from contextlib import contextmanager
 import logging
 
-from database.models import Base
+from database.models import Base, Post, Comment, Vote
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -70,28 +72,138 @@ class DatabaseConfig:
             # PostgreSQL settings
             self.engine = create_engine(
                 self.db_url,
-                pool_size=10,
-                max_overflow=20,
+                pool_size=int(os.getenv('DB_POOL_SIZE', 20)),
+                max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 10)),
                 pool_pre_ping=True,
-                echo=False  # Set to True for SQL debugging
+                # Replace connections before idle timeouts on the network path close them
+                pool_recycle=int(os.getenv('DB_POOL_RECYCLE', 1800)),
+                echo=False,  # Set to True for SQL debugging
+                **self._driver_options()
             )
         
-        # Create session factory
+        # Create session factory; objects stay readable after commit so
+        # services can return them once their session is closed
         self.SessionLocal = scoped_session(
-            sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+            sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=self.engine)
         )
         
         logger.info(f"Database engine initialized: {self.db_type}")
         return self.engine
     
+    def _driver_options(self):
+        """Driver-specific PostgreSQL engine options."""
+        driver = make_url(self.db_url).get_driver_name()
+        # libpq TCP keepalives notice dead peers on pooled, idle connections
+        keepalives = {
+            'keepalives': 1,
+            'keepalives_idle': int(os.getenv('DB_KEEPALIVES_IDLE', 30)),
+            'keepalives_interval': int(os.getenv('DB_KEEPALIVES_INTERVAL', 10)),
+        }
+        if driver == 'psycopg':
+            # psycopg 3 prepares a statement server-side once it has run
+            # prepare_threshold times on a connection
+            return {'connect_args': {
+                'prepare_threshold': int(os.getenv('DB_PREPARE_THRESHOLD', 3)),
+                **keepalives,
+            }}
+        if driver == 'psycopg2':
+            # psycopg2 cannot prepare statements; page executemany batches instead
+            return {'executemany_mode': 'values_plus_batch', 'connect_args': keepalives}
+        return {}
+    
     def create_tables(self):
         """Create all database tables."""
         if not self.engine:
             self.init_engine()
         
         Base.metadata.create_all(bind=self.engine)
+        self.upgrade_schema()
         logger.info("All database tables created successfully")
     
+    def upgrade_schema(self):
+        """
+        Bring tables created by older versions up to the current models.
+        
+        create_all() only creates missing tables, so columns, indexes and
+        constraints added to existing tables are applied here. Every step
+        checks the live schema first, so this is safe to run on each start.
+        """
+        if not self.engine:
+            self.init_engine()
+        
+        posts = Post.__table__
+        with self.engine.begin() as conn:
+            dialect = conn.dialect.name
+            inspector = inspect(conn)
+            post_columns = {c['name']: c for c in inspector.get_columns('posts')}
+            
+            # jsonb tags (containment operator and GIN index need it)
+            if dialect == 'postgresql' and not isinstance(post_columns['tags']['type'], JSONB):
+                conn.execute(text('ALTER TABLE posts ALTER COLUMN tags TYPE jsonb USING tags::jsonb'))
+                logger.info("Upgraded posts.tags to jsonb")
+            
+            # Generated score and engagement columns; SQLite can only add virtual ones
+            for column in (posts.c.score, posts.c.engagement):
+                if column.name not in post_columns:
+                    storage = 'STORED' if dialect == 'postgresql' else 'VIRTUAL'
+                    conn.execute(text(
+                        f'ALTER TABLE posts ADD COLUMN {column.name} INTEGER '
+                        f'GENERATED ALWAYS AS ({column.computed.sqltext}) {storage}'
+                    ))
+                    logger.info(f"Added generated column posts.{column.name}")
+            
+            # Indexes declared on tables that already existed
+            for table in (posts, Comment.__table__, Vote.__table__):
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+            
+            # One vote per user and target: drop duplicates, then enforce it
+            votes = Vote.__table__
+            unique_names = {c['name'] for c in inspector.get_unique_constraints('votes')}
+            unique_names |= {i['name'] for i in inspector.get_indexes('votes') if i['unique']}
+            for name, target_column, target_table in (
+                ('uq_votes_user_post', votes.c.post_id, posts),
+                ('uq_votes_user_comment', votes.c.comment_id, Comment.__table__),
+            ):
+                if name in unique_names:
+                    continue
+                self._delete_duplicate_votes(conn, target_column, target_table)
+                # A unique index also serves as the ON CONFLICT target
+                conn.execute(text(f'CREATE UNIQUE INDEX {name} ON votes (user_id, {target_column.name})'))
+                logger.info(f"Added unique index {name}")
+    
+    @staticmethod
+    def _delete_duplicate_votes(conn, target_column, target_table):
+        """Keep each user's latest vote per target and recount the affected targets."""
+        votes = Vote.__table__
+        ranked = select(
+            votes.c.id,
+            target_column.label('target_id'),
+            func.row_number().over(
+                partition_by=(votes.c.user_id, target_column),
+                order_by=(votes.c.created_at.desc(), votes.c.id.desc())
+            ).label('position')
+        ).where(target_column.isnot(None)).subquery()
+        duplicates = conn.execute(
+            select(ranked.c.id, ranked.c.target_id).where(ranked.c.position > 1)
+        ).all()
+        if not duplicates:
+            return
+        
+        conn.execute(delete(votes).where(votes.c.id.in_([vote_id for vote_id, _ in duplicates])))
+        
+        def count(vote_type):
+            return select(func.count()).where(
+                target_column == target_table.c.id, votes.c.vote_type == vote_type
+            ).scalar_subquery()
+        
+        conn.execute(
+            update(target_table)
+            .where(target_table.c.id.in_({target_id for _, target_id in duplicates}))
+            .values(upvotes=count('upvote'), downvotes=count('downvote'))
+        )
+        logger.warning(f"Removed {len(duplicates)} duplicate vote(s) on {target_table.name}")
+    
     def drop_tables(self):
         """Drop all database tables (use with caution!)."""
         if not self.engine:
@@ -132,6 +244,19 @@ class DatabaseConfig:
             self.init_engine()
         return self.SessionLocal()
     
+    def reset_after_fork(self):
+        """
+        Forget the engine and sessions inherited from a parent process.
+        
+        Call in a forked worker before it uses the database; the engine and
+        session registry are rebuilt on first use, inside the worker.
+        """
+        if self.engine is not None:
+            # close=False leaves the parent's connections alone
+            self.engine.dispose(close=False)
+        self.engine = None
+        self.SessionLocal = None
+    
     def close_all_sessions(self):
         """Close all database sessions."""
         if self.SessionLocal:
@@ -192,3 +317,28 @@ def get_session():
     return db_config.get_db_session()
 
 
+@contextmanager
+def session_scope(read_only=False):
+    """
+    Provide the thread's session for a unit of work.
+    
+    Commits on success and rolls back on error; read_only skips the commit
+    for plain lookups. The session is closed (its connection returned to the
+    pool) on exit.
+    
+    Usage:
+        with session_scope() as session:
+            session.add(post)
+    """
+    session = db_config.get_db_session()
+    try:
+        yield session
+        if not read_only:
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
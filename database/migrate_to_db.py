@@ -16,6 +16,11 @@ from database.db_config import init_database
 from database.models import User, Post, Comment, Vote
 from auth.db_user_service import hash_password
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
 
 class DataMigrator:
     """Handles migration of JSON data to database."""
@@ -33,6 +38,23 @@ class DataMigrator:
         print(log_message)
         self.migration_log.append(log_message)
     
+    def _load_peerhub_data(self, file_path: str):
+        """
+        Load a PeerHub data file, preferring the .msgpack copy PeerHub writes when msgspec is installed.
+        
+        Returns None if neither the .msgpack nor the .json file exists.
+        """
+        msgpack_path = os.path.splitext(file_path)[0] + '.msgpack'
+        if os.path.exists(msgpack_path):
+            if msgspec is not None:
+                with open(msgpack_path, 'rb') as f:
+                    return msgspec.msgpack.decode(f.read())
+            self.log(f"WARNING: {msgpack_path} needs msgspec (pip install msgspec), reading {file_path} instead")
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, 'r') as f:
+            return json.load(f)
+    
     def migrate_users(self, users_file='users.json'):
         """Migrate users from JSON to database."""
         self.log("=" * 60)
@@ -147,13 +169,11 @@ class DataMigrator:
         self.log("Starting Posts Migration")
         self.log("=" * 60)
         
-        if not os.path.exists(posts_file):
-            self.log(f"WARNING: {posts_file} not found, skipping...")
+        posts_data = self._load_peerhub_data(posts_file)
+        if posts_data is None:
+            self.log(f"WARNING: {posts_file} (or its .msgpack copy) not found, skipping...")
             return
         
-        with open(posts_file, 'r') as f:
-            posts_data = json.load(f)
-        
         session = self.db_config.get_db_session()
         post_id_mapping = {}
         
@@ -213,13 +233,11 @@ class DataMigrator:
         self.log("Starting Comments Migration")
         self.log("=" * 60)
         
-        if not os.path.exists(comments_file):
-            self.log(f"WARNING: {comments_file} not found, skipping...")
+        comments_data = self._load_peerhub_data(comments_file)
+        if comments_data is None:
+            self.log(f"WARNING: {comments_file} (or its .msgpack copy) not found, skipping...")
             return
         
-        with open(comments_file, 'r') as f:
-            comments_data = json.load(f)
-        
         session = self.db_config.get_db_session()
         
         try:
@@ -271,13 +289,11 @@ class DataMigrator:
         self.log("Starting Votes Migration")
         self.log("=" * 60)
         
-        if not os.path.exists(votes_file):
-            self.log(f"WARNING: {votes_file} not found, skipping...")
+        votes_data = self._load_peerhub_data(votes_file)
+        if votes_data is None:
+            self.log(f"WARNING: {votes_file} (or its .msgpack copy) not found, skipping...")
             return
         
-        with open(votes_file, 'r') as f:
-            votes_data = json.load(f)
-        
         session = self.db_config.get_db_session()
         
         try:
@@ -331,7 +347,10 @@ class DataMigrator:
             'peerhub_data/users.json',
             'peerhub_data/posts.json',
             'peerhub_data/comments.json',
-            'peerhub_data/votes.json'
+            'peerhub_data/votes.json',
+            'peerhub_data/posts.msgpack',
+            'peerhub_data/comments.msgpack',
+            'peerhub_data/votes.msgpack'
         ]
         
         for file_path in files_to_backup:
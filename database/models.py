@@ -3,9 +3,13 @@ SQLAlchemy Database Models for EdFast Application.
 Defines all database tables and relationships.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Float, Table
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Float, Table, Index,
+    Computed, DDL, UniqueConstraint, event, func, cast, literal_column, null, text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 from datetime import datetime
 import uuid
 
@@ -60,7 +64,7 @@ class Post(Base):
     author_id = Column(String(36), ForeignKey('users.id'), nullable=False)
     
     # Post metadata
-    tags = Column(JSON)  # List of tags
+    tags = Column(JSON().with_variant(JSONB(), 'postgresql'))  # List of tags; jsonb on PostgreSQL
     file_link = Column(String(500))
     course_code = Column(String(50))
     course_name = Column(String(200))
@@ -72,6 +76,14 @@ class Post(Base):
     comments_count = Column(Integer, default=0)
     views_count = Column(Integer, default=0)
     
+    # Leading part of content, loaded instead of the full body by list queries;
+    # None when a query did not ask for it
+    content_preview = query_expression(null())
+    
+    # Stored by the database so sorting by them can use an index
+    score = Column(Integer, Computed('upvotes - downvotes', persisted=True))
+    engagement = Column(Integer, Computed('upvotes - downvotes + comments_count', persisted=True))
+    
     # Flags
     is_pinned = Column(Boolean, default=False)
     is_deleted = Column(Boolean, default=False)
@@ -85,14 +97,90 @@ class Post(Base):
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
     votes = relationship("Vote", back_populates="post", cascade="all, delete-orphan")
     
-    @property
-    def score(self):
-        return self.upvotes - self.downvotes
+    __table_args__ = (
+        # Speeds tag containment and tag aggregation; PostgreSQL only
+        Index('ix_posts_tags', 'tags', postgresql_using='gin').ddl_if(dialect='postgresql'),
+        # Full-text index over POST_SEARCH_VECTOR; PostgreSQL only
+        Index(
+            'posts_search_idx', text("to_tsvector('english', title || ' ' || content)"),
+            postgresql_using='gin'
+        ).ddl_if(dialect='postgresql'),
+    )
+    
+    # Fetch the computed score and engagement in the INSERT's RETURNING, so
+    # new posts are complete without a refresh
+    __mapper_args__ = {'eager_defaults': True}
     
     def __repr__(self):
         return f"<Post(id='{self.id}', title='{self.title[:30]}...')>"
 
 
+# Full-text search document of a post (PostgreSQL). Matches the posts_search_idx
+# expression; literals are inlined so the planner can use the index.
+POST_SEARCH_VECTOR = func.to_tsvector(
+    literal_column("'english'"),
+    Post.title + literal_column("' '", String) + Post.content
+)
+
+# Feed sort and keyset pagination indexes, plus trending, over live posts only
+Index(
+    'posts_feed_idx', Post.__table__.c.created_at.desc(), Post.__table__.c.id.desc(),
+    postgresql_where=Post.__table__.c.is_deleted == False,
+    sqlite_where=Post.__table__.c.is_deleted == False
+)
+Index(
+    'posts_score_idx', Post.__table__.c.score.desc(), Post.__table__.c.id.desc(),
+    postgresql_where=Post.__table__.c.is_deleted == False,
+    sqlite_where=Post.__table__.c.is_deleted == False
+)
+Index(
+    'posts_comments_idx', Post.__table__.c.comments_count.desc(), Post.__table__.c.id.desc(),
+    postgresql_where=Post.__table__.c.is_deleted == False,
+    sqlite_where=Post.__table__.c.is_deleted == False
+)
+Index(
+    'posts_engagement_idx', Post.__table__.c.engagement.desc(),
+    postgresql_where=Post.__table__.c.is_deleted == False,
+    sqlite_where=Post.__table__.c.is_deleted == False
+)
+
+# Author and course filters over live posts, in feed order
+Index(
+    'posts_author_active', Post.__table__.c.author_id, Post.__table__.c.created_at.desc(),
+    postgresql_where=Post.__table__.c.is_deleted == False,
+    sqlite_where=Post.__table__.c.is_deleted == False
+)
+Index(
+    'posts_course_active', Post.__table__.c.course_code, Post.__table__.c.created_at.desc(),
+    postgresql_where=Post.__table__.c.is_deleted == False,
+    sqlite_where=Post.__table__.c.is_deleted == False
+)
+
+# Trigram index for substring matches on the tags text (search_type="tags");
+# exact tag filters use the jsonb GIN index ix_posts_tags. PostgreSQL only.
+Index(
+    'posts_tags_trgm', func.lower(cast(Post.__table__.c.tags, String)).label('tags_text'),
+    postgresql_using='gin', postgresql_ops={'tags_text': 'gin_trgm_ops'}
+).ddl_if(dialect='postgresql')
+
+# Trigram indexes serving case-insensitive substring search (ILIKE '%...%')
+# on title and content. PostgreSQL only.
+Index(
+    'posts_title_trgm', Post.__table__.c.title,
+    postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+).ddl_if(dialect='postgresql')
+Index(
+    'posts_content_trgm', Post.__table__.c.content,
+    postgresql_using='gin', postgresql_ops={'content': 'gin_trgm_ops'}
+).ddl_if(dialect='postgresql')
+
+# gin_trgm_ops comes from the pg_trgm extension
+event.listen(
+    Base.metadata, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+
 class Comment(Base):
     """Comment model for post discussions."""
     
@@ -131,6 +219,19 @@ class Comment(Base):
         return f"<Comment(id='{self.id}', post_id='{self.post_id}')>"
 
 
+# A post's live comments in thread order, and a user's live comments
+Index(
+    'comments_post_active', Comment.__table__.c.post_id, Comment.__table__.c.created_at,
+    postgresql_where=Comment.__table__.c.is_deleted == False,
+    sqlite_where=Comment.__table__.c.is_deleted == False
+)
+Index(
+    'comments_author_active', Comment.__table__.c.author_id,
+    postgresql_where=Comment.__table__.c.is_deleted == False,
+    sqlite_where=Comment.__table__.c.is_deleted == False
+)
+
+
 class Vote(Base):
     """Vote model for posts and comments."""
     
@@ -151,6 +252,12 @@ class Vote(Base):
     post = relationship("Post", back_populates="votes")
     comment = relationship("Comment", back_populates="votes")
     
+    # One vote per user and target; also the conflict targets for vote upserts
+    __table_args__ = (
+        UniqueConstraint('user_id', 'post_id', name='uq_votes_user_post'),
+        UniqueConstraint('user_id', 'comment_id', name='uq_votes_user_comment'),
+    )
+    
     def __repr__(self):
         target = f"post:{self.post_id}" if self.post_id else f"comment:{self.comment_id}"
         return f"<Vote(user_id='{self.user_id}', {target}, type='{self.vote_type}')>"
@@ -49,7 +49,7 @@ export default function LinkedInJobSearch() {
     location: 'San Francisco, CA',
     results_wanted: 20,
     is_remote: false,
-    linkedin_fetch_description: true
+    linkedin_fetch_description: false
   });
   
   const [jobs, setJobs] = useState<Job[]>([]);
@@ -9,9 +9,9 @@ interface Post {
   post_url: string;
   content: string;
   type: string;
-  like_count: string;
-  comment_count: string;
-  repost_count: string;
+  like_count: number;
+  comment_count: number;
+  repost_count: number;
   img_url: string;
   video_url: string;
   author_name: string;
@@ -85,9 +85,9 @@ export default function LinkedInPostScraper() {
           post_url: post.post_url || '',
           content: post.content || '',
           type: post.type || 'text',
-          like_count: post.like_count || '0',
-          comment_count: post.comment_count || '0',
-          repost_count: post.repost_count || '0',
+          like_count: post.like_count || 0,
+          comment_count: post.comment_count || 0,
+          repost_count: post.repost_count || 0,
           img_url: post.img_url || '',
           video_url: post.video_url || '',
           author_name: post.author_name || post.profile_name || '',
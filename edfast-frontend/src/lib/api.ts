@@ -374,6 +374,11 @@ class APIClient {
     return response.data;
   }
 
+  async getLinkedInJobDescriptions(jobUrls: string[]) {
+    const response = await this.client.post('/linkedin/jobs/descriptions', { job_urls: jobUrls });
+    return response.data;
+  }
+
   async scrapeLinkedInPosts(params: {
     profile_url: string;
     max_posts: number;
@@ -0,0 +1,30 @@
+"""
+Process Bootstrap
+Loads the project .env and puts the project root on sys.path, once per process.
+Imported for its side effects by app.py and run.py.
+"""
+
+import os
+import sys
+from functools import lru_cache
+from dotenv import load_dotenv
+
+# Project root holds .env and the shared packages (auth, database, timetable, ...)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_FILE = os.path.join(PROJECT_ROOT, '.env')
+
+
+@lru_cache(maxsize=1)
+def load_env():
+    """Load the project .env into os.environ; later calls are no-ops"""
+    return load_dotenv(ENV_FILE)
+
+
+def add_project_root():
+    """Put the project root first on sys.path unless it is already there"""
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+
+
+load_env()
+add_project_root()
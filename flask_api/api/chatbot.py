@@ -8,6 +8,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 import sys
 import os
 import logging
+from datetime import datetime
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -146,13 +147,13 @@ def chat_query():
         chat_histories[username].append({
             'role': 'user',
             'content': user_input,
-            'timestamp': __import__('datetime').datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat()
         })
         
         chat_histories[username].append({
             'role': 'assistant',
             'content': response,
-            'timestamp': __import__('datetime').datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat()
         })
         
         # Keep only last 20 messages
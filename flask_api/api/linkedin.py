@@ -14,17 +14,32 @@ from typing import Dict, Any, List
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from linkedin.job_scraper import LinkedInJobScraper
-from linkedin.post_scraper import LinkedInPostScraper
 from linkedin.models import LinkedInJob, LinkedInPost, LinkedInScrapingSession
 
 # Create blueprint
 linkedin_bp = Blueprint('linkedin', __name__)
 
-# Global scraper instances (in production, use proper session management)
-job_scraper = LinkedInJobScraper()
+# Global scraper instances (in production, use proper session management).
+# The scrapers pull in jobspy, pandas and selenium, so they are only
+# imported when a LinkedIn endpoint first needs them.
+_job_scraper = None
 post_scraper = None  # Will be initialized when needed
 
+
+def get_job_scraper():
+    """Return the shared job scraper, creating it on first use."""
+    global _job_scraper
+    if _job_scraper is None:
+        from linkedin.job_scraper import LinkedInJobScraper
+        _job_scraper = LinkedInJobScraper()
+    return _job_scraper
+
+
+def get_post_scraper_class():
+    """Import the Selenium-based post scraper on first use."""
+    from linkedin.post_scraper import LinkedInPostScraper
+    return LinkedInPostScraper
+
 @linkedin_bp.route('/jobs/search', methods=['POST'])
 @jwt_required()
 def search_jobs():
@@ -39,7 +54,7 @@ def search_jobs():
         "hours_old": 24,
         "job_type": "fulltime",
         "is_remote": false,
-        "linkedin_fetch_description": true
+        "linkedin_fetch_description": false
     }
     """
     try:
@@ -57,7 +72,7 @@ def search_jobs():
         hours_old = data.get('hours_old')
         job_type = data.get('job_type')
         is_remote = data.get('is_remote', False)
-        linkedin_fetch_description = data.get('linkedin_fetch_description', True)
+        linkedin_fetch_description = data.get('linkedin_fetch_description', False)
         
         # Validate job_type
         if job_type and job_type not in ['fulltime', 'parttime', 'internship', 'contract']:
@@ -78,6 +93,7 @@ def search_jobs():
         )
         
         # Scrape jobs
+        job_scraper = get_job_scraper()
         jobs_df = job_scraper.scrape_jobs(
             search_term=search_term,
             location=location,
@@ -94,9 +110,11 @@ def search_jobs():
             stats = job_scraper.get_job_statistics(jobs_df)
             
             # Update session
-            session.results_count = len(jobs_list)
-            session.completed_at = datetime.now().isoformat()
-            session.status = "completed"
+            session = session.replace(
+                results_count=len(jobs_list),
+                completed_at=datetime.now().isoformat(),
+                status="completed"
+            )
             
             return jsonify({
                 'success': True,
@@ -110,9 +128,11 @@ def search_jobs():
             }), 200
         else:
             # Update session
-            session.completed_at = datetime.now().isoformat()
-            session.status = "completed"
-            session.error_message = "No jobs found"
+            session = session.replace(
+                completed_at=datetime.now().isoformat(),
+                status="completed",
+                error_message="No jobs found"
+            )
             
             return jsonify({
                 'success': True,
@@ -139,6 +159,68 @@ def search_jobs():
             'message': str(e)
         }), 500
 
+@linkedin_bp.route('/jobs/descriptions', methods=['POST'])
+@jwt_required()
+def get_job_descriptions():
+    """
+    Fetch full descriptions for jobs returned by /jobs/search.
+    
+    Request Body:
+    {
+        "job_urls": ["https://www.linkedin.com/jobs/view/1234567890"]
+    }
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No JSON data provided'
+            }), 400
+        
+        job_urls = data.get('job_urls')
+        if not isinstance(job_urls, list) or not job_urls:
+            return jsonify({
+                'success': False,
+                'error': 'job_urls must be a non-empty list'
+            }), 400
+        
+        # Only LinkedIn job pages are fetched; never let callers point the
+        # server at arbitrary hosts
+        from linkedin.job_scraper import is_linkedin_job_url
+        invalid_urls = [url for url in job_urls if not is_linkedin_job_url(url)]
+        if invalid_urls:
+            return jsonify({
+                'success': False,
+                'error': 'job_urls must be https://www.linkedin.com/jobs/view/<id> URLs',
+                'message': f'{len(invalid_urls)} invalid URL(s)'
+            }), 400
+        
+        job_urls = job_urls[:100]  # Limit to 100, same as /jobs/search
+        descriptions = get_job_scraper().fetch_job_descriptions(job_urls)
+        
+        return jsonify({
+            'success': True,
+            'message': f'Fetched {sum(1 for d in descriptions.values() if d)} of {len(descriptions)} job descriptions',
+            'data': {
+                'descriptions': descriptions
+            }
+        }), 200
+        
+    except ImportError as e:
+        return jsonify({
+            'success': False,
+            'error': 'LinkedIn job descriptions not available',
+            'message': str(e)
+        }), 503
+    except Exception as e:
+        current_app.logger.error(f"LinkedIn job description error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error',
+            'message': str(e)
+        }), 500
+
 @linkedin_bp.route('/posts/scrape', methods=['POST'])
 @jwt_required()
 def scrape_posts():
@@ -149,7 +231,8 @@ def scrape_posts():
     {
         "profile_url": "https://www.linkedin.com/company/example/posts/",
         "max_posts": 50,
-        "headless": false
+        "headless": false,
+        "disable_images": false
     }
     """
     try:
@@ -169,10 +252,11 @@ def scrape_posts():
         
         max_posts = min(data.get('max_posts', 50), 200)  # Limit to 200
         headless = data.get('headless', False)
+        disable_images = data.get('disable_images', False)
         
         # Initialize post scraper
         global post_scraper
-        post_scraper = LinkedInPostScraper(headless=headless)
+        post_scraper = get_post_scraper_class()(headless=headless, disable_images=disable_images)
         
         if not post_scraper.setup_chrome():
             return jsonify({
@@ -200,16 +284,19 @@ def scrape_posts():
             }), 401
         
         # Scrape posts
-        posts_data = post_scraper.scrape_posts_from_profile(profile_url, max_posts)
+        post_rows = post_scraper.scrape_post_rows(profile_url, max_posts)
         
         # Close scraper
         post_scraper.close()
         
-        if posts_data:
+        if post_rows:
+            posts_data = post_scraper.format_posts_for_api(post_rows)
             # Update session
-            session.results_count = len(posts_data)
-            session.completed_at = datetime.now().isoformat()
-            session.status = "completed"
+            session = session.replace(
+                results_count=len(posts_data),
+                completed_at=datetime.now().isoformat(),
+                status="completed"
+            )
             
             return jsonify({
                 'success': True,
@@ -218,14 +305,16 @@ def scrape_posts():
                 'data': {
                     'posts': posts_data,
                     'profile_url': profile_url,
-                    'scraped_at': datetime.now().isoformat()
+                    'scraped_at': session.completed_at
                 }
             }), 200
         else:
             # Update session
-            session.completed_at = datetime.now().isoformat()
-            session.status = "completed"
-            session.error_message = "No posts found"
+            session = session.replace(
+                completed_at=datetime.now().isoformat(),
+                status="completed",
+                error_message="No posts found"
+            )
             
             return jsonify({
                 'success': True,
@@ -259,8 +348,8 @@ def get_job_statistics():
     """Get statistics about available job scraping functionality."""
     try:
         stats = {
-            'job_scraper_available': job_scraper.scraper_available,
-            'post_scraper_available': LinkedInPostScraper().selenium_available,
+            'job_scraper_available': get_job_scraper().scraper_available,
+            'post_scraper_available': get_post_scraper_class()().selenium_available,
             'supported_job_types': ['fulltime', 'parttime', 'internship', 'contract'],
             'max_results_per_search': 100,
             'max_posts_per_scrape': 200
@@ -283,10 +372,12 @@ def get_job_statistics():
 def linkedin_health():
     """Health check for LinkedIn scraping functionality."""
     try:
+        job_scraper_available = get_job_scraper().scraper_available
+        post_scraper_available = get_post_scraper_class()().selenium_available
         health_status = {
-            'job_scraper': job_scraper.scraper_available,
-            'post_scraper': LinkedInPostScraper().selenium_available,
-            'status': 'healthy' if (job_scraper.scraper_available or LinkedInPostScraper().selenium_available) else 'degraded'
+            'job_scraper': job_scraper_available,
+            'post_scraper': post_scraper_available,
+            'status': 'healthy' if (job_scraper_available or post_scraper_available) else 'degraded'
         }
         
         return jsonify({
@@ -341,9 +432,9 @@ def get_sample_posts():
         'post_url': 'https://www.linkedin.com/posts/example-1234567890',
         'content': 'This is a sample LinkedIn post content...',
         'type': 'Original',
-        'like_count': '25',
-        'comment_count': '5',
-        'repost_count': '3',
+        'like_count': 25,
+        'comment_count': 5,
+        'repost_count': 3,
         'img_url': 'https://example.com/image.jpg',
         'image_drive_link': 'https://drive.google.com/uc?id=example',
         'post_date': '2 days ago',
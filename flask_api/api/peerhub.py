@@ -25,6 +25,14 @@ def get_user_id_from_username(username):
     return username
 
 
+def content_preview(post, length=200):
+    """Shorten post content for list views, using the preloaded preview if there is one"""
+    content = getattr(post, 'content_preview', None)
+    if content is None:
+        content = post.content
+    return content[:length] + '...' if len(content) > length else content
+
+
 @peerhub_bp.route('/posts', methods=['GET'])
 def get_posts():
     """
@@ -33,6 +41,8 @@ def get_posts():
     Query Parameters:
         limit: Number of posts (default: 50)
         offset: Offset for pagination (default: 0)
+        after_id: ID of the last post of the previous page; fetches the next
+            page by keyset instead of offset
         tag: Filter by tag
         author: Filter by author username
         course_code: Filter by course code
@@ -47,6 +57,7 @@ def get_posts():
         author_username = request.args.get('author')
         course_code = request.args.get('course_code')
         sort_by = request.args.get('sort_by', 'created_at')
+        after_id = request.args.get('after_id')
         
         # Get author ID if username provided
         author_id = None
@@ -59,7 +70,8 @@ def get_posts():
             tag=tag,
             author_id=author_id,
             course_code=course_code,
-            sort_by=sort_by
+            sort_by=sort_by,
+            after_id=after_id
         )
         
         posts_data = []
@@ -351,10 +363,19 @@ def delete_post(post_id):
 
 @peerhub_bp.route('/posts/<post_id>/comments', methods=['GET'])
 def get_comments(post_id):
-    """Get comments for a post"""
+    """
+    Get comments for a post
+    
+    Query Parameters:
+        limit: Number of comments (default: all)
+        after_id: ID of the last comment of the previous page
+    """
     try:
         service = PeerHubService()
-        comments = service.get_comments(post_id)
+        
+        limit = int(request.args['limit']) if request.args.get('limit') else None
+        after_id = request.args.get('after_id')
+        comments = service.get_comments(post_id, limit=limit, after_id=after_id)
         
         comments_data = []
         for c in comments:
@@ -534,7 +555,7 @@ def search_posts():
             post_data = p.to_dict() if hasattr(p, 'to_dict') else {
                 'post_id': p.id if hasattr(p, 'id') else p.post_id,
                 'title': p.title,
-                'content': p.content[:200] + '...' if len(p.content) > 200 else p.content,
+                'content': content_preview(p),
                 'author_id': p.author_id,
                 'author_name': author_name,
                 'author_username': author_username,
@@ -587,7 +608,7 @@ def get_trending():
             post_data = p.to_dict() if hasattr(p, 'to_dict') else {
                 'post_id': p.id if hasattr(p, 'id') else p.post_id,
                 'title': p.title,
-                'content': p.content[:200] + '...' if len(p.content) > 200 else p.content,
+                'content': content_preview(p),
                 'author_id': p.author_id,
                 'author_name': author_name,
                 'author_username': author_username,
@@ -3,27 +3,136 @@ Timetable API Endpoints
 Handles timetable upload, filtering, and schedule management
 """
 
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
 import sys
 import os
+import uuid
+import threading
+import multiprocessing
+from datetime import datetime
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from timetable.timetable_processor import TimetableProcessor
+from timetable.timetable_processor import TimetableProcessor, parse_timetable_file
+from timetable.timetable_store import create_timetable_store
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from pyarrow import feather
+except ImportError:
+    print("Warning: pyarrow not installed. Processed timetables will be kept in memory only.")
+    feather = None
 
 timetable_bp = Blueprint('timetable', __name__)
 
+# Shared processor; the methods used by the endpoints below do not keep per-request state
+_PROCESSOR = TimetableProcessor()
+
 ALLOWED_EXTENSIONS = {'xlsx', 'xls', 'csv'}
+_ALLOWED_SUFFIXES = tuple(f'.{ext}' for ext in ALLOWED_EXTENSIONS)
+
+TIMETABLE_UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'uploads', 'timetables')
+os.makedirs(TIMETABLE_UPLOAD_DIR, exist_ok=True)
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
+
+
+def _cache_dataframe(df, cache_path):
+    """Write a processed DataFrame to Feather and return the path.
+
+    Returns the DataFrame itself when pyarrow is unavailable or the frame
+    cannot be written, so the entry can still be served from memory.
+    """
+    if feather is None:
+        return df
+    try:
+        feather.write_feather(df.reset_index(drop=True), cache_path)
+        return cache_path
+    except Exception as e:
+        print(f"Could not cache {cache_path} as Feather: {str(e)}")
+        return df
+
+
+# Wire formats for timetable rows: row objects (default) or columnar split
+ROW_ORIENTS = ('records', 'split')
+
+
+def _frame_to_json(df, orient):
+    """Convert a DataFrame to row records or a columnar {columns, data} dict"""
+    if orient == 'split':
+        return df.to_dict(orient='split', index=False)
+    return df.to_dict(orient='records')
+
+
+def _json_response(payload, status=200):
+    """Serialize large timetable payloads with orjson, falling back to jsonify"""
+    if orjson is None:
+        response = jsonify(payload)
+        response.status_code = status
+        return response
+    body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return Response(body, status=status, mimetype='application/json')
+
 
+# Worker processes for parsing multi-file uploads, started on first use and
+# shared by all requests
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
 
-# In-memory storage for processed timetables (move to database in production)
-user_timetables = {}
+
+def _get_parse_pool():
+    """
+    The shared upload parsing pool.
+    
+    Workers are spawned, not forked: this server process runs request threads,
+    and a fork would copy whatever locks they hold. A pool broken by a crashed
+    worker is replaced.
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None or getattr(_parse_pool, '_broken', False):
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _parse_pool
+
+
+def _matching_etag(etag):
+    """
+    The If-None-Match tag that names etag, or None.
+    
+    Flask-Compress sends compressed responses with the ETag "<tag>:<encoding>",
+    so browsers revalidate with that form; it is accepted as well.
+    """
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return etag
+    for tag in if_none_match.as_set(include_weak=True):
+        if tag == etag or tag.startswith(etag + ':'):
+            return tag
+    return None
+
+
+def _load_dataframe(entry):
+    """Return the DataFrame for a processed_data entry (Feather path or DataFrame)"""
+    if isinstance(entry, str):
+        return feather.read_feather(entry, memory_map=True)
+    return entry
+
+
+# Processed timetables per user (Redis when REDIS_URL is set, otherwise process memory)
+timetable_store = create_timetable_store()
 
 # Test data for development
 test_timetable_data = {
@@ -87,7 +196,6 @@ def upload_timetable():
         files = request.files.getlist('files') if 'files' in request.files else [request.files['file']]
         
         uploaded_files = []
-        processor = TimetableProcessor()
         
         for file in files:
             if file.filename == '':
@@ -101,9 +209,7 @@ def upload_timetable():
             
             # Save file
             filename = secure_filename(f"{username}_{file.filename}")
-            upload_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads', 'timetables')
-            os.makedirs(upload_folder, exist_ok=True)
-            filepath = os.path.join(upload_folder, filename)
+            filepath = os.path.join(TIMETABLE_UPLOAD_DIR, filename)
             file.save(filepath)
             
             uploaded_files.append({
@@ -111,25 +217,56 @@ def upload_timetable():
                 'filepath': filepath
             })
         
-        # Process files directly using file paths
+        timetable_id = uuid.uuid4().hex
+        
+        # Process files directly using file paths; processed_data keeps the
+        # Feather cache path per file, frames keeps the DataFrames for stats
         processed_data = {}
+        frames = {}
+        slot_masks = {}
         print(f"Processing {len(uploaded_files)} files for user {username}")
         
+        # Parse multiple files in parallel worker processes
+        parse_jobs = {}
+        if len(uploaded_files) > 1:
+            try:
+                executor = _get_parse_pool()
+                for uploaded_file in uploaded_files:
+                    parse_jobs[uploaded_file['filename']] = executor.submit(
+                        parse_timetable_file, uploaded_file['filename'], uploaded_file['filepath']
+                    )
+            except BrokenProcessPool:
+                # Parse the remaining files in this process
+                pass
+        
         for uploaded_file in uploaded_files:
             try:
                 print(f"Processing file: {uploaded_file['filename']} at {uploaded_file['filepath']}")
                 
                 # Process the file based on its extension
-                if uploaded_file['filename'].endswith('.xlsx'):
-                    df = processor._process_excel_file(uploaded_file['filepath'])
-                elif uploaded_file['filename'].endswith('.csv'):
-                    df = processor._process_csv_file(uploaded_file['filepath'])
-                else:
+                df = None
+                parsed = False
+                if uploaded_file['filename'] in parse_jobs:
+                    try:
+                        df = parse_jobs[uploaded_file['filename']].result()
+                        parsed = True
+                    except BrokenProcessPool:
+                        print(f"Parser process died, parsing {uploaded_file['filename']} here")
+                if not parsed:
+                    df = parse_timetable_file(uploaded_file['filename'], uploaded_file['filepath'], _PROCESSOR)
+                
+                if df is None:
                     print(f"Skipping unsupported file: {uploaded_file['filename']}")
                     continue
                 
                 print(f"Processed {uploaded_file['filename']}: {len(df)} rows")
-                processed_data[uploaded_file['filename']] = df
+                frames[uploaded_file['filename']] = df
+                # Time slot bitmasks for the conflicts endpoint
+                slot_masks[uploaded_file['filename']] = _PROCESSOR.compute_slot_masks(df)
+                cache_path = os.path.join(
+                    TIMETABLE_UPLOAD_DIR, secure_filename(f"{timetable_id}_{uploaded_file['filename']}.feather")
+                )
+                processed_data[uploaded_file['filename']] = _cache_dataframe(df, cache_path)
                 
             except Exception as e:
                 print(f"Error processing {uploaded_file['filename']}: {str(e)}")
@@ -138,29 +275,39 @@ def upload_timetable():
                 continue
         
         # Store processed data
-        if username not in user_timetables:
-            user_timetables[username] = {}
-        
-        timetable_id = str(__import__('uuid').uuid4())
         print(f"Storing timetable {timetable_id} with {len(processed_data)} processed files")
         
-        user_timetables[username][timetable_id] = {
+        timetable_store.put(username, timetable_id, {
             'id': timetable_id,
             'files': uploaded_files,
             'processed_data': processed_data,
-            'created_at': __import__('datetime').datetime.now().isoformat()
+            'slot_masks': slot_masks,
+            'created_at': datetime.now().isoformat()
+        }, summary={
+            'files': [f['filename'] for f in uploaded_files],
+            'data_keys': list(processed_data.keys()),
+            'data_count': sum(len(df) for df in frames.values())
+        })
+        
+        print(f"Stored timetable data: {len(processed_data)} files, {sum(len(df) for df in frames.values())} total rows")
+        
+        # Get statistics for all files in one groupby pass
+        stats = {
+            filename: {'total_entries': len(df), 'unique_courses': 0, 'unique_days': 0}
+            for filename, df in frames.items()
         }
-        
-        print(f"Stored timetable data: {len(processed_data)} files, {sum(len(df) if hasattr(df, '__len__') else 0 for df in processed_data.values())} total rows")
-        
-        # Get statistics
-        stats = {}
-        for filename, df in processed_data.items():
-            stats[filename] = {
-                'total_entries': len(df),
-                'unique_courses': df['Course'].nunique() if 'Course' in df.columns else 0,
-                'unique_days': df['Day'].nunique() if 'Day' in df.columns else 0
-            }
+        countable = {
+            filename: df[['Course', 'Day']] for filename, df in frames.items()
+            if not df.empty and 'Course' in df.columns and 'Day' in df.columns
+        }
+        if countable:
+            combined = pd.concat(countable, names=['file'])
+            grouped = combined.groupby(level='file', sort=False).agg(
+                unique_courses=('Course', 'nunique'),
+                unique_days=('Day', 'nunique')
+            )
+            for filename, counts in grouped.to_dict(orient='index').items():
+                stats[filename].update(counts)
         
         return jsonify({
             'success': True,
@@ -216,7 +363,7 @@ def get_timetables():
     try:
         username = get_jwt_identity()
         
-        timetables = user_timetables.get(username, {})
+        timetables = timetable_store.list(username)
         
         # Return summary without full data
         timetables_summary = [
@@ -248,29 +395,18 @@ def get_timetables():
 def debug_timetables():
     """Debug endpoint to check stored timetables (no auth required)"""
     try:
+        # Summaries are maintained by the store when timetables are uploaded
+        details = timetable_store.summary()
         debug_info = {
-            'user_timetables_keys': list(user_timetables.keys()),
-            'user_timetables_count': len(user_timetables),
-            'user_timetables_details': {}
+            'user_timetables_keys': list(details.keys()),
+            'user_timetables_count': len(details),
+            'user_timetables_details': details
         }
         
-        for username, timetables in user_timetables.items():
-            debug_info['user_timetables_details'][username] = {
-                'timetable_ids': list(timetables.keys()),
-                'timetable_count': len(timetables)
-            }
-            
-            for tid, timetable in timetables.items():
-                debug_info['user_timetables_details'][username][tid] = {
-                    'files': [f['filename'] for f in timetable['files']],
-                    'data_keys': list(timetable['processed_data'].keys()) if timetable['processed_data'] else [],
-                    'data_count': sum(len(data) if isinstance(data, list) else 0 for data in timetable['processed_data'].values()) if timetable['processed_data'] else 0
-                }
-        
-        return jsonify({
+        return _json_response({
             'success': True,
             'debug_info': debug_info
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({
@@ -284,8 +420,7 @@ def debug_timetables():
 def clear_all_timetables():
     """Clear all timetable data (no auth required for testing)"""
     try:
-        global user_timetables
-        user_timetables = {}
+        timetable_store.clear()
         print("Cleared all timetable data")
         
         return jsonify({
@@ -339,24 +474,47 @@ def get_test_timetable(timetable_id):
 @timetable_bp.route('/<timetable_id>', methods=['GET'])
 @jwt_required()
 def get_timetable(timetable_id):
-    """Get specific timetable"""
+    """
+    Get specific timetable
+    
+    Query Parameters:
+    - orient: 'records' (default, one object per row) or 'split' (columns + data)
+    """
     try:
         username = get_jwt_identity()
         
-        if username not in user_timetables or timetable_id not in user_timetables[username]:
+        timetable = timetable_store.get(username, timetable_id)
+        if timetable is None:
             return jsonify({
                 'success': False,
                 'error': 'Timetable not found'
             }), 404
         
-        timetable = user_timetables[username][timetable_id]
+        orient = request.args.get('orient', 'records')
+        if orient not in ROW_ORIENTS:
+            return jsonify({
+                'success': False,
+                'error': f"orient must be one of: {', '.join(ROW_ORIENTS)}"
+            }), 400
+        
+        # Stored timetables never change, so ID + creation time identify the content
+        etag = f"{timetable['id']}-{timetable['created_at']}-{orient}"
+        cache_control = 'private, max-age=60'
+        matched_etag = _matching_etag(etag)
+        if matched_etag is not None:
+            # Answer before loading or serializing anything, with the validators
+            # the client holds
+            response = Response(status=304)
+            response.set_etag(matched_etag)
+            response.headers['Cache-Control'] = cache_control
+            return response
         
         # Convert DataFrame to JSON-serializable format
         processed_data_json = {}
-        for filename, df in timetable['processed_data'].items():
-            processed_data_json[filename] = df.to_dict(orient='records')
+        for filename, entry in timetable['processed_data'].items():
+            processed_data_json[filename] = _frame_to_json(_load_dataframe(entry), orient)
         
-        return jsonify({
+        response = _json_response({
             'success': True,
             'data': {
                 'id': timetable['id'],
@@ -364,7 +522,10 @@ def get_timetable(timetable_id):
                 'data': processed_data_json,
                 'created_at': timetable['created_at']
             }
-        }), 200
+        })
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = cache_control
+        return response
         
     except Exception as e:
         return jsonify({
@@ -385,30 +546,38 @@ def filter_timetable(timetable_id):
         "courses": ["CS101", "MATH201"],
         "departments": ["Computer Science", "Mathematics"]
     }
+    
+    Query Parameters:
+    - orient: 'records' (default, one object per row) or 'split' (columns + data)
     """
     try:
         username = get_jwt_identity()
         
-        if username not in user_timetables or timetable_id not in user_timetables[username]:
+        timetable = timetable_store.get(username, timetable_id)
+        if timetable is None:
             return jsonify({
                 'success': False,
                 'error': 'Timetable not found'
             }), 404
         
+        orient = request.args.get('orient', 'records')
+        if orient not in ROW_ORIENTS:
+            return jsonify({
+                'success': False,
+                'error': f"orient must be one of: {', '.join(ROW_ORIENTS)}"
+            }), 400
+        
         data = request.get_json()
         courses = data.get('courses', [])
         departments = data.get('departments', [])
         
-        timetable = user_timetables[username][timetable_id]
-        processor = TimetableProcessor()
-        
         # Filter each processed file
         filtered_results = {}
-        for filename, df in timetable['processed_data'].items():
-            filtered_df = processor.filter_timetable(df, courses, departments)
-            filtered_results[filename] = filtered_df.to_dict(orient='records')
+        for filename, entry in timetable['processed_data'].items():
+            filtered_df = _PROCESSOR.filter_timetable(_load_dataframe(entry), courses, departments)
+            filtered_results[filename] = _frame_to_json(filtered_df, orient)
         
-        return jsonify({
+        return _json_response({
             'success': True,
             'data': {
                 'filtered_data': filtered_results,
@@ -417,7 +586,7 @@ def filter_timetable(timetable_id):
                     'departments': departments
                 }
             }
-        }), 200
+        })
         
     except Exception as e:
         return jsonify({
@@ -441,7 +610,8 @@ def check_conflicts(timetable_id):
     try:
         username = get_jwt_identity()
         
-        if username not in user_timetables or timetable_id not in user_timetables[username]:
+        timetable = timetable_store.get(username, timetable_id)
+        if timetable is None:
             return jsonify({
                 'success': False,
                 'error': 'Timetable not found'
@@ -450,23 +620,23 @@ def check_conflicts(timetable_id):
         data = request.get_json()
         courses = data.get('courses', [])
         
-        timetable = user_timetables[username][timetable_id]
-        processor = TimetableProcessor()
-        
         # Get first dataframe (assuming single source)
-        df = list(timetable['processed_data'].values())[0]
+        filename = list(timetable['processed_data'].keys())[0]
+        df = _load_dataframe(timetable['processed_data'][filename])
         
-        # Filter by selected courses
-        filtered_df = processor.filter_timetable(df, courses, [])
-        
-        # Check conflicts
-        conflicts = processor.check_time_conflicts(filtered_df)
+        # Check conflicts among the selected courses using the slot masks built at upload
+        courses = [course.strip() for course in courses if course.strip()]
+        result = _PROCESSOR.check_time_conflicts(
+            courses, df=df, slot_masks=timetable.get('slot_masks', {}).get(filename)
+        )
+        conflicts = result['conflicts']
         
         return jsonify({
             'success': True,
             'data': {
                 'has_conflicts': len(conflicts) > 0,
                 'conflicts': conflicts,
+                'recommendations': result['recommendations'],
                 'count': len(conflicts)
             }
         }), 200
@@ -486,19 +656,17 @@ def get_statistics(timetable_id):
     try:
         username = get_jwt_identity()
         
-        if username not in user_timetables or timetable_id not in user_timetables[username]:
+        timetable = timetable_store.get(username, timetable_id)
+        if timetable is None:
             return jsonify({
                 'success': False,
                 'error': 'Timetable not found'
             }), 404
         
-        timetable = user_timetables[username][timetable_id]
-        processor = TimetableProcessor()
-        
         # Get statistics for each file
         all_stats = {}
-        for filename, df in timetable['processed_data'].items():
-            stats = processor.get_course_statistics(df)
+        for filename, entry in timetable['processed_data'].items():
+            stats = _PROCESSOR.get_course_statistics(_load_dataframe(entry))
             all_stats[filename] = stats
         
         return jsonify({
@@ -9,25 +9,90 @@ from werkzeug.utils import secure_filename
 import sys
 import os
 import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from auth import (
-    get_user_name, get_user_description, update_user_description,
+    get_user_description, update_user_description,
     get_user_transcript, update_user_transcript,
     get_user_resume_data, update_user_resume_data, UserService
 )
-from data.transcript_processing import extract_transcript_with_gemini, initialize_gemini_api
+from data.transcript_processing import extract_transcript_with_gemini, prepare_transcript_image
+from data.transcript_job_store import create_transcript_job_store
 
 users_bp = Blueprint('users', __name__)
 
-# Initialize Gemini API
-initialize_gemini_api()
-
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf'}
+_ALLOWED_SUFFIXES = tuple(f'.{ext}' for ext in ALLOWED_EXTENSIONS)
+
+TRANSCRIPT_UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'uploads', 'transcripts')
+os.makedirs(TRANSCRIPT_UPLOAD_DIR, exist_ok=True)
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
+
+
+# Background transcript extraction; the pool size caps concurrent Gemini calls
+TRANSCRIPT_JOB_TTL = 3600
+_transcript_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('TRANSCRIPT_WORKERS', '2')), thread_name_prefix='transcript'
+)
+# Job status lives in Redis when configured so any worker can answer the status poll
+transcript_jobs = create_transcript_job_store(TRANSCRIPT_JOB_TTL)
+
+
+def _can_run_async():
+    """Whether a job started here can be polled from whichever worker gets the request"""
+    return transcript_jobs.shared or int(os.getenv('GUNICORN_WORKERS', '1')) <= 1
+
+
+def _process_transcript(username, filepath):
+    """Extract transcript data with Gemini and save it on the user"""
+    image = prepare_transcript_image(filepath)
+    transcript_data = extract_transcript_with_gemini(image)
+    
+    if transcript_data:
+        # Update user transcript
+        update_user_transcript(username, filepath)
+        
+        # Update transcript data if using database
+        try:
+            UserService.update_user_transcript(username, filepath, transcript_data)
+        except:
+            pass
+    
+    return transcript_data
+
+
+def _run_transcript_job(job_id, job):
+    """Process a queued transcript and record the outcome in the job store"""
+    try:
+        transcript_data = _process_transcript(job['username'], job['filepath'])
+        job['status'] = 'completed' if transcript_data else 'failed'
+        job['transcript_data'] = transcript_data
+    except Exception as e:
+        job['status'] = 'failed'
+        job['error'] = str(e)
+    transcript_jobs.put(job_id, job)
+
+
+def _submit_transcript_job(username, filepath):
+    """Queue transcript extraction and return the job ID"""
+    job_id = uuid.uuid4().hex
+    job = {
+        'username': username,
+        'filepath': filepath,
+        'created': time.time(),
+        'status': 'pending',
+        'transcript_data': None,
+        'error': None
+    }
+    transcript_jobs.put(job_id, job)
+    _transcript_executor.submit(_run_transcript_job, job_id, job)
+    return job_id
 
 
 @users_bp.route('/me', methods=['GET'])
@@ -36,27 +101,20 @@ def get_current_user():
     """Get current user profile"""
     try:
         username = get_jwt_identity()
-        name = get_user_name(username)
-        description = get_user_description(username)
-        transcript_file = get_user_transcript(username)
         
-        # Get transcript data if available
-        transcript_data = None
-        try:
-            from auth.db_user_service import UserService
-            transcript_data = UserService.get_user_transcript_data(username)
-        except:
-            pass
+        # Name, description and transcript fields in one query
+        profile = UserService.get_user_bundle(username)
+        transcript_file = profile['transcript_file']
         
         return jsonify({
             'success': True,
             'data': {
                 'username': username,
-                'name': name,
-                'description': description,
+                'name': profile['name'],
+                'description': profile['description'],
                 'transcript_file': transcript_file,
                 'has_transcript': bool(transcript_file),
-                'transcript_data': transcript_data
+                'transcript_data': profile['transcript_data']
             }
         }), 200
         
@@ -156,6 +214,10 @@ def upload_transcript():
     
     Form Data:
         file: Image file (png, jpg, jpeg, gif, pdf)
+    
+    Query Parameters:
+    - async: if true, respond 202 with a job_id and process in the background;
+      poll GET /me/transcript/status/<job_id> for the result
     """
     try:
         username = get_jwt_identity()
@@ -183,27 +245,26 @@ def upload_transcript():
         
         # Save file
         filename = secure_filename(f"{username}_transcript_{file.filename}")
-        upload_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads', 'transcripts')
-        os.makedirs(upload_folder, exist_ok=True)
-        filepath = os.path.join(upload_folder, filename)
+        filepath = os.path.join(TRANSCRIPT_UPLOAD_DIR, filename)
         file.save(filepath)
         
+        # Without a shared job store the status poll could land on another
+        # worker, so process synchronously instead
+        if request.args.get('async', 'false').lower() in ('1', 'true', 'yes') and _can_run_async():
+            job_id = _submit_transcript_job(username, filepath)
+            return jsonify({
+                'success': True,
+                'message': 'Transcript uploaded, processing started',
+                'data': {
+                    'job_id': job_id,
+                    'status': 'pending'
+                }
+            }), 202
+        
         # Process transcript with Gemini AI
-        from PIL import Image
-        image = Image.open(filepath)
-        transcript_data = extract_transcript_with_gemini(image)
+        transcript_data = _process_transcript(username, filepath)
         
         if transcript_data:
-            # Update user transcript
-            update_user_transcript(username, filepath)
-            
-            # Update transcript data if using database
-            try:
-                from auth.db_user_service import UserService
-                UserService.update_user_transcript(username, filepath, transcript_data)
-            except:
-                pass
-            
             return jsonify({
                 'success': True,
                 'message': 'Transcript uploaded and processed successfully',
@@ -226,6 +287,60 @@ def upload_transcript():
         }), 500
 
 
+@users_bp.route('/me/transcript/status/<job_id>', methods=['GET'])
+@jwt_required()
+def get_transcript_job_status(job_id):
+    """Get the status of a background transcript upload"""
+    try:
+        username = get_jwt_identity()
+        
+        job = transcript_jobs.get(job_id)
+        
+        if job is None or job['username'] != username:
+            return jsonify({
+                'success': False,
+                'error': 'Transcript job not found'
+            }), 404
+        
+        if job['status'] == 'pending':
+            return jsonify({
+                'success': True,
+                'data': {
+                    'job_id': job_id,
+                    'status': 'pending'
+                }
+            }), 200
+        
+        transcript_data = job['transcript_data']
+        if job['status'] == 'failed':
+            return jsonify({
+                'success': False,
+                'error': 'Failed to process transcript image',
+                'message': job['error'],
+                'data': {
+                    'job_id': job_id,
+                    'status': 'failed'
+                }
+            }), 200
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'job_id': job_id,
+                'status': 'completed',
+                'transcript_file': job['filepath'],
+                'transcript_data': transcript_data
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': 'Failed to get transcript status',
+            'message': str(e)
+        }), 500
+
+
 @users_bp.route('/me/description', methods=['GET'])
 @jwt_required()
 def get_description():
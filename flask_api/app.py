@@ -3,19 +3,16 @@ EdFast Flask API - Main Application
 RESTful API for EdFast academic management platform
 """
 
+import json
 import os
-import sys
-from dotenv import load_dotenv
-from flask import Flask, jsonify
-from flask_cors import CORS
+import re
+from flask import Flask, Response, jsonify, request
 from flask_jwt_extended import JWTManager
 from datetime import timedelta
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Load environment variables from .env and add the project root to sys.path
+# (done once per process, shared with run.py)
+import _bootstrap  # noqa: F401
 
 from config.app_config import USE_DATABASE
 from database.db_config import init_database
@@ -23,38 +20,80 @@ from database.db_config import init_database
 # Initialize Flask app
 app = Flask(__name__)
 
+
+def config_from_environ(environ):
+    """Build the Flask settings from one snapshot of the environment"""
+    return {
+        'SECRET_KEY': environ.get('SECRET_KEY', 'edfast-secret-key-change-in-production'),
+        'JWT_SECRET_KEY': environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production'),
+        'JWT_ACCESS_TOKEN_EXPIRES': timedelta(hours=24),
+        'JWT_REFRESH_TOKEN_EXPIRES': timedelta(days=30),
+        'MAX_CONTENT_LENGTH': 16 * 1024 * 1024,  # 16MB max file size
+        'UPLOAD_FOLDER': os.path.join(os.path.dirname(__file__), 'uploads'),
+        'SEND_FILE_MAX_AGE_DEFAULT': 0,
+        'REQUEST_TIMEOUT': 120,  # 120 seconds timeout for long-running operations
+    }
+
+
 # Configuration
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'edfast-secret-key-change-in-production')
-app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
-app.config['JWT_REFRESH_TOKEN_EXPIRES'] = timedelta(days=30)
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-app.config['UPLOAD_FOLDER'] = os.path.join(os.path.dirname(__file__), 'uploads')
-app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
-app.config['REQUEST_TIMEOUT'] = 120  # 120 seconds timeout for long-running operations
-
-# Ensure upload folder exists
+app.config.from_mapping(config_from_environ(os.environ))
+
+# Ensure upload folder exists. With Gunicorn's preload_app (see run.py) this
+# runs once in the master; forked workers inherit the directory.
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 # Initialize extensions
-# Allow localhost (development), dev tunnel domains, and Vercel production
-CORS(app, resources={
-    r"/api/*": {
-        "origins": [
-            "http://localhost:3000", 
-            "http://localhost:3001",
-            "https://x7mq0j1w-3000.asse.devtunnels.ms",
-            "http://x7mq0j1w-3000.asse.devtunnels.ms",
-            "https://ed-fast-iyoe.vercel.app",
-            "https://ed-fast-iyoe-*.vercel.app"
-        ],
-        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization", "Accept"],
-        "expose_headers": ["Content-Type", "Authorization"],
-        "supports_credentials": True,
-        "max_age": 3600
-    }
-})
+# CORS: allow localhost (development), dev tunnel domains, and Vercel production.
+# The allowlist is fixed, so the headers are precomputed and applied by a
+# small after_request hook instead of Flask-CORS.
+CORS_ALLOWED_ORIGINS = frozenset([
+    "http://localhost:3000",
+    "http://localhost:3001",
+    "https://x7mq0j1w-3000.asse.devtunnels.ms",
+    "http://x7mq0j1w-3000.asse.devtunnels.ms",
+    "https://ed-fast-iyoe.vercel.app",
+])
+# Vercel preview deployments (https://ed-fast-iyoe-*.vercel.app)
+CORS_ALLOWED_ORIGIN_PATTERN = re.compile(r"https://ed-fast-iyoe-[A-Za-z0-9-]+\.vercel\.app")
+CORS_HEADERS = {
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, Accept',
+    'Access-Control-Expose-Headers': 'Content-Type, Authorization',
+    'Access-Control-Allow-Credentials': 'true',
+    'Access-Control-Max-Age': '3600',
+}
+
+
+@app.before_request
+def cors_preflight():
+    """Answer CORS preflight requests without dispatching to a view"""
+    if request.method == 'OPTIONS' and request.path.startswith('/api/'):
+        return Response(status=204)
+
+
+@app.after_request
+def add_cors_headers(response):
+    """Add CORS headers for allowed origins on API responses"""
+    origin = request.headers.get('Origin')
+    if origin and request.path.startswith('/api/'):
+        response.vary.add('Origin')
+        if origin in CORS_ALLOWED_ORIGINS or CORS_ALLOWED_ORIGIN_PATTERN.fullmatch(origin):
+            response.headers['Access-Control-Allow-Origin'] = origin
+            response.headers.update(CORS_HEADERS)
+    return response
+
+# Compress large JSON responses (e.g. timetable dumps) when Flask-Compress is installed
+try:
+    from flask_compress import Compress
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    Compress(app)
+except ImportError:
+    print("⚠ Flask-Compress not installed, responses will not be compressed")
+
+# Encode jsonify responses with orjson when it is installed
+from utils.json_provider import init_json_provider
+init_json_provider(app)
 
 jwt = JWTManager(app)
 
@@ -66,7 +105,9 @@ if USE_DATABASE:
     except Exception as e:
         print(f"⚠ Database initialization error: {e}")
 
-# Import and register blueprints
+# Import and register blueprints. Flask does not allow registering blueprints
+# after the first request, so registration stays eager; blueprint modules
+# defer their heavy dependencies (scrapers, Gemini clients) to first use.
 from api.auth import auth_bp
 from api.users import users_bp
 from api.peerhub import peerhub_bp
@@ -89,59 +130,59 @@ app.register_blueprint(linkedin_bp, url_prefix='/api/v1/linkedin')
 
 
 # Error handlers
+# Bodies are serialized once at import; handlers that include the error text
+# only JSON-escape the message and append it to a precomputed prefix.
+def _error_body(error, message=None):
+    """Serialize an error envelope, leaving the message open when it is None"""
+    if message is None:
+        return b'{"success":false,"error":' + json.dumps(error).encode() + b',"message":'
+    return json.dumps({'success': False, 'error': error, 'message': message}, separators=(',', ':')).encode()
+
+
+def _error_response(body, status, message=None):
+    """Build a JSON error response from a precomputed body"""
+    if message is not None:
+        body = body + json.dumps(message).encode() + b'}'
+    return Response(body, status=status, mimetype='application/json')
+
+
+NOT_FOUND_BODY = _error_body('Resource not found')
+INTERNAL_ERROR_BODY = _error_body('Internal server error')
+FILE_TOO_LARGE_BODY = _error_body('File too large', 'Maximum file size is 16MB')
+TOKEN_EXPIRED_BODY = _error_body('Token expired', 'The token has expired. Please login again.')
+INVALID_TOKEN_BODY = _error_body('Invalid token', 'Token verification failed.')
+MISSING_TOKEN_BODY = _error_body('Authorization required', 'Access token is missing.')
+
+
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({
-        'success': False,
-        'error': 'Resource not found',
-        'message': str(error)
-    }), 404
+    return _error_response(NOT_FOUND_BODY, 404, str(error))
 
 
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({
-        'success': False,
-        'error': 'Internal server error',
-        'message': str(error)
-    }), 500
+    return _error_response(INTERNAL_ERROR_BODY, 500, str(error))
 
 
 @app.errorhandler(413)
 def file_too_large(error):
-    return jsonify({
-        'success': False,
-        'error': 'File too large',
-        'message': 'Maximum file size is 16MB'
-    }), 413
+    return _error_response(FILE_TOO_LARGE_BODY, 413)
 
 
 # JWT error handlers
 @jwt.expired_token_loader
 def expired_token_callback(jwt_header, jwt_payload):
-    return jsonify({
-        'success': False,
-        'error': 'Token expired',
-        'message': 'The token has expired. Please login again.'
-    }), 401
+    return _error_response(TOKEN_EXPIRED_BODY, 401)
 
 
 @jwt.invalid_token_loader
 def invalid_token_callback(error):
-    return jsonify({
-        'success': False,
-        'error': 'Invalid token',
-        'message': 'Token verification failed.'
-    }), 401
+    return _error_response(INVALID_TOKEN_BODY, 401)
 
 
 @jwt.unauthorized_loader
 def missing_token_callback(error):
-    return jsonify({
-        'success': False,
-        'error': 'Authorization required',
-        'message': 'Access token is missing.'
-    }), 401
+    return _error_response(MISSING_TOKEN_BODY, 401)
 
 
 # Health check endpoint
@@ -175,6 +216,20 @@ def api_info():
     }), 200
 
 
+# All routes are registered; compile the URL map now so that, with Gunicorn's
+# preload_app, workers inherit the built matcher instead of each building it
+# on their first request.
+app.url_map.update()
+
+
+# ASGI entry point for Uvicorn workers (gunicorn -k uvicorn.workers.UvicornWorker app:asgi_app)
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    asgi_app = WsgiToAsgi(app)
+except ImportError:
+    asgi_app = None
+
+
 if __name__ == '__main__':
     # Development server
     app.run(
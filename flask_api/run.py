@@ -1,38 +1,134 @@
 """
 Flask API Startup Script
 Run this to start the EdFast API server
+
+Serves the app with Gunicorn (pre-forked workers) when it is available.
+Set FLASK_DEV_SERVER=1 to use the Flask development server instead; it is
+also used on Windows and when Gunicorn is not installed. Set ASGI_SERVER=1
+to run the ASGI-wrapped app on Uvicorn workers.
 """
 
 import os
 import sys
-from dotenv import load_dotenv
+import importlib.util
+
+# Load environment variables from parent directory .env file and add the
+# parent directory to the import path
+import _bootstrap  # noqa: F401
+
+from app import app, asgi_app
+
+
+def use_dev_server():
+    """Decide whether to fall back to the Flask development server"""
+    if os.getenv('FLASK_DEV_SERVER', '0') == '1':
+        return True
+    if sys.platform == 'win32':
+        return True
+    if importlib.util.find_spec('gunicorn') is None:
+        print("⚠ Gunicorn not installed, using the Flask development server")
+        return True
+    return False
+
+
+def use_asgi_server():
+    """Whether to serve the ASGI wrapper on Uvicorn workers"""
+    if os.getenv('ASGI_SERVER', '0') != '1':
+        return False
+    if asgi_app is None or importlib.util.find_spec('uvicorn') is None:
+        print("⚠ ASGI_SERVER=1 needs asgiref and uvicorn, using WSGI workers")
+        return False
+    return True
+
+
+def green_database():
+    """Whether database calls can yield to gevent instead of blocking a worker"""
+    from config.app_config import USE_DATABASE, DB_TYPE
+    if not USE_DATABASE:
+        return True
+    # psycopg2 cooperates with gevent once psycogreen patches it (see post_fork);
+    # SQLite and unpatched drivers block the whole event loop
+    return DB_TYPE == 'postgresql' and importlib.util.find_spec('psycogreen') is not None
+
+
+def post_fork(server, worker):
+    """Give each worker its own database connections and sessions"""
+    if server.cfg.worker_class_str == 'gevent' and importlib.util.find_spec('psycogreen'):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+    # The master opened the engine while preloading the app; its pooled
+    # connections and session registry must not be shared across workers
+    from database import db_config as db_module
+    db_module.db_config.reset_after_fork()
 
-# Load environment variables from parent directory .env file
-parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-env_file = os.path.join(parent_dir, '.env')
-load_dotenv(env_file)
 
-# Add parent directory to path for imports
-sys.path.insert(0, parent_dir)
+def gunicorn_options(port):
+    """Gunicorn settings, overridable through environment variables"""
+    # Timetables and scrape results live in process memory unless Redis is
+    # configured, so only fan out to several workers when state is shared
+    default_workers = 2 * (os.cpu_count() or 1) + 1 if os.getenv('REDIS_URL') else 1
+    if use_asgi_server():
+        default_worker_class = 'uvicorn.workers.UvicornWorker'
+    elif importlib.util.find_spec('gevent') and green_database():
+        default_worker_class = 'gevent'
+    else:
+        default_worker_class = 'gthread'
+
+    return {
+        'bind': f"0.0.0.0:{port}",
+        'workers': int(os.getenv('GUNICORN_WORKERS', default_workers)),
+        'worker_class': os.getenv('GUNICORN_WORKER_CLASS', default_worker_class),
+        'worker_connections': 1000,
+        'threads': int(os.getenv('GUNICORN_THREADS', 4)),
+        'timeout': 120,
+        # App and blueprints are set up once in the master before forking;
+        # post_fork drops the master's database engine in each worker
+        'preload_app': True,
+        'post_fork': post_fork,
+        'chdir': os.path.dirname(os.path.abspath(__file__)),
+    }
+
+
+def run_gunicorn(port):
+    """Serve the already-imported app with Gunicorn"""
+    from gunicorn.app.base import BaseApplication
+
+    class EdFastServer(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = gunicorn_options(port)
+    application = asgi_app if 'uvicorn' in options['worker_class'].lower() else app
+    EdFastServer(application, options).run()
 
-from app import app
 
 if __name__ == '__main__':
+    port = int(os.getenv('FLASK_PORT', 5000))
+
     print("\n" + "=" * 60)
     print(" " * 20 + "EdFast API Server")
     print("=" * 60)
-    print(f"\n🚀 Starting server on http://localhost:5000")
-    print(f"📚 API Documentation: http://localhost:5000/api/v1")
-    print(f"💚 Health Check: http://localhost:5000/api/v1/health")
+    print(f"\n🚀 Starting server on http://localhost:{port}")
+    print(f"📚 API Documentation: http://localhost:{port}/api/v1")
+    print(f"💚 Health Check: http://localhost:{port}/api/v1/health")
     print("\n" + "=" * 60 + "\n")
-    
-    # Run the Flask app
-    app.run(
-        host='0.0.0.0',
-        port=int(os.getenv('FLASK_PORT', 5000)),
-        debug=os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
-    )
-
-
-
 
+    if use_dev_server():
+        # Run the Flask app
+        app.run(
+            host='0.0.0.0',
+            port=port,
+            debug=os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+        )
+    else:
+        run_gunicorn(port)
@@ -0,0 +1,59 @@
+"""
+JSON Provider
+Encodes API responses with orjson when it is installed
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    orjson writes bytes directly and handles UUIDs, dataclasses and numpy
+    values natively. Dates and datetimes go through Flask's default
+    conversion, like anything else orjson does not handle (e.g. Decimal), so
+    they keep the RFC 822 format of the default provider. Keys are sorted
+    when sort_keys is set, as with the default provider.
+    """
+
+    option = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson else 0
+    )
+
+    def _option(self):
+        return self.option | orjson.OPT_SORT_KEYS if self.sort_keys else self.option
+
+    def dumps(self, obj, **kwargs):
+        # Options such as indent are only supported by the stdlib encoder
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._option()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self._option()
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option),
+            mimetype=self.mimetype
+        )
+
+
+def init_json_provider(app):
+    """Use orjson for jsonify and request parsing when it is installed"""
+    if orjson is None:
+        print("⚠ orjson not installed, using the standard JSON encoder")
+        return
+    app.json = OrjsonProvider(app)
@@ -110,8 +110,7 @@ def test_imports():
         ("selenium", "selenium"),
         ("pandas", "pandas"),
         ("requests", "requests"),
-        ("google.auth", "google-auth"),
-        ("pyperclip", "pyperclip")
+        ("google.auth", "google-auth")
     ]
     
     failed_imports = []
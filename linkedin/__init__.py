@@ -1,10 +1,29 @@
 """
 LinkedIn Integration Module for EdFast
 Provides job scraping and post scraping functionality
-"""
 
-from .job_scraper import LinkedInJobScraper
-from .post_scraper import LinkedInPostScraper
-from .models import LinkedInJob, LinkedInPost
+Exports are loaded lazily (PEP 562) so that importing the package, or just
+its models, does not pull in jobspy, selenium or pandas.
+"""
 
 __all__ = ['LinkedInJobScraper', 'LinkedInPostScraper', 'LinkedInJob', 'LinkedInPost']
+
+_LAZY_EXPORTS = {
+    'LinkedInJobScraper': '.job_scraper',
+    'LinkedInPostScraper': '.post_scraper',
+    'LinkedInJob': '.models',
+    'LinkedInPost': '.models',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,20 +1,187 @@
 """
 LinkedIn Job Scraper using JobSpy
 Integrated version for EdFast platform
+
+pandas, JobSpy and PyArrow are imported on first use, so importing this
+module (e.g. to build the scraper) stays cheap.
 """
 
+from __future__ import annotations
+
 import csv
+import functools
+import hashlib
+import importlib.util
+import io
+import logging
 import os
 import sys
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-import pandas as pd
+from logging.handlers import MemoryHandler
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import pandas as pd
+else:
+    pd = None
+
+# Scraper progress is buffered and written out when a scrape call returns (or
+# at once on a warning) instead of one stdout write per message
+logger = logging.getLogger(__name__)
+if not logger.handlers:
+    logger.addHandler(MemoryHandler(capacity=100, flushLevel=logging.WARNING, target=logging.StreamHandler()))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _flushes_log(method):
+    """Write out the buffered scraper log when method returns or raises."""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        try:
+            return method(*args, **kwargs)
+        finally:
+            for handler in logger.handlers:
+                handler.flush()
+    return wrapper
+
+try:
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
 
 try:
-    from jobspy import scrape_jobs
+    import requests
+    from bs4 import BeautifulSoup
 except ImportError:
-    print("Warning: jobspy not installed. LinkedIn job scraping will not be available.")
-    scrape_jobs = None
+    requests = None
+    BeautifulSoup = None
+
+# Identical searches within JOB_CACHE_TTL seconds reuse the previous results
+JOB_CACHE_TTL = 1800
+_job_cache = TTLCache(maxsize=512, ttl=JOB_CACHE_TTL) if TTLCache is not None else None
+_job_cache_lock = threading.Lock()
+
+# The only pages fetch_job_descriptions will request
+JOB_VIEW_HOST = 'www.linkedin.com'
+_JOB_VIEW_PATH = re.compile(r'/jobs/view/\d+/?')
+
+
+def is_linkedin_job_url(url) -> bool:
+    """Whether url is an https://www.linkedin.com/jobs/view/<id> job page"""
+    if not isinstance(url, str):
+        return False
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    # netloc must be exactly the host: no port, no user info
+    return (parts.scheme == 'https' and parts.netloc == JOB_VIEW_HOST
+            and _JOB_VIEW_PATH.fullmatch(parts.path) is not None)
+
+
+# Concurrent requests used by fetch_job_descriptions
+DESCRIPTION_FETCH_WORKERS = 16
+DESCRIPTION_FETCH_TIMEOUT = 15
+DESCRIPTION_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                  '(KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# API field, source column, value kind and default used by format_jobs_for_api
+API_JOB_FIELDS = [
+    ('title', 'title', 'str', ''),
+    ('company', 'company', 'str', ''),
+    ('location', 'location', 'str', ''),
+    ('description', 'description', 'str', ''),
+    ('url', 'job_url', 'str', ''),
+    ('posted_date', 'date_posted', 'str', ''),
+    ('job_type', 'job_type', 'str', ''),
+    ('is_remote', 'is_remote', 'bool', False),
+    ('min_salary', 'min_amount', 'int', 0),
+    ('max_salary', 'max_amount', 'int', 0),
+    ('currency', 'currency', 'str', 'USD'),
+    ('emails', 'emails', 'emails', None),
+    ('company_url', 'company_url', 'str', ''),
+    ('company_industry', 'company_industry', 'str', ''),
+    ('company_num_employees', 'company_num_employees', 'str', ''),
+    ('company_revenue', 'company_revenue', 'str', ''),
+]
+
+
+# Column aggregations used by get_job_statistics
+JOB_STAT_AGGREGATIONS = {
+    'company': 'nunique',
+    'location': 'nunique',
+    'is_remote': 'sum',
+    'min_amount': 'mean',
+    'max_amount': 'mean',
+}
+
+
+def _pd():
+    """Import pandas on first use and return the module"""
+    global pd
+    if pd is None:
+        import pandas
+        pd = pandas
+    return pd
+
+
+_arrow_modules = None
+
+
+def _arrow():
+    """Import PyArrow on first use; returns (pyarrow, pyarrow.csv) or (None, None)"""
+    global _arrow_modules
+    if _arrow_modules is None:
+        try:
+            import pyarrow
+            from pyarrow import csv as pyarrow_csv
+            _arrow_modules = (pyarrow, pyarrow_csv)
+        except ImportError:
+            _arrow_modules = (None, None)
+    return _arrow_modules
+
+
+def _split_emails(value) -> List[str]:
+    """JobSpy joins emails into one comma-separated string; return them as a list."""
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if isinstance(value, str):
+        return [email.strip() for email in value.split(',') if email.strip()]
+    return []
+
+
+def _job_cache_key(params: Dict[str, Any]) -> str:
+    """Hash search parameters into a compact cache key"""
+    return hashlib.blake2b(repr(sorted(params.items())).encode(), digest_size=16).hexdigest()
+
+
+def _pack_jobs(jobs: pd.DataFrame):
+    """Serialize jobs to a Parquet blob, or keep a copy if Parquet is unavailable"""
+    pa, _ = _arrow()
+    if pa is not None:
+        try:
+            buffer = io.BytesIO()
+            jobs.to_parquet(buffer, engine='pyarrow', compression='snappy', index=False)
+            return buffer.getvalue()
+        except (pa.ArrowException, TypeError, ValueError):
+            pass
+    return jobs.copy()
+
+
+def _unpack_jobs(entry) -> pd.DataFrame:
+    """Inverse of _pack_jobs; always returns a frame the caller may modify"""
+    if isinstance(entry, bytes):
+        return _pd().read_parquet(io.BytesIO(entry), engine='pyarrow')
+    return entry.copy()
+
 
 class LinkedInJobScraper:
     """
@@ -23,10 +190,11 @@ class LinkedInJobScraper:
     """
     
     def __init__(self):
-        self.scraper_available = scrape_jobs is not None
+        self.scraper_available = importlib.util.find_spec('jobspy') is not None
         if not self.scraper_available:
-            print("⚠️ JobSpy not available. Install with: pip install python-jobspy")
+            logger.warning("⚠️ JobSpy not available. Install with: pip install python-jobspy")
     
+    @_flushes_log
     def scrape_jobs(
         self,
         search_term: str = "software engineer",
@@ -35,7 +203,7 @@ class LinkedInJobScraper:
         hours_old: Optional[int] = None,
         job_type: Optional[str] = None,
         is_remote: bool = False,
-        linkedin_fetch_description: bool = True,
+        linkedin_fetch_description: bool = False,
         output_file: Optional[str] = None
     ) -> Optional[pd.DataFrame]:
         """
@@ -48,8 +216,9 @@ class LinkedInJobScraper:
             hours_old (int): Filter jobs by hours since posted (optional)
             job_type (str): Job type filter - "fulltime", "parttime", "internship", "contract" (optional)
             is_remote (bool): Filter for remote jobs only
-            linkedin_fetch_description (bool): Fetch full job descriptions (slower but more detailed)
-            output_file (str): Output CSV file path (optional)
+            linkedin_fetch_description (bool): Fetch full job descriptions one by one inside JobSpy
+                (much slower; prefer fetch_job_descriptions for the jobs actually shown)
+            output_file (str): Output CSV file path, or .parquet for Parquet (optional)
         
         Returns:
             pandas.DataFrame: DataFrame containing scraped job data
@@ -58,10 +227,31 @@ class LinkedInJobScraper:
         if not self.scraper_available:
             raise ImportError("JobSpy library not available. Please install with: pip install python-jobspy")
         
-        print(f"🔍 Searching LinkedIn for: '{search_term}' in '{location}'")
-        print(f"📊 Requesting {results_wanted} job results...")
+        cache_key = _job_cache_key({
+            'search_term': search_term,
+            'location': location,
+            'results_wanted': results_wanted,
+            'hours_old': hours_old,
+            'job_type': job_type,
+            'is_remote': is_remote,
+            'linkedin_fetch_description': linkedin_fetch_description,
+        })
+        if _job_cache is not None:
+            with _job_cache_lock:
+                cached = _job_cache.get(cache_key)
+            if cached is not None:
+                jobs = _unpack_jobs(cached)
+                logger.info("♻️ Reusing %s cached LinkedIn jobs for '%s' in '%s'", len(jobs), search_term, location)
+                if output_file:
+                    self._write_jobs(jobs, output_file)
+                return jobs
+        
+        logger.info("🔍 Searching LinkedIn for: '%s' in '%s'", search_term, location)
+        logger.info("📊 Requesting %s job results...", results_wanted)
         
         try:
+            from jobspy import scrape_jobs
+            
             # Scrape jobs from LinkedIn only
             jobs = scrape_jobs(
                 site_name=["linkedin"],  # Only LinkedIn
@@ -75,43 +265,107 @@ class LinkedInJobScraper:
                 verbose=2  # Show detailed logs
             )
             
-            print(f"✅ Found {len(jobs)} LinkedIn jobs!")
+            logger.info("✅ Found %s LinkedIn jobs!", len(jobs))
             
             if len(jobs) > 0:
-                # Display basic info about found jobs
-                print("\n📋 Job Summary:")
-                print(f"   • Total jobs found: {len(jobs)}")
-                print(f"   • Companies: {jobs['company'].nunique()}")
-                print(f"   • Locations: {jobs['location'].nunique()}")
-                
-                # Show first few jobs
-                print("\n🎯 Sample Jobs:")
-                for i, job in jobs.head(3).iterrows():
-                    print(f"   {i+1}. {job['title']} at {job['company']} - {job['location']}")
+                # Job summary and sample jobs are only worth computing for debug output
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "📋 Job Summary: %s jobs, %s companies, %s locations",
+                        len(jobs), jobs['company'].nunique(), jobs['location'].nunique()
+                    )
+                    sample = jobs.head(3).reindex(columns=['title', 'company', 'location'])
+                    for i, job in enumerate(sample.itertuples(index=False), start=1):
+                        logger.debug("🎯 %s. %s at %s - %s", i, job.title, job.company, job.location)
                 
                 # Save to CSV if output file specified
                 if output_file:
-                    jobs.to_csv(
-                        output_file, 
-                        quoting=csv.QUOTE_NONNUMERIC, 
-                        escapechar="\\", 
-                        index=False
-                    )
-                    print(f"\n💾 Jobs saved to: {output_file}")
+                    self._write_jobs(jobs, output_file)
+                    logger.info("💾 Jobs saved to: %s", output_file)
+                
+                if _job_cache is not None:
+                    entry = _pack_jobs(jobs)
+                    with _job_cache_lock:
+                        _job_cache[cache_key] = entry
                 
                 return jobs
             else:
-                print("❌ No jobs found. Try adjusting your search parameters.")
+                logger.info("❌ No jobs found. Try adjusting your search parameters.")
                 return None
                 
         except Exception as e:
-            print(f"❌ Error occurred while scraping: {str(e)}")
-            print("💡 Tips:")
-            print("   • LinkedIn has rate limits - try reducing results_wanted")
-            print("   • Consider using proxies if you get blocked")
-            print("   • Try different search terms or locations")
+            logger.error(
+                "❌ Error occurred while scraping: %s. LinkedIn has rate limits - try reducing "
+                "results_wanted, using proxies, or different search terms or locations", str(e)
+            )
             return None
     
+    @_flushes_log
+    def fetch_job_descriptions(self, job_urls: List[str], max_workers: int = DESCRIPTION_FETCH_WORKERS) -> Dict[str, Optional[str]]:
+        """
+        Fetch full descriptions for several LinkedIn job pages concurrently.
+        
+        Args:
+            job_urls (List[str]): LinkedIn job view URLs; any other URL is skipped
+            max_workers (int): Number of pages fetched in parallel
+            
+        Returns:
+            Dict[str, Optional[str]]: Description text per URL, None if it could not be fetched
+        """
+        if requests is None or BeautifulSoup is None:
+            raise ImportError("requests and beautifulsoup4 are required. Please install with: pip install requests beautifulsoup4")
+        
+        job_urls = list(dict.fromkeys(url for url in job_urls if is_linkedin_job_url(url)))
+        if not job_urls:
+            return {}
+        
+        workers = min(max_workers, len(job_urls))
+        with requests.Session() as session:
+            adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount('https://', adapter)
+            session.headers.update(DESCRIPTION_HEADERS)
+            
+            def fetch(url: str) -> Optional[str]:
+                try:
+                    response = session.get(url, timeout=DESCRIPTION_FETCH_TIMEOUT)
+                    response.raise_for_status()
+                except requests.RequestException as e:
+                    logger.warning("⚠️ Could not fetch job description from %s: %s", url, str(e))
+                    return None
+                
+                soup = BeautifulSoup(response.text, 'html.parser')
+                markup = soup.find('div', class_='show-more-less-html__markup')
+                return markup.get_text('\n', strip=True) if markup else None
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return dict(zip(job_urls, executor.map(fetch, job_urls)))
+    
+    def _write_jobs(self, jobs: pd.DataFrame, output_file: str):
+        """
+        Write jobs to output_file. A .parquet path is written as zstd-compressed
+        Parquet, which keeps dtypes; anything else is written as CSV with PyArrow's
+        multithreaded writer, falling back to pandas when PyArrow is missing or
+        cannot convert a column.
+        
+        Args:
+            jobs (pd.DataFrame): DataFrame containing job data
+            output_file (str): Output CSV or Parquet file path
+        """
+        if output_file.lower().endswith('.parquet'):
+            jobs.to_parquet(output_file, engine='pyarrow', compression='zstd', index=False)
+            return
+        
+        pa, pa_csv = _arrow()
+        if pa_csv is not None:
+            try:
+                table = pa.Table.from_pandas(jobs, preserve_index=False)
+                pa_csv.write_csv(table, output_file, write_options=pa_csv.WriteOptions(quoting_style='needed'))
+                return
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                logger.warning("⚠️ PyArrow CSV writer failed (%s), using pandas", str(e))
+        
+        jobs.to_csv(output_file, quoting=csv.QUOTE_MINIMAL, index=False)
+    
     def get_job_statistics(self, jobs_df: pd.DataFrame) -> Dict[str, Any]:
         """
         Get statistics from scraped jobs data.
@@ -125,15 +379,26 @@ class LinkedInJobScraper:
         if jobs_df is None or len(jobs_df) == 0:
             return {}
         
+        pd = _pd()
+        
+        # One aggregation pass over the columns that are present
+        aggregations = {column: how for column, how in JOB_STAT_AGGREGATIONS.items() if column in jobs_df.columns}
+        totals = jobs_df.agg(aggregations) if aggregations else pd.Series(dtype=float)
+        
+        def total(column, cast, default):
+            # Missing columns and all-NaN means fall back to the default
+            value = totals.get(column)
+            return cast(value) if value is not None and not pd.isna(value) else default
+        
         # Convert numpy types to native Python types for JSON serialization
         stats = {
             'total_jobs': int(len(jobs_df)),
-            'unique_companies': int(jobs_df['company'].nunique()) if 'company' in jobs_df.columns else 0,
-            'unique_locations': int(jobs_df['location'].nunique()) if 'location' in jobs_df.columns else 0,
-            'remote_jobs': int(jobs_df['is_remote'].sum()) if 'is_remote' in jobs_df.columns else 0,
-            'fulltime_jobs': int((jobs_df['job_type'] == 'fulltime').sum()) if 'job_type' in jobs_df.columns else 0,
-            'avg_min_salary': float(jobs_df['min_amount'].mean()) if 'min_amount' in jobs_df.columns and not jobs_df['min_amount'].isna().all() else 0.0,
-            'avg_max_salary': float(jobs_df['max_amount'].mean()) if 'max_amount' in jobs_df.columns and not jobs_df['max_amount'].isna().all() else 0.0,
+            'unique_companies': total('company', int, 0),
+            'unique_locations': total('location', int, 0),
+            'remote_jobs': total('is_remote', int, 0),
+            'fulltime_jobs': int((jobs_df['job_type'].values == 'fulltime').sum()) if 'job_type' in jobs_df.columns else 0,
+            'avg_min_salary': total('min_amount', float, 0.0),
+            'avg_max_salary': total('max_amount', float, 0.0),
         }
         
         return stats
@@ -151,28 +416,29 @@ class LinkedInJobScraper:
         if jobs_df is None or len(jobs_df) == 0:
             return []
         
-        jobs_list = []
-        for _, job in jobs_df.iterrows():
-            # Convert numpy types to native Python types for JSON serialization
-            job_data = {
-                'title': str(job.get('title', '')) if pd.notna(job.get('title')) else '',
-                'company': str(job.get('company', '')) if pd.notna(job.get('company')) else '',
-                'location': str(job.get('location', '')) if pd.notna(job.get('location')) else '',
-                'description': str(job.get('description', '')) if pd.notna(job.get('description')) else '',
-                'url': str(job.get('job_url', '')) if pd.notna(job.get('job_url')) else '',
-                'posted_date': str(job.get('date_posted', '')) if pd.notna(job.get('date_posted')) else '',
-                'job_type': str(job.get('job_type', '')) if pd.notna(job.get('job_type')) else '',
-                'is_remote': bool(job.get('is_remote', False)) if pd.notna(job.get('is_remote')) else False,
-                'min_salary': int(job.get('min_amount', 0)) if pd.notna(job.get('min_amount')) else 0,
-                'max_salary': int(job.get('max_amount', 0)) if pd.notna(job.get('max_amount')) else 0,
-                'currency': str(job.get('currency', 'USD')) if pd.notna(job.get('currency')) else 'USD',
-                'emails': list(job.get('emails', [])) if pd.notna(job.get('emails')) else [],
-                'company_url': str(job.get('company_url', '')) if pd.notna(job.get('company_url')) else '',
-                'company_industry': str(job.get('company_industry', '')) if pd.notna(job.get('company_industry')) else '',
-                'company_num_employees': str(job.get('company_num_employees', '')) if pd.notna(job.get('company_num_employees')) else '',
-                'company_revenue': str(job.get('company_revenue', '')) if pd.notna(job.get('company_revenue')) else '',
-                'scraped_at': datetime.now().isoformat()
-            }
-            jobs_list.append(job_data)
-        
-        return jobs_list
+        pd = _pd()
+        
+        # Build every API field as a whole column, then convert once
+        formatted = pd.DataFrame(index=jobs_df.index)
+        for field, column, kind, default in API_JOB_FIELDS:
+            if column not in jobs_df.columns:
+                if kind == 'emails':
+                    formatted[field] = pd.Series([[] for _ in range(len(jobs_df))], index=jobs_df.index, dtype=object)
+                else:
+                    formatted[field] = default
+                continue
+            
+            values = jobs_df[column]
+            if kind == 'str':
+                formatted[field] = values.astype(str).where(values.notna(), default)
+            elif kind == 'int':
+                formatted[field] = values.fillna(default).astype('int64')
+            elif kind == 'bool':
+                formatted[field] = values.fillna(default).astype(bool)
+            else:
+                formatted[field] = values.map(_split_emails)
+        
+        formatted['scraped_at'] = datetime.now().isoformat()
+        
+        # to_dict converts numpy scalars to native Python types for JSON serialization
+        return formatted.to_dict(orient='records')
@@ -1,15 +1,123 @@
 """
 LinkedIn Data Models for EdFast Platform
 Database models for storing LinkedIn job and post data
+
+The models are msgspec Structs when msgspec is installed (C-level encoding
+and typed decoding) and slotted dataclasses otherwise. Either way they are
+frozen; use replace() to derive an updated copy.
 """
 
 from datetime import datetime
 from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields, replace
+from operator import itemgetter
 import json
+import sqlite3
+import sys
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Per model class: (number of fields, itemgetter over the fields in order)
+_FIELD_GETTERS = {}
+
+
+def _from_dict(cls, data: Dict[str, Any]):
+    """
+    Build a model from a dict. When the dict holds exactly the model's fields,
+    they are passed positionally via a cached itemgetter instead of splatting
+    **data; partial or unexpected dicts go through cls(**data) as before.
+    """
+    entry = _FIELD_GETTERS.get(cls)
+    if entry is None:
+        names = cls.__struct_fields__ if msgspec is not None else tuple(f.name for f in fields(cls))
+        entry = _FIELD_GETTERS[cls] = (len(names), itemgetter(*names))
+    
+    count, getter = entry
+    if len(data) == count:
+        try:
+            return cls(*getter(data))
+        except KeyError:
+            pass
+    return cls(**data)
+
+
+if msgspec is not None:
+    class _Model(msgspec.Struct, frozen=True):
+        """Base for the LinkedIn models, backed by msgspec."""
+        
+        def replace(self, **changes):
+            """Return a copy with the given fields changed."""
+            return msgspec.structs.replace(self, **changes)
+        
+        def to_dict(self) -> Dict[str, Any]:
+            """Convert to dictionary for JSON serialization."""
+            return msgspec.structs.asdict(self)
+        
+        @classmethod
+        def from_dict(cls, data: Dict[str, Any]):
+            """Create instance from dictionary."""
+            return _from_dict(cls, data)
+        
+        def to_json(self) -> str:
+            """Convert to JSON string."""
+            return msgspec.json.encode(self).decode()
+        
+        @classmethod
+        def from_json(cls, json_str: str):
+            """Create instance from JSON string."""
+            return msgspec.json.decode(json_str, type=cls)
+    
+    def _model(cls):
+        # Struct subclasses are already complete classes
+        return cls
+else:
+    class _Model:
+        """Base for the LinkedIn models, backed by dataclasses."""
+        
+        __slots__ = ()
+        
+        def replace(self, **changes):
+            """Return a copy with the given fields changed."""
+            return replace(self, **changes)
+        
+        def to_dict(self) -> Dict[str, Any]:
+            """Convert to dictionary for JSON serialization."""
+            return asdict(self)
+        
+        @classmethod
+        def from_dict(cls, data: Dict[str, Any]):
+            """Create instance from dictionary."""
+            return _from_dict(cls, data)
+        
+        def to_json(self) -> str:
+            """Convert to JSON string."""
+            # orjson encodes dataclasses directly, without the asdict() copy
+            if orjson is not None:
+                return orjson.dumps(self, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+            return json.dumps(asdict(self), default=str)
+        
+        @classmethod
+        def from_json(cls, json_str: str):
+            """Create instance from JSON string."""
+            data = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
+            return cls.from_dict(data)
+    
+    # slots=True needs Python 3.10+
+    if sys.version_info >= (3, 10):
+        _model = dataclass(frozen=True, slots=True)
+    else:
+        _model = dataclass(frozen=True)
 
-@dataclass
-class LinkedInJob:
+@_model
+class LinkedInJob(_Model):
     """LinkedIn Job data model."""
     
     # Basic job information
@@ -43,27 +151,13 @@ class LinkedInJob:
     search_term: Optional[str] = None
     search_location: Optional[str] = None
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return asdict(self)
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'LinkedInJob':
-        """Create instance from dictionary."""
-        return cls(**data)
-    
-    def to_json(self) -> str:
-        """Convert to JSON string."""
-        return json.dumps(self.to_dict(), default=str)
-    
-    @classmethod
-    def from_json(cls, json_str: str) -> 'LinkedInJob':
-        """Create instance from JSON string."""
-        data = json.loads(json_str)
-        return cls.from_dict(data)
+    @staticmethod
+    def bulk_insert(conn, jobs) -> int:
+        """Insert jobs (models or dicts) into linkedin_jobs in one transaction."""
+        return _bulk_insert(conn, LINKEDIN_JOBS_INSERT_SQL, LINKEDIN_JOB_COLUMNS, jobs)
 
-@dataclass
-class LinkedInPost:
+@_model
+class LinkedInPost(_Model):
     """LinkedIn Post data model."""
     
     # Basic post information
@@ -72,9 +166,9 @@ class LinkedInPost:
     type: str  # Original, Shared
     
     # Engagement metrics
-    like_count: str = "0"
-    comment_count: str = "0"
-    repost_count: str = "0"
+    like_count: int = 0
+    comment_count: int = 0
+    repost_count: int = 0
     
     # Media information
     img_url: Optional[str] = None
@@ -88,27 +182,18 @@ class LinkedInPost:
     scraped_at: Optional[str] = None
     profile_name: Optional[str] = None
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+    @staticmethod
+    def bulk_insert(conn, posts) -> int:
+        """Insert posts (models or dicts) into linkedin_posts in one transaction."""
+        return _bulk_insert(conn, LINKEDIN_POSTS_INSERT_SQL, LINKEDIN_POST_COLUMNS, posts)
     
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'LinkedInPost':
-        """Create instance from dictionary."""
-        return cls(**data)
-    
-    def to_json(self) -> str:
-        """Convert to JSON string."""
-        return json.dumps(self.to_dict(), default=str)
-    
-    @classmethod
-    def from_json(cls, json_str: str) -> 'LinkedInPost':
-        """Create instance from JSON string."""
-        data = json.loads(json_str)
-        return cls.from_dict(data)
+    @staticmethod
+    def insert_rows(conn, rows) -> int:
+        """Insert tuples ordered like LINKEDIN_POST_ROW_COLUMNS into linkedin_posts in one transaction."""
+        return _insert_rows(conn, LINKEDIN_POST_ROWS_INSERT_SQL, rows)
 
-@dataclass
-class LinkedInScrapingSession:
+@_model
+class LinkedInScrapingSession(_Model):
     """LinkedIn scraping session data model."""
     
     session_id: str
@@ -119,27 +204,9 @@ class LinkedInScrapingSession:
     completed_at: Optional[str] = None
     status: str = "running"  # running, completed, failed
     error_message: Optional[str] = None
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return asdict(self)
-    
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'LinkedInScrapingSession':
-        """Create instance from dictionary."""
-        return cls(**data)
-    
-    def to_json(self) -> str:
-        """Convert to JSON string."""
-        return json.dumps(self.to_dict(), default=str)
-    
-    @classmethod
-    def from_json(cls, json_str: str) -> 'LinkedInScrapingSession':
-        """Create instance from JSON string."""
-        data = json.loads(json_str)
-        return cls.from_dict(data)
 
-# Database table creation SQL (for SQLite)
+# Database table creation SQL (for SQLite); run with executescript, each
+# constant also creates the indexes for that table
 LINKEDIN_JOBS_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS linkedin_jobs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -164,6 +231,8 @@ CREATE TABLE IF NOT EXISTS linkedin_jobs (
     search_location TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+CREATE INDEX IF NOT EXISTS idx_jobs_search ON linkedin_jobs(search_term, search_location);
+CREATE INDEX IF NOT EXISTS idx_jobs_scraped_at ON linkedin_jobs(scraped_at);
 """
 
 LINKEDIN_POSTS_TABLE_SQL = """
@@ -172,9 +241,9 @@ CREATE TABLE IF NOT EXISTS linkedin_posts (
     post_url TEXT UNIQUE,
     content TEXT,
     type TEXT,
-    like_count TEXT DEFAULT '0',
-    comment_count TEXT DEFAULT '0',
-    repost_count TEXT DEFAULT '0',
+    like_count INTEGER DEFAULT 0,
+    comment_count INTEGER DEFAULT 0,
+    repost_count INTEGER DEFAULT 0,
     img_url TEXT,
     image_drive_link TEXT,
     post_date TEXT,
@@ -183,6 +252,7 @@ CREATE TABLE IF NOT EXISTS linkedin_posts (
     profile_name TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+CREATE INDEX IF NOT EXISTS idx_posts_profile ON linkedin_posts(profile_url, post_date DESC);
 """
 
 LINKEDIN_SESSIONS_TABLE_SQL = """
@@ -198,4 +268,77 @@ CREATE TABLE IF NOT EXISTS linkedin_sessions (
     error_message TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON linkedin_sessions(status, started_at);
 """
+
+# Applied to every connection opened by connect_linkedin_db
+LINKEDIN_DB_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-65536;
+"""
+
+# Columns written by bulk_insert; id and created_at are filled in by SQLite
+LINKEDIN_JOB_COLUMNS = (
+    'title', 'company', 'location', 'description', 'url', 'posted_date', 'job_type',
+    'is_remote', 'min_salary', 'max_salary', 'currency', 'company_url', 'company_industry',
+    'company_num_employees', 'company_revenue', 'emails', 'scraped_at', 'search_term',
+    'search_location',
+)
+
+LINKEDIN_POST_COLUMNS = (
+    'post_url', 'content', 'type', 'like_count', 'comment_count', 'repost_count',
+    'img_url', 'image_drive_link', 'post_date', 'profile_url', 'scraped_at', 'profile_name',
+)
+
+# Field order of the post tuples built by LinkedInPostScraper.scrape_post_rows
+LINKEDIN_POST_ROW_COLUMNS = (
+    'post_url', 'type', 'content', 'like_count', 'comment_count', 'repost_count',
+    'img_url', 'image_drive_link', 'post_date', 'profile_url', 'scraped_at',
+)
+
+
+def _insert_sql(table: str, columns) -> str:
+    return f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+# Built once so every executemany reuses the connection's prepared statement
+LINKEDIN_JOBS_INSERT_SQL = _insert_sql('linkedin_jobs', LINKEDIN_JOB_COLUMNS)
+LINKEDIN_POSTS_INSERT_SQL = _insert_sql('linkedin_posts', LINKEDIN_POST_COLUMNS)
+LINKEDIN_POST_ROWS_INSERT_SQL = _insert_sql('linkedin_posts', LINKEDIN_POST_ROW_COLUMNS)
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+LINKEDIN_DB_CACHED_STATEMENTS = 256
+
+
+def connect_linkedin_db(db_path: str):
+    """Open a SQLite connection with WAL journaling and a 64MB page cache."""
+    conn = sqlite3.connect(db_path, cached_statements=LINKEDIN_DB_CACHED_STATEMENTS)
+    conn.executescript(LINKEDIN_DB_PRAGMAS)
+    return conn
+
+
+def _bulk_insert(conn, sql: str, columns, items) -> int:
+    """
+    Insert many rows with a single executemany inside one transaction.
+    Rows whose UNIQUE url already exists are skipped. Returns the number of
+    rows inserted.
+    """
+    rows = []
+    for item in items:
+        data = item if isinstance(item, dict) else item.to_dict()
+        # List/dict values (emails) are stored as JSON text
+        rows.append(tuple(
+            json.dumps(value) if isinstance(value, (list, dict)) else value
+            for value in (data.get(column) for column in columns)
+        ))
+    return _insert_rows(conn, sql, rows)
+
+
+def _insert_rows(conn, sql: str, rows) -> int:
+    """Run an INSERT OR IGNORE statement for many tuples. Returns rows inserted."""
+    if not rows:
+        return 0
+    with conn:
+        cursor = conn.executemany(sql, rows)
+    return cursor.rowcount
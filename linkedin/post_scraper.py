@@ -1,31 +1,187 @@
 """
 LinkedIn Post Scraper using Selenium
 Integrated version for EdFast platform
+
+Selenium, the Google API client, pandas and xlsxwriter are imported on first
+use, so importing this module does not load them.
 """
 
+import atexit
+import base64
+import importlib.util
 import os
+import re
+import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
-try:
-    from selenium import webdriver
+from .models import LinkedInPost, LINKEDIN_POST_ROW_COLUMNS, LINKEDIN_POSTS_TABLE_SQL, connect_linkedin_db
+
+SELENIUM_AVAILABLE = importlib.util.find_spec("selenium") is not None
+if not SELENIUM_AVAILABLE:
+    print("Warning: Selenium not installed. LinkedIn post scraping will not be available.")
+
+# Selenium names, filled in by _lazy_import_selenium() on first use
+webdriver = None
+Options = None
+By = None
+WebDriverWait = None
+EC = None
+TimeoutException = None
+
+
+def _lazy_import_selenium() -> None:
+    """Import Selenium once and publish the names this module uses."""
+    global webdriver, Options, By, WebDriverWait, EC, TimeoutException
+    if webdriver is not None:
+        return
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.common.by import By
-    from selenium.webdriver.common.keys import Keys
-    from selenium.webdriver.common.action_chains import ActionChains
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
-    from google.oauth2.service_account import Credentials
-    from googleapiclient.http import MediaFileUpload
-    from googleapiclient.discovery import build
-    import pyperclip
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    print("Warning: Selenium or Google API dependencies not installed. LinkedIn post scraping will not be available.")
-    SELENIUM_AVAILABLE = False
+    from selenium.common.exceptions import TimeoutException
+    from selenium import webdriver
+
+# Shared session so image downloads reuse connections (and TLS handshakes)
+_http_session = requests.Session()
+_http_session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+# Chunk size used when streaming image downloads to disk
+IMAGE_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Images downloaded (and uploaded to Drive) in parallel after scraping
+IMAGE_DOWNLOAD_WORKERS = 8
+
+# Idle Chrome drivers kept for reuse, keyed by profile dir. Chrome locks a
+# profile to one running instance, so each dir holds at most one idle driver
+# along with the (headless, images) settings it was launched with.
+_driver_pool = {}
+_driver_pool_lock = threading.Lock()
+
+
+def acquire_driver(profile_dir, settings):
+    """Take the idle driver for a profile if it is live and matches settings, or None.
+    
+    An idle driver launched with other settings is quit so the profile is
+    free for a new Chrome.
+    """
+    with _driver_pool_lock:
+        idle = _driver_pool.pop(profile_dir, None)
+    if idle is None:
+        return None
+    
+    idle_settings, driver = idle
+    if idle_settings != settings:
+        _quit_driver(driver)
+        return None
+    try:
+        driver.current_url  # Raises if Chrome has gone away
+        return driver
+    except Exception:
+        _quit_driver(driver)
+        return None
+
+
+def release_driver(profile_dir, settings, driver) -> None:
+    """Return a driver to the pool, quitting it if its profile already has one."""
+    with _driver_pool_lock:
+        if profile_dir not in _driver_pool:
+            _driver_pool[profile_dir] = (settings, driver)
+            return
+    _quit_driver(driver)
+
+
+def _quit_driver(driver) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+@atexit.register
+def _quit_pooled_drivers() -> None:
+    with _driver_pool_lock:
+        drivers = [driver for _, driver in _driver_pool.values()]
+        _driver_pool.clear()
+    for driver in drivers:
+        _quit_driver(driver)
+
+# Field order of the post rows built by scrape_post_rows
+_POST_KEYS = LINKEDIN_POST_ROW_COLUMNS
+_IMAGE_DRIVE_LINK_INDEX = _POST_KEYS.index("image_drive_link")
+
+
+def _are_rows(posts_data) -> bool:
+    """Whether posts_data holds scrape_post_rows tuples rather than dicts."""
+    return bool(posts_data) and isinstance(posts_data[0], tuple)
+
+# Leading number of an engagement label such as "1,234 reactions"
+_COUNT_RE = re.compile(r"[\d,]+")
+
+
+def _parse_count(label: Optional[str]) -> int:
+    """Parse the number from an engagement count aria-label, 0 if there is none."""
+    match = _COUNT_RE.search(label or "")
+    return int(match.group(0).replace(",", "") or 0) if match else 0
+
+# WebDriverWait timeouts (seconds); waits return as soon as the page is ready
+PAGE_LOAD_TIMEOUT = 10
+SCROLL_LOAD_TIMEOUT = 5
+
+# Post feed selectors. CSS selectors are matched natively by the browser;
+# [class*=...] keeps the substring semantics of XPath contains(@class, ...).
+POSTS_LIST_SELECTOR = "ul[class*='display-flex flex-wrap list-style-none justify-center']"
+POST_ITEM_SELECTOR = ":scope > li"
+
+# Extracts every field of a post <li> in a single execute_script call instead
+# of one WebDriver request per field. The post URL is built from the post's
+# data-urn attribute rather than the "Copy link to post" menu and clipboard.
+EXTRACT_POST_FIELDS_JS = """
+return (function (post) {
+    function labelAt(buttons, i) {
+        return buttons.length > i ? buttons[i].getAttribute("aria-label") : null;
+    }
+
+    var content = "N/A";
+    var description = post.querySelector("div[class*='feed-shared-update-v2__description']");
+    if (description) {
+        var spans = description.querySelectorAll("span[dir='ltr']");
+        if (spans.length) {
+            content = Array.prototype.map.call(spans, function (span) { return span.innerText.trim(); })
+                .filter(function (text) { return text; }).join(" ");
+        } else {
+            content = description.innerText.trim();
+        }
+    }
+
+    var postDate = "N/A";
+    var dateContainer = post.querySelector("span[class*='update-components-actor__sub-description']");
+    var dateElement = dateContainer && dateContainer.querySelector("span[class*='visually-hidden']");
+    if (dateElement) postDate = dateElement.textContent.trim();
+
+    var images = post.querySelectorAll("img[class*='ivm-view-attr__img']");
+    var image = images.length > 1 ? images[1] : images[0];
+
+    var urnHolder = post.hasAttribute("data-urn") ? post : post.querySelector("[data-urn]");
+    var urn = urnHolder && urnHolder.getAttribute("data-urn");
+
+    var counts = post.querySelectorAll("button[class*='social-details-social-counts__count-value']");
+    return {
+        post_url: urn ? "https://www.linkedin.com/feed/update/" + urn + "/" : "N/A",
+        type: post.querySelector("div[class*='feed-shared-update-v2__update-content-wrapper']") ? "Shared" : "Original",
+        content: content,
+        like_label: labelAt(counts, 0),
+        comment_label: labelAt(counts, 1),
+        repost_label: labelAt(counts, 2),
+        post_date: postDate,
+        img_url: image ? image.src : "N/A"
+    };
+})(arguments[0]);
+"""
 
 class LinkedInPostScraper:
     """
@@ -33,13 +189,22 @@ class LinkedInPostScraper:
     Integrated with EdFast platform for social media monitoring.
     """
     
-    def __init__(self, user_data_dir: Optional[str] = None, headless: bool = False):
+    def __init__(self, user_data_dir: Optional[str] = None, headless: bool = False, disable_images: bool = False):
         self.selenium_available = SELENIUM_AVAILABLE
         self.driver = None
+        self._driver_profile = None
+        self._driver_settings = None
         self.user_data_dir = user_data_dir or "chrome_user_data"
         self.headless = headless
+        # Skip loading images in Chrome; post image URLs are still read from the DOM
+        # and downloaded over HTTP instead of from the browser cache
+        self.disable_images = disable_images
         self.image_save_folder = "downloaded_images"
         self.drive_folder_id = None  # Set this if you want to upload to Google Drive
+        # Drive credentials are loaded once; the client is per thread (not thread-safe)
+        self._drive_credentials = None
+        self._drive_lock = threading.Lock()
+        self._drive_local = threading.local()
         
         if not self.selenium_available:
             print("⚠️ Selenium not available. Install with: pip install selenium")
@@ -49,6 +214,14 @@ class LinkedInPostScraper:
         if not self.selenium_available:
             return False
         
+        _lazy_import_selenium()
+        user_data_path = os.path.join(os.getcwd(), self.user_data_dir) if self.user_data_dir else None
+        self._driver_profile = user_data_path
+        self._driver_settings = (self.headless, self.disable_images)
+        self.driver = acquire_driver(self._driver_profile, self._driver_settings)
+        if self.driver:
+            return True
+        
         try:
             chrome_options = Options()
             chrome_options.add_argument("--log-level=3")
@@ -56,11 +229,19 @@ class LinkedInPostScraper:
             chrome_options.add_argument("--start-maximized")
             
             if self.headless:
-                chrome_options.add_argument("--headless")
+                chrome_options.add_argument("--headless=new")
                 chrome_options.add_argument("--window-size=1920,1080")
+                chrome_options.add_argument("--disable-gpu")
+                chrome_options.add_argument("--no-sandbox")
+                chrome_options.add_argument("--disable-dev-shm-usage")
+            
+            content_settings = {"profile.default_content_setting_values.notifications": 2}
+            if self.disable_images:
+                content_settings["profile.managed_default_content_settings.images"] = 2
+                chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+            chrome_options.add_experimental_option("prefs", content_settings)
             
-            if self.user_data_dir:
-                user_data_path = os.path.join(os.getcwd(), self.user_data_dir)
+            if user_data_path:
                 chrome_options.add_argument(f"user-data-dir={user_data_path}")
             
             self.driver = webdriver.Chrome(options=chrome_options)
@@ -76,7 +257,7 @@ class LinkedInPostScraper:
         
         try:
             self.driver.get("https://www.linkedin.com/login")
-            time.sleep(3)
+            self.wait_for_page_load()
             
             # Check if already logged in
             if "feed" in self.driver.current_url or "in/" in self.driver.current_url:
@@ -85,7 +266,7 @@ class LinkedInPostScraper:
             
             print("🔐 Please complete the login manually in the browser...")
             input("Press Enter after completing the login...")
-            time.sleep(5)
+            self.wait_for_page_load()
             
             print("✅ Login successful!")
             return True
@@ -93,39 +274,86 @@ class LinkedInPostScraper:
             print(f"❌ Login error: {e}")
             return False
     
+    def save_cached_image(self, img_url: str, filename: str) -> Optional[str]:
+        """
+        Save an image Chrome has already downloaded, read through the DevTools
+        protocol instead of fetching it again. Returns None if it is not cached.
+        """
+        if not self.driver:
+            return None
+        
+        try:
+            frame_id = self.driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]["id"]
+            resource = self.driver.execute_cdp_cmd(
+                "Page.getResourceContent", {"frameId": frame_id, "url": img_url}
+            )
+        except Exception:
+            return None
+        
+        content = resource.get("content")
+        if not content:
+            return None
+        data = base64.b64decode(content) if resource.get("base64Encoded") else content.encode()
+        
+        os.makedirs(self.image_save_folder, exist_ok=True)
+        file_path = os.path.join(self.image_save_folder, filename)
+        with open(file_path, "wb") as file:
+            file.write(data)
+        return file_path
+    
     def download_image(self, img_url: str, filename: str) -> Optional[str]:
         """Download an image from a URL and save it locally."""
-        if not os.path.exists(self.image_save_folder):
-            os.makedirs(self.image_save_folder)
+        os.makedirs(self.image_save_folder, exist_ok=True)
         
         file_path = os.path.join(self.image_save_folder, filename)
         try:
-            response = requests.get(img_url, stream=True)
-            if response.status_code == 200:
-                with open(file_path, "wb") as file:
-                    for chunk in response.itercontent(1024):
-                        file.write(chunk)
-                return file_path
+            with _http_session.get(img_url, stream=True, timeout=10) as response:
+                if response.status_code == 200:
+                    response.raw.decode_content = True
+                    with open(file_path, "wb") as file:
+                        shutil.copyfileobj(response.raw, file, length=IMAGE_DOWNLOAD_CHUNK_SIZE)
+                    return file_path
         except Exception as e:
             print(f"❌ Error downloading image: {e}")
         return None
     
+    def _get_drive_service(self):
+        """Return this thread's Drive client, building it on first use."""
+        drive_service = getattr(self._drive_local, "service", None)
+        if drive_service is None:
+            from google.oauth2.service_account import Credentials
+            from googleapiclient.discovery import build
+            
+            with self._drive_lock:
+                if self._drive_credentials is None:
+                    self._drive_credentials = Credentials.from_service_account_file(
+                        "credentials.json", 
+                        scopes=["https://www.googleapis.com/auth/drive"]
+                    )
+            # Use the discovery document bundled with the client instead of fetching it
+            drive_service = build(
+                "drive", "v3",
+                credentials=self._drive_credentials,
+                cache_discovery=False,
+                static_discovery=True
+            )
+            self._drive_local.service = drive_service
+        return drive_service
+    
     def upload_to_drive(self, file_path: str) -> Optional[str]:
         """Upload file to Google Drive and return shareable link."""
         if not self.drive_folder_id or not os.path.exists("credentials.json"):
             return None
         
         try:
-            creds = Credentials.from_service_account_file(
-                "credentials.json", 
-                scopes=["https://www.googleapis.com/auth/drive"]
-            )
-            drive_service = build("drive", "v3", credentials=creds)
+            drive_service = self._get_drive_service()
             
             file_metadata = {
                 "name": os.path.basename(file_path),
                 "parents": [self.drive_folder_id]
             }
+            from googleapiclient.http import MediaFileUpload
+            
             media = MediaFileUpload(file_path, mimetype="image/jpeg")
             file = drive_service.files().create(
                 body=file_metadata, 
@@ -145,10 +373,20 @@ class LinkedInPostScraper:
             return None
     
     def scroll_to_element(self, element) -> None:
-        """Scroll smoothly to a specific element."""
+        """Scroll to a specific element."""
         if self.driver:
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-            time.sleep(1.5)
+            # An instant scroll completes synchronously, so there is nothing to wait for
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'instant'});", element)
+    
+    def wait_for_page_load(self, timeout: float = PAGE_LOAD_TIMEOUT) -> bool:
+        """Wait until the current document has finished loading."""
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
+            return True
+        except TimeoutException:
+            return False
     
     def scrape_posts_from_profile(self, profile_url: str, max_posts: int = 50) -> List[Dict[str, Any]]:
         """
@@ -161,30 +399,49 @@ class LinkedInPostScraper:
         Returns:
             List[Dict[str, Any]]: List of scraped post data
         """
+        return self.format_posts_for_api(self.scrape_post_rows(profile_url, max_posts))
+    
+    def scrape_post_rows(self, profile_url: str, max_posts: int = 50) -> List[tuple]:
+        """
+        Scrape posts from a LinkedIn profile or company page as tuples ordered
+        like _POST_KEYS. The save_posts_to_* methods and format_posts_for_api
+        accept these rows directly.
+        """
         if not self.selenium_available or not self.driver:
             raise ImportError("Selenium not available. Please install with: pip install selenium")
         
         all_data = []
+        image_jobs = []  # (row index, img_url, filename), downloaded after scrolling
+        author_url = profile_url.split("/recent-activity")[0]
         last_processed_index = 0
         last_height = self.driver.execute_script("return document.body.scrollHeight")
         
         # Navigate to profile
         self.driver.get(profile_url)
-        time.sleep(5)
-        
-        ul_xpath = "//ul[contains(@class, 'display-flex flex-wrap list-style-none justify-center')]"
-        li_xpath = "./li"
-        more_options_xpath = ".//button[contains(@class, 'feed-shared-control-menu__trigger')]"
+        try:
+            WebDriverWait(self.driver, PAGE_LOAD_TIMEOUT).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, POSTS_LIST_SELECTOR))
+            )
+        except TimeoutException:
+            pass  # Reported below when the post list cannot be found
         
         while len(all_data) < max_posts:
-            # Scroll to bottom
+            # Scroll to bottom and wait for the feed to load more posts
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            try:
+                WebDriverWait(self.driver, SCROLL_LOAD_TIMEOUT).until(
+                    lambda driver: driver.execute_script(
+                        "return document.readyState === 'complete' && document.body.scrollHeight > arguments[0];",
+                        last_height
+                    )
+                )
+            except TimeoutException:
+                pass  # Nothing new loaded; the height check below ends the loop
             
             # Find post elements
             try:
-                ul_element = self.driver.find_element(By.XPATH, ul_xpath)
-                post_elements = ul_element.find_elements(By.XPATH, li_xpath)
+                ul_element = self.driver.find_element(By.CSS_SELECTOR, POSTS_LIST_SELECTOR)
+                post_elements = ul_element.find_elements(By.CSS_SELECTOR, POST_ITEM_SELECTOR)
             except:
                 print("❌ Could not find post elements")
                 break
@@ -199,104 +456,25 @@ class LinkedInPostScraper:
                 try:
                     self.scroll_to_element(post)
                     
-                    # Get post URL
-                    post_url = "N/A"
-                    try:
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, more_options_xpath))
-                        )
-                        more_button = post.find_element(By.XPATH, more_options_xpath)
-                        self.driver.execute_script("arguments[0].click();", more_button)
-                        time.sleep(1.5)
-                        
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.XPATH, "//h5[normalize-space()='Copy link to post']"))
-                        )
-                        post.find_element(By.XPATH, "//h5[normalize-space()='Copy link to post']").click()
-                        post_url = pyperclip.paste()
-                    except:
-                        pass
-                    
-                    # Determine post type
-                    post_type = "Shared" if post.find_elements(
-                        By.XPATH, ".//div[contains(@class, 'feed-shared-update-v2__update-content-wrapper')]"
-                    ) else "Original"
-                    
-                    # Extract post content
-                    post_content = "N/A"
-                    try:
-                        post_container = post.find_element(
-                            By.XPATH, ".//div[contains(@class, 'feed-shared-update-v2__description')]"
-                        )
-                        text_spans = post_container.find_elements(By.XPATH, ".//span[@dir='ltr']")
-                        post_content = " ".join(
-                            span.text.strip() for span in text_spans if span.text.strip()
-                        ) if text_spans else post_container.text.strip()
-                    except:
-                        pass
-                    
-                    # Extract engagement metrics
-                    like_count = "0"
-                    comment_count = "0"
-                    repost_count = "0"
-                    try:
-                        counts = post.find_elements(
-                            By.XPATH, ".//button[contains(@class, 'social-details-social-counts__count-value')]"
-                        )
-                        like_count = counts[0].get_attribute("aria-label").split(" ")[0] if len(counts) > 0 else "0"
-                        comment_count = counts[1].get_attribute("aria-label").split(" ")[0] if len(counts) > 1 else "0"
-                        repost_count = counts[2].get_attribute("aria-label").split(" ")[0] if len(counts) > 2 else "0"
-                    except:
-                        pass
-                    
-                    # Extract post date
-                    post_date = "N/A"
-                    try:
-                        post_date_container = post.find_element(
-                            By.XPATH, ".//span[contains(@class, 'update-components-actor__sub-description')]"
-                        )
-                        post_date_element = post_date_container.find_element(
-                            By.XPATH, ".//span[contains(@class, 'visually-hidden')]"
-                        )
-                        post_date = post_date_element.text.strip()
-                    except:
-                        pass
-                    
-                    # Extract image
-                    img_url = "N/A"
+                    # Read URL, type, content, counts, date and image URL in one browser round-trip
+                    fields = self.driver.execute_script(EXTRACT_POST_FIELDS_JS, post) or {}
+                    post_url = fields.get("post_url") or "N/A"
+                    post_type = fields.get("type") or "Original"
+                    post_content = fields.get("content") or "N/A"
+                    like_count = _parse_count(fields.get("like_label"))
+                    comment_count = _parse_count(fields.get("comment_label"))
+                    repost_count = _parse_count(fields.get("repost_label"))
+                    post_date = fields.get("post_date") or "N/A"
+                    # The image itself is downloaded after scrolling
+                    img_url = fields.get("img_url") or "N/A"
                     img_drive_link = "No Image"
-                    try:
-                        image_elements = post.find_elements(
-                            By.XPATH, ".//img[contains(@class, 'ivm-view-attr__img')]"
-                        )
-                        if len(image_elements) > 1:
-                            img_url = image_elements[1].get_attribute("src")
-                        elif len(image_elements) > 0:
-                            img_url = image_elements[0].get_attribute("src")
-                        
-                        if img_url != "N/A":
-                            filename = f"post_image_{time.time()}.jpg"
-                            local_image_path = self.download_image(img_url, filename)
-                            if local_image_path and self.drive_folder_id:
-                                img_drive_link = self.upload_to_drive(local_image_path) or "Upload Failed"
-                    except:
-                        pass
                     
-                    post_data = {
-                        "post_url": post_url,
-                        "type": post_type,
-                        "content": post_content,
-                        "like_count": like_count,
-                        "comment_count": comment_count,
-                        "repost_count": repost_count,
-                        "img_url": img_url,
-                        "image_drive_link": img_drive_link,
-                        "post_date": post_date,
-                        "profile_url": profile_url.split("/recent-activity")[0],
-                        "scraped_at": datetime.now().isoformat()
-                    }
-                    
-                    all_data.append(post_data)
+                    if img_url and img_url != "N/A":
+                        image_jobs.append((len(all_data), img_url, f"post_image_{time.time()}.jpg"))
+                    all_data.append((
+                        post_url, post_type, post_content, like_count, comment_count, repost_count,
+                        img_url, img_drive_link, post_date, author_url, datetime.now().isoformat(),
+                    ))
                     print(f"✅ Scraped post {len(all_data)}: {post_content[:50]}...")
                     
                 except Exception as e:
@@ -313,21 +491,106 @@ class LinkedInPostScraper:
                 break
             last_height = new_height
         
+        if image_jobs:
+            self._download_post_images(all_data, image_jobs)
+        
         return all_data
     
+    def _download_post_images(self, rows: List[tuple], image_jobs: List[tuple]) -> None:
+        """Download post images, and upload them to Drive if configured, on a thread pool."""
+        # Images the browser already loaded are read from its cache first (WebDriver
+        # is not thread-safe, so this runs here); only misses are fetched over HTTP
+        local_paths = [self.save_cached_image(img_url, filename) for _, img_url, filename in image_jobs]
+        
+        with ThreadPoolExecutor(max_workers=IMAGE_DOWNLOAD_WORKERS) as executor:
+            misses = [i for i, path in enumerate(local_paths) if path is None]
+            downloaded = executor.map(lambda i: self.download_image(image_jobs[i][1], image_jobs[i][2]), misses)
+            for i, path in zip(misses, downloaded):
+                local_paths[i] = path
+            
+            if not self.drive_folder_id:
+                return
+            uploads = [(job[0], path) for job, path in zip(image_jobs, local_paths) if path]
+            links = executor.map(lambda upload: self.upload_to_drive(upload[1]), uploads)
+            for (index, _), link in zip(uploads, links):
+                row = rows[index]
+                rows[index] = (
+                    row[:_IMAGE_DRIVE_LINK_INDEX] + (link or "Upload Failed",) + row[_IMAGE_DRIVE_LINK_INDEX + 1:]
+                )
+    
     def save_posts_to_excel(self, posts_data: List[Dict[str, Any]], filename: str = "linkedin_posts.xlsx") -> str:
         """Save scraped posts data to Excel file."""
-        df = pd.DataFrame(posts_data)
-        df.to_excel(filename, index=False)
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+        
+        if xlsxwriter is not None:
+            # Rows are streamed to disk as they are written
+            workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+            worksheet = workbook.add_worksheet()
+            if _are_rows(posts_data):
+                columns = _POST_KEYS
+                rows = posts_data
+            else:
+                columns = list(posts_data[0].keys()) if posts_data else []
+                rows = ([post.get(column) for column in columns] for post in posts_data)
+            worksheet.write_row(0, 0, columns)
+            for row_index, row in enumerate(rows, start=1):
+                worksheet.write_row(row_index, 0, row)
+            workbook.close()
+        else:
+            import pandas as pd
+            
+            df = pd.DataFrame(posts_data, columns=_POST_KEYS) if _are_rows(posts_data) else pd.DataFrame(posts_data)
+            df.to_excel(filename, index=False)
         print(f"✅ Data saved to {filename}")
         return filename
     
+    def save_posts_to_parquet(self, posts_data: List[Dict[str, Any]], filename: str = "linkedin_posts.parquet") -> str:
+        """Save scraped posts data to a zstd-compressed Parquet file."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        # Dictionary encoding suits repetitive columns like type and profile_url
+        if _are_rows(posts_data):
+            table = pa.Table.from_arrays([list(column) for column in zip(*posts_data)], names=list(_POST_KEYS))
+        else:
+            table = pa.Table.from_pylist(posts_data)
+        pq.write_table(table, filename, compression='zstd', use_dictionary=True)
+        print(f"✅ Data saved to {filename}")
+        return filename
+    
+    def save_posts_to_sqlite(
+        self,
+        posts_data: List[Dict[str, Any]],
+        db_path: str = "linkedin_posts.db",
+        batch_size: int = 1000
+    ) -> int:
+        """Save scraped posts to SQLite in batches; returns the number of new rows."""
+        conn = connect_linkedin_db(db_path)
+        try:
+            conn.executescript(LINKEDIN_POSTS_TABLE_SQL)
+            inserted = 0
+            for start in range(0, len(posts_data), batch_size):
+                batch = posts_data[start:start + batch_size]
+                if _are_rows(batch):
+                    inserted += LinkedInPost.insert_rows(conn, batch)
+                else:
+                    inserted += LinkedInPost.bulk_insert(conn, batch)
+        finally:
+            conn.close()
+        print(f"✅ Saved {inserted} new posts to {db_path}")
+        return inserted
+    
     def format_posts_for_api(self, posts_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Format posts data for API response."""
+        if _are_rows(posts_data):
+            return [dict(zip(_POST_KEYS, row)) for row in posts_data]
         return posts_data
     
     def close(self) -> None:
-        """Close the WebDriver."""
+        """Release the WebDriver back to the pool for the next scraping session."""
         if self.driver:
-            self.driver.quit()
+            release_driver(self._driver_profile, self._driver_settings, self.driver)
             self.driver = None
@@ -1,15 +1,28 @@
 """
 PeerHub module initialization.
 Provides unified interface for both JSON and database backends.
+
+PeerHubService is resolved lazily (PEP 562) so that importing the package
+does not load SQLAlchemy or the JSON backend until the service is used.
 """
 
-from config.app_config import USE_DATABASE
+__all__ = ['PeerHubService']
 
-if USE_DATABASE:
-    # Use database-backed service
-    from peerhub.db_service import PeerHubDBService as PeerHubService
-else:
-    # Use legacy JSON-backed service
-    from peerhub.service import PeerHubService
 
-__all__ = ['PeerHubService']
+def __getattr__(name):
+    if name == 'PeerHubService':
+        from config.app_config import USE_DATABASE
+
+        if USE_DATABASE:
+            # Use database-backed service
+            from peerhub.db_service import PeerHubDBService as value
+        else:
+            # Use legacy JSON-backed service
+            from peerhub.service import PeerHubService as value
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
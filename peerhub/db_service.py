@@ -3,13 +3,146 @@ Database-backed PeerHub service.
 Replaces JSON-based service with SQLAlchemy database operations.
 """
 
-from typing import List, Dict, Optional
+import copy
+import threading
+from collections import Counter
+from typing import Any, List, Dict, Optional
 from datetime import datetime, timedelta
-from sqlalchemy import or_, and_, func, desc, String
+from sqlalchemy import inspect, or_, and_, func, desc, select, insert, update, delete, bindparam, case, cast, true, tuple_, lambda_stmt, literal_column, String
+from sqlalchemy.dialects.postgresql import JSONB, insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only, make_transient_to_detached, with_expression
+from sqlalchemy.orm.attributes import set_committed_value
 
-from database.models import User, Post, Comment, Vote
-from database.db_config import get_session
+from database.models import User, Post, Comment, Vote, POST_SEARCH_VECTOR
+from database.db_config import session_scope
+
+try:
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
+
+# Characters of content that list views show; one more is loaded so they can
+# tell the body was cut
+POST_PREVIEW_LENGTH = 200
+
+# Every Post column except the body
+_POST_LIST_COLUMNS = (
+    Post.id, Post.title, Post.author_id, Post.tags, Post.file_link, Post.course_code,
+    Post.course_name, Post.semester, Post.upvotes, Post.downvotes, Post.comments_count,
+    Post.views_count, Post.score, Post.engagement, Post.is_pinned, Post.is_deleted,
+    Post.created_at, Post.updated_at,
+)
+
+# Feed pages show the full body
+_POST_FEED_OPTIONS = (load_only(*_POST_LIST_COLUMNS, Post.content, Post.content_preview),)
+
+# Search and trending results only show a preview, so the body stays in the
+# database; reading post.content on them raises instead of lazy loading
+_POST_SUMMARY_OPTIONS = (
+    load_only(*_POST_LIST_COLUMNS, raiseload=True),
+    with_expression(Post.content_preview, func.substr(Post.content, 1, POST_PREVIEW_LENGTH + 1)),
+)
+
+
+# Short-lived per-process caches of hot reads. Writes made through this service
+# evict the affected post; other staleness is bounded by the TTL.
+_user_cache = TTLCache(maxsize=10_000, ttl=30) if TTLCache is not None else None
+_post_cache = TTLCache(maxsize=10_000, ttl=30) if TTLCache is not None else None
+_stats_cache = TTLCache(maxsize=1, ttl=60) if TTLCache is not None else None
+_tags_cache = TTLCache(maxsize=64, ttl=300) if TTLCache is not None else None
+_cache_lock = threading.Lock()
+
+
+def _cached(cache, key, load):
+    """
+    Return a copy of cache[key], calling load() on a miss. None results are not cached.
+    
+    Callers get their own copy, so editing a returned post cannot leak into
+    the cached one.
+    """
+    if cache is None:
+        return load()
+    with _cache_lock:
+        value = cache.get(key)
+    if value is None:
+        value = load()
+        if value is not None:
+            with _cache_lock:
+                cache[key] = value
+    return _copy_cached(value)
+
+
+def _copy_cached(value):
+    """Copy a cached value; ORM instances become new detached instances."""
+    state = inspect(value, raiseerr=False)
+    if state is None:
+        return copy.deepcopy(value)
+    
+    clone = state.mapper.class_manager.new_instance()
+    for key in state.mapper.column_attrs.keys():
+        if key in state.dict:
+            set_committed_value(clone, key, copy.deepcopy(state.dict[key]))
+    make_transient_to_detached(clone)
+    return clone
+
+
+def _evict_post(post_id: str):
+    if _post_cache is not None:
+        with _cache_lock:
+            _post_cache.pop(post_id, None)
+
+
+def _is_postgresql(session) -> bool:
+    return session.get_bind().dialect.name == 'postgresql'
+
+
+def _insert(session, model):
+    """INSERT supporting on_conflict_do_update for the session's database."""
+    return postgresql_insert(model) if _is_postgresql(session) else sqlite_insert(model)
+
+
+def _non_negative(value):
+    """Clamp a counter expression at zero."""
+    return case((value < 0, 0), else_=value)
+
+
+def _json_array_has(column, value):
+    """SQLite: whether the JSON array in column holds value."""
+    element = func.json_each(column).table_valued('value')
+    return select(1).select_from(element).where(element.c.value == value).exists()
+
+
+def _tags_contain(session, tags: List[str]):
+    """Match posts tagged with every tag in tags.
+    
+    On PostgreSQL this is a single jsonb @> predicate served by the GIN
+    index on tags, with the list bound as one parameter.
+    """
+    if _is_postgresql(session):
+        return Post.tags.op('@>')(cast(tags, JSONB))
+    return and_(*(_json_array_has(Post.tags, tag) for tag in tags))
+
+
+def _keyset_after(sort_column, after_id: str):
+    """Posts that come after post after_id when ordered by (sort_column, id) descending."""
+    after_value = select(sort_column).where(Post.id == after_id).scalar_subquery()
+    return tuple_(sort_column, Post.id) < tuple_(after_value, after_id)
+
+
+def _text_search_filter(session, query: str):
+    """Match posts whose title or content contains query.
+    
+    Uses the full-text GIN index on PostgreSQL and a case-insensitive
+    substring match elsewhere (SQLite).
+    """
+    if _is_postgresql(session):
+        return POST_SEARCH_VECTOR.op('@@')(func.plainto_tsquery(literal_column("'english'"), query))
+    return or_(
+        Post.title.icontains(query, autoescape=True),
+        Post.content.icontains(query, autoescape=True)
+    )
 
 
 class PeerHubDBService:
@@ -23,44 +156,39 @@ class PeerHubDBService:
     
     def create_user(self, user_id: str, username: str, name: str, email: str = "") -> Optional[User]:
         """Create a new PeerHub user profile."""
-        session = get_session()
         try:
-            # Check if user already exists
-            existing_user = session.query(User).filter(User.id == user_id).first()
-            if existing_user:
-                return existing_user
-            
-            user = User(
-                id=user_id,
-                username=username,
-                name=name,
-                email=email
-            )
-            session.add(user)
-            session.commit()
-            session.refresh(user)
+            with session_scope() as session:
+                # Check if user already exists
+                existing_user = session.query(User).filter(User.id == user_id).first()
+                if existing_user:
+                    return existing_user
+                
+                user = User(
+                    id=user_id,
+                    username=username,
+                    name=name,
+                    email=email
+                )
+                session.add(user)
             return user
         except IntegrityError:
-            session.rollback()
             return None
-        finally:
-            session.close()
     
     def get_user(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
-        session = get_session()
-        try:
-            return session.query(User).filter(User.id == user_id).first()
-        finally:
-            session.close()
+        def load():
+            with session_scope(read_only=True) as session:
+                return session.execute(
+                    lambda_stmt(lambda: select(User).where(User.id == user_id))
+                ).scalars().first()
+        return _cached(_user_cache, user_id, load)
     
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
-        session = get_session()
-        try:
-            return session.query(User).filter(User.username == username).first()
-        finally:
-            session.close()
+        with session_scope(read_only=True) as session:
+            return session.execute(
+                lambda_stmt(lambda: select(User).where(User.username == username))
+            ).scalars().first()
     
     # ==================== Post Operations ====================
     
@@ -68,153 +196,181 @@ class PeerHubDBService:
                    file_link: str = "", course_code: str = None, course_name: str = None,
                    semester: int = None) -> Optional[Post]:
         """Create a new post."""
-        session = get_session()
         try:
-            post = Post(
-                title=title,
-                content=content,
-                author_id=author_id,
-                tags=tags or [],
-                file_link=file_link,
-                course_code=course_code,
-                course_name=course_name,
-                semester=semester
-            )
-            session.add(post)
-            session.commit()
-            session.refresh(post)
+            with session_scope() as session:
+                post = Post(
+                    title=title,
+                    content=content,
+                    author_id=author_id,
+                    tags=tags or [],
+                    file_link=file_link,
+                    course_code=course_code,
+                    course_name=course_name,
+                    semester=semester
+                )
+                session.add(post)
             return post
         except Exception as e:
-            session.rollback()
             print(f"Error creating post: {e}")
             return None
-        finally:
-            session.close()
+    
+    def create_posts_bulk(self, rows: List[Dict]) -> List[str]:
+        """
+        Create many posts in one INSERT and one commit.
+        
+        Each row takes the keyword arguments of create_post. Returns the new
+        post IDs in row order, or an empty list on error.
+        """
+        if not rows:
+            return []
+        params = [{
+            'title': row['title'],
+            'content': row['content'],
+            'author_id': row['author_id'],
+            'tags': row.get('tags') or [],
+            'file_link': row.get('file_link', ""),
+            'course_code': row.get('course_code'),
+            'course_name': row.get('course_name'),
+            'semester': row.get('semester'),
+        } for row in rows]
+        try:
+            with session_scope() as session:
+                # render_nulls keeps rows with and without optional fields in one batch
+                return session.scalars(
+                    insert(Post).returning(Post.id, sort_by_parameter_order=True)
+                    .execution_options(render_nulls=True),
+                    params
+                ).all()
+        except Exception as e:
+            print(f"Error creating posts: {e}")
+            return []
     
     def get_post(self, post_id: str) -> Optional[Post]:
         """Get post by ID."""
-        session = get_session()
-        try:
-            return session.query(Post).filter(
-                Post.id == post_id,
-                Post.is_deleted == False
-            ).first()
-        finally:
-            session.close()
+        def load():
+            with session_scope(read_only=True) as session:
+                return session.execute(
+                    lambda_stmt(lambda: select(Post).where(Post.id == post_id, Post.is_deleted == False))
+                ).scalars().first()
+        return _cached(_post_cache, post_id, load)
     
     def get_posts(self, limit: int = 50, offset: int = 0, tag: str = None,
                  author_id: str = None, course_code: str = None,
-                 sort_by: str = "created_at") -> List[Post]:
-        """Get posts with filtering and sorting."""
-        session = get_session()
-        try:
-            query = session.query(Post).filter(Post.is_deleted == False)
+                 sort_by: str = "created_at", after_id: str = None) -> List[Post]:
+        """
+        Get posts with filtering and sorting.
+        
+        Pass the id of the last post of the previous page as after_id to
+        fetch the next page by keyset instead of offset.
+        """
+        with session_scope(read_only=True) as session:
+            stmt = lambda_stmt(lambda: select(Post).options(*_POST_FEED_OPTIONS).where(Post.is_deleted == False))
             
             # Apply filters
-            if tag:
-                query = query.filter(Post.tags.contains([tag]))
+            if tag and _is_postgresql(session):
+                tag_list = [tag]
+                stmt += lambda s: s.where(Post.tags.op('@>')(cast(tag_list, JSONB)))
+            elif tag:
+                stmt += lambda s: s.where(_json_array_has(Post.tags, tag))
             if author_id:
-                query = query.filter(Post.author_id == author_id)
+                stmt += lambda s: s.where(Post.author_id == author_id)
             if course_code:
-                query = query.filter(Post.course_code == course_code)
+                stmt += lambda s: s.where(Post.course_code == course_code)
             
-            # Apply sorting
-            if sort_by == "created_at":
-                query = query.order_by(desc(Post.created_at))
-            elif sort_by == "score":
-                query = query.order_by(desc(Post.upvotes - Post.downvotes))
-            elif sort_by == "comments":
-                query = query.order_by(desc(Post.comments_count))
+            # Apply sorting; id breaks ties so keyset pages are stable
+            sort_column = {
+                "created_at": Post.created_at,
+                "score": Post.score,
+                "comments": Post.comments_count,
+            }.get(sort_by)
+            if sort_column is not None:
+                stmt += lambda s: s.order_by(desc(sort_column), desc(Post.id))
             
             # Apply pagination
-            posts = query.offset(offset).limit(limit).all()
-            return posts
-        finally:
-            session.close()
+            if after_id and sort_column is not None:
+                after = _keyset_after(sort_column, after_id)
+                stmt += lambda s: s.where(after).limit(limit)
+            else:
+                stmt += lambda s: s.offset(offset).limit(limit)
+            return session.execute(stmt).scalars().all()
     
     def update_post(self, post: Post) -> bool:
         """Update an existing post."""
-        session = get_session()
-        try:
-            existing_post = session.query(Post).filter(Post.id == post.id).first()
-            if existing_post:
-                existing_post.title = post.title
-                existing_post.content = post.content
-                existing_post.tags = post.tags
-                existing_post.file_link = post.file_link
-                existing_post.updated_at = datetime.utcnow()
-                session.commit()
-                return True
-            return False
-        finally:
-            session.close()
+        with session_scope() as session:
+            result = session.execute(
+                update(Post)
+                .where(Post.id == post.id, Post.is_deleted == False)
+                .values(
+                    title=post.title,
+                    content=post.content,
+                    tags=post.tags,
+                    file_link=post.file_link,
+                    updated_at=datetime.utcnow()
+                )
+                .execution_options(synchronize_session=False)
+            )
+        _evict_post(post.id)
+        return result.rowcount > 0
     
     def delete_post(self, post_id: str, user_id: str) -> bool:
         """Soft delete a post."""
-        session = get_session()
-        try:
-            post = session.query(Post).filter(Post.id == post_id).first()
-            if post and post.author_id == user_id:
-                post.is_deleted = True
-                post.updated_at = datetime.utcnow()
-                session.commit()
-                return True
-            return False
-        finally:
-            session.close()
+        with session_scope() as session:
+            # Only the author's own post matches
+            result = session.execute(
+                update(Post)
+                .where(Post.id == post_id, Post.author_id == user_id)
+                .values(is_deleted=True, updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+        _evict_post(post_id)
+        return result.rowcount > 0
     
     def search_posts(self, query: str, limit: int = 20, search_type: str = "all") -> List[Post]:
-        """Search posts by query."""
-        session = get_session()
-        try:
-            search_query = session.query(Post).filter(Post.is_deleted == False)
-            
-            query_lower = query.lower()
+        """
+        Search posts by query.
+        
+        Posts carry every column except content; read content_preview (the
+        first POST_PREVIEW_LENGTH + 1 characters) instead.
+        """
+        with session_scope(read_only=True) as session:
+            search_query = session.query(Post).options(*_POST_SUMMARY_OPTIONS).filter(Post.is_deleted == False)
             
+            # ILIKE on PostgreSQL (trigram-indexed), lower() LIKE elsewhere;
+            # autoescape keeps % and _ in the query literal
             if search_type == "title":
-                search_query = search_query.filter(func.lower(Post.title).contains(query_lower))
+                search_query = search_query.filter(Post.title.icontains(query, autoescape=True))
             elif search_type == "content":
-                search_query = search_query.filter(func.lower(Post.content).contains(query_lower))
+                search_query = search_query.filter(Post.content.icontains(query, autoescape=True))
             elif search_type == "tags":
-                # PostgreSQL JSON contains, fallback for SQLite
+                # Substring match on the lowered tags text, as indexed by posts_tags_trgm
                 search_query = search_query.filter(
-                    func.lower(func.cast(Post.tags, String)).contains(query_lower)
+                    func.lower(cast(Post.tags, String)).contains(query.lower(), autoescape=True)
                 )
             else:  # "all"
-                search_query = search_query.filter(
-                    or_(
-                        func.lower(Post.title).contains(query_lower),
-                        func.lower(Post.content).contains(query_lower)
-                    )
-                )
+                search_query = search_query.filter(_text_search_filter(session, query))
             
             posts = search_query.order_by(desc(Post.created_at)).limit(limit).all()
             return posts
-        finally:
-            session.close()
     
     def advanced_search(self, query: str = None, tags: List[str] = None, author_id: str = None,
                        date_from: datetime = None, date_to: datetime = None,
                        min_score: int = None, sort_by: str = "relevance") -> List[Post]:
-        """Advanced search with multiple filters."""
-        session = get_session()
-        try:
-            search_query = session.query(Post).filter(Post.is_deleted == False)
+        """
+        Advanced search with multiple filters.
+        
+        Posts carry every column except content; read content_preview (the
+        first POST_PREVIEW_LENGTH + 1 characters) instead.
+        """
+        with session_scope(read_only=True) as session:
+            search_query = session.query(Post).options(*_POST_SUMMARY_OPTIONS).filter(Post.is_deleted == False)
             
             # Text search
             if query:
-                query_lower = query.lower()
-                search_query = search_query.filter(
-                    or_(
-                        func.lower(Post.title).contains(query_lower),
-                        func.lower(Post.content).contains(query_lower)
-                    )
-                )
+                search_query = search_query.filter(_text_search_filter(session, query))
             
-            # Tag filter
+            # Tag filter: one jsonb @> predicate for all tags on PostgreSQL
             if tags:
-                for tag in tags:
-                    search_query = search_query.filter(Post.tags.contains([tag]))
+                search_query = search_query.filter(_tags_contain(session, list(tags)))
             
             # Author filter
             if author_id:
@@ -228,300 +384,331 @@ class PeerHubDBService:
             
             # Score filter
             if min_score is not None:
-                search_query = search_query.filter((Post.upvotes - Post.downvotes) >= min_score)
+                search_query = search_query.filter(Post.score >= min_score)
             
             # Sorting
             if sort_by == "date":
                 search_query = search_query.order_by(desc(Post.created_at))
             elif sort_by == "score":
-                search_query = search_query.order_by(desc(Post.upvotes - Post.downvotes))
+                search_query = search_query.order_by(desc(Post.score))
             elif sort_by == "comments":
                 search_query = search_query.order_by(desc(Post.comments_count))
             else:  # relevance
                 search_query = search_query.order_by(desc(Post.created_at))
             
             return search_query.limit(100).all()
-        finally:
-            session.close()
     
     def get_trending_posts(self, limit: int = 10, days: int = 7) -> List[Post]:
-        """Get trending posts based on recent engagement."""
-        session = get_session()
-        try:
+        """
+        Get trending posts based on recent engagement.
+        
+        Posts carry every column except content; read content_preview (the
+        first POST_PREVIEW_LENGTH + 1 characters) instead.
+        """
+        with session_scope(read_only=True) as session:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
-            posts = session.query(Post).filter(
+            posts = session.query(Post).options(*_POST_SUMMARY_OPTIONS).filter(
                 Post.is_deleted == False,
                 Post.created_at >= cutoff_date
-            ).order_by(
-                desc((Post.upvotes - Post.downvotes) + Post.comments_count)
-            ).limit(limit).all()
+            ).order_by(desc(Post.engagement)).limit(limit).all()
             return posts
-        finally:
-            session.close()
     
     def get_popular_tags(self, limit: int = 20) -> List[Dict]:
         """Get popular tags with counts."""
-        session = get_session()
-        try:
-            # This is a simplified version - for production, consider a dedicated tags table
-            posts = session.query(Post).filter(Post.is_deleted == False).all()
-            tag_counts = {}
-            
-            for post in posts:
-                if post.tags:
-                    for tag in post.tags:
-                        tag_counts[tag] = tag_counts.get(tag, 0) + 1
-            
-            sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
-            return [{"tag": tag, "count": count} for tag, count in sorted_tags[:limit]]
-        finally:
-            session.close()
+        def load():
+            with session_scope(read_only=True) as session:
+                # Unnest the tags array in the database and count there
+                if _is_postgresql(session):
+                    tag = func.jsonb_array_elements_text(Post.tags).table_valued('value').alias('tag')
+                else:
+                    tag = func.json_each(Post.tags).table_valued('value').alias('tag')
+                count = func.count().label('count')
+                
+                rows = session.execute(
+                    select(tag.c.value, count)
+                    .select_from(Post)
+                    .join(tag, true())
+                    .where(Post.is_deleted == False)
+                    .group_by(tag.c.value)
+                    .order_by(desc(count))
+                    .limit(limit)
+                )
+                return [{"tag": tag_name, "count": tag_count} for tag_name, tag_count in rows]
+        return _cached(_tags_cache, limit, load)
     
     # ==================== Comment Operations ====================
     
     def create_comment(self, post_id: str, content: str, author_id: str,
                       parent_id: str = None) -> Optional[Comment]:
         """Create a new comment."""
-        session = get_session()
         try:
-            comment = Comment(
-                post_id=post_id,
-                content=content,
-                author_id=author_id,
-                parent_id=parent_id
-            )
-            session.add(comment)
-            
-            # Update post comment count
-            post = session.query(Post).filter(Post.id == post_id).first()
-            if post:
-                post.comments_count += 1
-            
-            session.commit()
-            session.refresh(comment)
+            with session_scope() as session:
+                comment = Comment(
+                    post_id=post_id,
+                    content=content,
+                    author_id=author_id,
+                    parent_id=parent_id
+                )
+                session.add(comment)
+                
+                # Update post comment count atomically on the server
+                session.execute(
+                    update(Post)
+                    .where(Post.id == post_id)
+                    .values(comments_count=Post.comments_count + 1)
+                    .execution_options(synchronize_session=False)
+                )
+            _evict_post(post_id)
             return comment
         except Exception as e:
-            session.rollback()
             print(f"Error creating comment: {e}")
             return None
-        finally:
-            session.close()
     
-    def get_comments(self, post_id: str) -> List[Comment]:
-        """Get all comments for a post."""
-        session = get_session()
+    def create_comments_bulk(self, rows: List[Dict]) -> List[str]:
+        """
+        Create many comments in one INSERT and one commit.
+        
+        Each row takes the keyword arguments of create_comment. Returns the
+        new comment IDs in row order, or an empty list on error.
+        """
+        if not rows:
+            return []
+        params = [{
+            'post_id': row['post_id'],
+            'content': row['content'],
+            'author_id': row['author_id'],
+            'parent_id': row.get('parent_id'),
+        } for row in rows]
+        added = Counter(row['post_id'] for row in params)
         try:
-            return session.query(Comment).filter(
-                Comment.post_id == post_id,
-                Comment.is_deleted == False
-            ).order_by(Comment.created_at).all()
-        finally:
-            session.close()
+            with session_scope() as session:
+                comment_ids = session.scalars(
+                    insert(Comment).returning(Comment.id, sort_by_parameter_order=True)
+                    .execution_options(render_nulls=True),
+                    params
+                ).all()
+                
+                # One executemany bumps every affected post's comment count
+                posts = Post.__table__
+                session.execute(
+                    update(posts)
+                    .where(posts.c.id == bindparam('target_id'))
+                    .values(comments_count=posts.c.comments_count + bindparam('added')),
+                    [{'target_id': post_id, 'added': count} for post_id, count in added.items()]
+                )
+        except Exception as e:
+            print(f"Error creating comments: {e}")
+            return []
+        for post_id in added:
+            _evict_post(post_id)
+        return comment_ids
+    
+    def get_comments(self, post_id: str, limit: int = None, after_id: str = None) -> List[Comment]:
+        """
+        Get comments for a post, oldest first.
+        
+        Long threads can be paged: pass limit, and the id of the last comment
+        of the previous page as after_id.
+        """
+        with session_scope(read_only=True) as session:
+            stmt = lambda_stmt(
+                lambda: select(Comment)
+                .where(Comment.post_id == post_id, Comment.is_deleted == False)
+                .order_by(Comment.created_at, Comment.id)
+            )
+            if after_id:
+                after_created = select(Comment.created_at).where(Comment.id == after_id).scalar_subquery()
+                after = tuple_(Comment.created_at, Comment.id) > tuple_(after_created, after_id)
+                stmt += lambda s: s.where(after)
+            if limit:
+                stmt += lambda s: s.limit(limit)
+            return session.execute(stmt).scalars().all()
+    
+    def get_nested_comments(self, post_id: str) -> List[Dict[str, Any]]:
+        """Get comments with nested structure, built in one pass over the thread."""
+        top_level = []
+        replies = {}
+        for comment in self.get_comments(post_id):
+            if comment.parent_id is None:
+                top_level.append(comment)
+            else:
+                replies.setdefault(comment.parent_id, []).append(comment)
+        
+        return [{'comment': comment, 'replies': replies.get(comment.id, [])} for comment in top_level]
     
     def get_comment(self, comment_id: str) -> Optional[Comment]:
         """Get a specific comment."""
-        session = get_session()
-        try:
-            return session.query(Comment).filter(
-                Comment.id == comment_id,
-                Comment.is_deleted == False
-            ).first()
-        finally:
-            session.close()
+        with session_scope(read_only=True) as session:
+            return session.execute(
+                lambda_stmt(lambda: select(Comment).where(Comment.id == comment_id, Comment.is_deleted == False))
+            ).scalars().first()
     
     def update_comment(self, comment: Comment) -> bool:
         """Update a comment."""
-        session = get_session()
-        try:
+        with session_scope() as session:
             existing_comment = session.query(Comment).filter(Comment.id == comment.id).first()
             if existing_comment:
                 existing_comment.content = comment.content
                 existing_comment.updated_at = datetime.utcnow()
-                session.commit()
                 return True
             return False
-        finally:
-            session.close()
     
     def delete_comment(self, comment_id: str, user_id: str) -> bool:
         """Soft delete a comment."""
-        session = get_session()
-        try:
-            comment = session.query(Comment).filter(Comment.id == comment_id).first()
-            if comment and comment.author_id == user_id:
-                comment.is_deleted = True
-                comment.updated_at = datetime.utcnow()
-                
-                # Update post comment count
-                post = session.query(Post).filter(Post.id == comment.post_id).first()
-                if post and post.comments_count > 0:
-                    post.comments_count -= 1
-                
-                session.commit()
-                return True
-            return False
-        finally:
-            session.close()
+        with session_scope() as session:
+            # Only the author's own, not yet deleted comment matches
+            post_id = session.execute(
+                update(Comment)
+                .where(Comment.id == comment_id, Comment.author_id == user_id, Comment.is_deleted == False)
+                .values(is_deleted=True, updated_at=datetime.utcnow())
+                .returning(Comment.post_id)
+                .execution_options(synchronize_session=False)
+            ).scalar()
+            if post_id is None:
+                return False
+            
+            # Update post comment count
+            session.execute(
+                update(Post)
+                .where(Post.id == post_id)
+                .values(comments_count=_non_negative(Post.comments_count - 1))
+                .execution_options(synchronize_session=False)
+            )
+        _evict_post(post_id)
+        return True
     
     # ==================== Vote Operations ====================
     
     def vote(self, user_id: str, target_type: str, target_id: str, vote_type: str) -> bool:
         """Cast or update a vote."""
-        session = get_session()
         try:
-            # Check for existing vote
-            if target_type == "post":
-                existing_vote = session.query(Vote).filter(
-                    Vote.user_id == user_id,
-                    Vote.post_id == target_id
-                ).first()
-            else:
-                existing_vote = session.query(Vote).filter(
-                    Vote.user_id == user_id,
-                    Vote.comment_id == target_id
-                ).first()
-            
-            if existing_vote:
-                # Update existing vote
-                old_vote_type = existing_vote.vote_type
-                existing_vote.vote_type = vote_type
-                existing_vote.created_at = datetime.utcnow()
-            else:
-                # Create new vote
-                vote = Vote(
+            with session_scope() as session:
+                if target_type == "post":
+                    target_model, target_column = Post, Vote.post_id
+                else:
+                    target_model, target_column = Comment, Vote.comment_id
+                
+                def current_votes(kind):
+                    # 1 if the user's existing vote on the target is of this kind
+                    return select(func.count(Vote.id)).where(
+                        Vote.user_id == user_id,
+                        target_column == target_id,
+                        Vote.vote_type == kind
+                    ).scalar_subquery()
+                
+                # Swap the user's old vote for the new one in the counters,
+                # reading the old vote inside the same UPDATE
+                session.execute(
+                    update(target_model)
+                    .where(target_model.id == target_id)
+                    .values(
+                        upvotes=_non_negative(
+                            target_model.upvotes - current_votes("upvote") + int(vote_type == "upvote")
+                        ),
+                        downvotes=_non_negative(
+                            target_model.downvotes - current_votes("downvote") + int(vote_type == "downvote")
+                        )
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                
+                # Insert the vote, or update the existing one
+                stmt = _insert(session, Vote).values(
                     user_id=user_id,
                     post_id=target_id if target_type == "post" else None,
                     comment_id=target_id if target_type == "comment" else None,
-                    vote_type=vote_type
+                    vote_type=vote_type,
+                    created_at=datetime.utcnow()
                 )
-                session.add(vote)
-                old_vote_type = None
-            
-            # Update vote counts
+                session.execute(stmt.on_conflict_do_update(
+                    index_elements=[Vote.user_id, target_column],
+                    set_={'vote_type': stmt.excluded.vote_type, 'created_at': stmt.excluded.created_at}
+                ))
             if target_type == "post":
-                target = session.query(Post).filter(Post.id == target_id).first()
-            else:
-                target = session.query(Comment).filter(Comment.id == target_id).first()
-            
-            if target:
-                # Remove old vote count
-                if old_vote_type == "upvote":
-                    target.upvotes = max(0, target.upvotes - 1)
-                elif old_vote_type == "downvote":
-                    target.downvotes = max(0, target.downvotes - 1)
-                
-                # Add new vote count
-                if vote_type == "upvote":
-                    target.upvotes += 1
-                elif vote_type == "downvote":
-                    target.downvotes += 1
-            
-            session.commit()
+                _evict_post(target_id)
             return True
         except Exception as e:
-            session.rollback()
             print(f"Error voting: {e}")
             return False
-        finally:
-            session.close()
     
     def get_user_vote(self, user_id: str, target_type: str, target_id: str) -> Optional[Vote]:
         """Get user's vote on a target."""
-        session = get_session()
-        try:
+        with session_scope(read_only=True) as session:
             if target_type == "post":
-                return session.query(Vote).filter(
-                    Vote.user_id == user_id,
-                    Vote.post_id == target_id
-                ).first()
+                stmt = lambda_stmt(lambda: select(Vote).where(Vote.user_id == user_id, Vote.post_id == target_id))
             else:
-                return session.query(Vote).filter(
-                    Vote.user_id == user_id,
-                    Vote.comment_id == target_id
-                ).first()
-        finally:
-            session.close()
+                stmt = lambda_stmt(lambda: select(Vote).where(Vote.user_id == user_id, Vote.comment_id == target_id))
+            return session.execute(stmt).scalars().first()
     
     def remove_vote(self, user_id: str, target_type: str, target_id: str) -> bool:
         """Remove a user's vote."""
-        session = get_session()
-        try:
+        with session_scope() as session:
             if target_type == "post":
-                vote = session.query(Vote).filter(
-                    Vote.user_id == user_id,
-                    Vote.post_id == target_id
-                ).first()
+                target_model, target_column = Post, Vote.post_id
             else:
-                vote = session.query(Vote).filter(
-                    Vote.user_id == user_id,
-                    Vote.comment_id == target_id
-                ).first()
+                target_model, target_column = Comment, Vote.comment_id
             
-            if vote:
-                # Update vote counts
-                if target_type == "post":
-                    target = session.query(Post).filter(Post.id == target_id).first()
-                else:
-                    target = session.query(Comment).filter(Comment.id == target_id).first()
-                
-                if target:
-                    if vote.vote_type == "upvote":
-                        target.upvotes = max(0, target.upvotes - 1)
-                    elif vote.vote_type == "downvote":
-                        target.downvotes = max(0, target.downvotes - 1)
-                
-                session.delete(vote)
-                session.commit()
-                return True
-            return False
-        finally:
-            session.close()
+            vote_type = session.execute(
+                delete(Vote)
+                .where(Vote.user_id == user_id, target_column == target_id)
+                .returning(Vote.vote_type)
+                .execution_options(synchronize_session=False)
+            ).scalar()
+            if vote_type is None:
+                return False
+            
+            # Take the removed vote back off the counters in place
+            session.execute(
+                update(target_model)
+                .where(target_model.id == target_id)
+                .values(
+                    upvotes=_non_negative(target_model.upvotes - int(vote_type == "upvote")),
+                    downvotes=_non_negative(target_model.downvotes - int(vote_type == "downvote"))
+                )
+                .execution_options(synchronize_session=False)
+            )
+        if target_type == "post":
+            _evict_post(target_id)
+        return True
     
     # ==================== Analytics Operations ====================
     
     def get_platform_stats(self) -> Dict:
         """Get platform-wide statistics."""
-        session = get_session()
-        try:
-            total_posts = session.query(Post).filter(Post.is_deleted == False).count()
-            total_users = session.query(User).count()
-            total_comments = session.query(Comment).filter(Comment.is_deleted == False).count()
-            total_votes = session.query(Vote).count()
-            
-            # Calculate engagement metrics
-            upvotes = session.query(func.sum(Post.upvotes)).scalar() or 0
-            downvotes = session.query(func.sum(Post.downvotes)).scalar() or 0
-            
-            return {
-                'total_posts': total_posts,
-                'total_users': total_users,
-                'total_comments': total_comments,
-                'total_votes': total_votes,
-                'total_upvotes': upvotes,
-                'total_downvotes': downvotes,
-                'net_score': upvotes - downvotes
-            }
-        finally:
-            session.close()
+        def load():
+            with session_scope(read_only=True) as session:
+                # One round trip: each figure is a scalar subquery of a single SELECT
+                stats = session.execute(select(
+                    select(func.count(Post.id)).where(Post.is_deleted == False)
+                    .scalar_subquery().label('total_posts'),
+                    select(func.count(User.id)).scalar_subquery().label('total_users'),
+                    select(func.count(Comment.id)).where(Comment.is_deleted == False)
+                    .scalar_subquery().label('total_comments'),
+                    select(func.count(Vote.id)).scalar_subquery().label('total_votes'),
+                    # Engagement metrics
+                    select(func.coalesce(func.sum(Post.upvotes), 0)).scalar_subquery().label('total_upvotes'),
+                    select(func.coalesce(func.sum(Post.downvotes), 0)).scalar_subquery().label('total_downvotes'),
+                )).one()._asdict()
+                
+                stats['net_score'] = stats['total_upvotes'] - stats['total_downvotes']
+                return stats
+        return _cached(_stats_cache, None, load)
     
     def get_user_stats(self, user_id: str) -> Dict:
         """Get user statistics."""
-        session = get_session()
-        try:
-            posts_count = session.query(Post).filter(
-                Post.author_id == user_id,
-                Post.is_deleted == False
-            ).count()
-            
-            comments_count = session.query(Comment).filter(
-                Comment.author_id == user_id,
-                Comment.is_deleted == False
-            ).count()
-            
-            total_upvotes = session.query(func.sum(Post.upvotes)).filter(
-                Post.author_id == user_id,
-                Post.is_deleted == False
-            ).scalar() or 0
+        with session_scope(read_only=True) as session:
+            # One round trip: each figure is a scalar subquery of a single SELECT
+            posts_count, comments_count, total_upvotes = session.execute(select(
+                select(func.count(Post.id))
+                .where(Post.author_id == user_id, Post.is_deleted == False)
+                .scalar_subquery(),
+                select(func.count(Comment.id))
+                .where(Comment.author_id == user_id, Comment.is_deleted == False)
+                .scalar_subquery(),
+                select(func.coalesce(func.sum(Post.upvotes), 0))
+                .where(Post.author_id == user_id, Post.is_deleted == False)
+                .scalar_subquery(),
+            )).one()
             
             return {
                 'posts_count': posts_count,
@@ -529,6 +716,3 @@ class PeerHubDBService:
                 'total_upvotes': total_upvotes,
                 'reputation': total_upvotes  # Simplified reputation
             }
-        finally:
-            session.close()
-
@@ -3,16 +3,47 @@ Data models for PeerHub - Peer Discussion Hub
 Handles User, Post, Comment, and Vote data structures
 """
 
+import heapq
 import json
 import os
+from collections import defaultdict
+from contextlib import contextmanager
+from operator import itemgetter
 from datetime import datetime
 from typing import List, Dict, Optional
 import uuid
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Posts, comments and votes are rewritten on every change, so they are kept
+# as msgpack (smaller, faster to encode) when msgspec is installed
+HOT_FILE_EXT = '.msgpack' if msgspec is not None else '.json'
+
+# Hash indexes over the cached files: name -> (file attribute, record key, unique)
+_INDEXES = {
+    'users_by_id': ('users_file', itemgetter('user_id'), True),
+    'users_by_username': ('users_file', itemgetter('username'), True),
+    'posts_by_id': ('posts_file', itemgetter('post_id'), True),
+    'comments_by_id': ('comments_file', itemgetter('comment_id'), True),
+    'comments_by_post': ('comments_file', itemgetter('post_id'), False),
+    'votes_by_key': ('votes_file', itemgetter('user_id', 'target_type', 'target_id'), True),
+}
+
 
 class User:
     """User model for PeerHub"""
     
+    __slots__ = ('user_id', 'username', 'name', 'email', 'created_at', 'profile_pic',
+                 'reputation', 'posts_count', 'comments_count')
+    
     def __init__(self, user_id: str, username: str, name: str, email: str = "", 
                  created_at: str = None, profile_pic: str = ""):
         self.user_id = user_id
@@ -57,6 +88,10 @@ class User:
 class Post:
     """Post model for PeerHub discussions"""
     
+    __slots__ = ('post_id', 'title', 'content', 'author_id', 'tags', 'file_link', 'created_at',
+                 'updated_at', 'upvotes', 'downvotes', 'comments_count', 'is_pinned', 'is_deleted',
+                 'course_code', 'course_name', 'semester')
+    
     def __init__(self, post_id: str, title: str, content: str, author_id: str, 
                  tags: List[str] = None, file_link: str = "", created_at: str = None,
                  updated_at: str = None, upvotes: int = 0, downvotes: int = 0,
@@ -68,8 +103,10 @@ class Post:
         self.author_id = author_id
         self.tags = tags or []
         self.file_link = file_link
-        self.created_at = created_at or datetime.now().isoformat()
-        self.updated_at = updated_at or datetime.now().isoformat()
+        # One clock read serves both defaults (from_dict passes stored values)
+        now = None if created_at and updated_at else datetime.now().isoformat()
+        self.created_at = created_at or now
+        self.updated_at = updated_at or now
         self.upvotes = upvotes
         self.downvotes = downvotes
         self.comments_count = comments_count
@@ -91,6 +128,7 @@ class Post:
             'updated_at': self.updated_at,
             'upvotes': self.upvotes,
             'downvotes': self.downvotes,
+            'score': self.score,
             'comments_count': self.comments_count,
             'is_pinned': self.is_pinned,
             'is_deleted': self.is_deleted,
@@ -129,6 +167,9 @@ class Post:
 class Comment:
     """Comment model for PeerHub discussions"""
     
+    __slots__ = ('comment_id', 'post_id', 'content', 'author_id', 'parent_id', 'created_at',
+                 'updated_at', 'upvotes', 'downvotes', 'is_deleted')
+    
     def __init__(self, comment_id: str, post_id: str, content: str, author_id: str,
                  parent_id: str = None, created_at: str = None, updated_at: str = None,
                  upvotes: int = 0, downvotes: int = 0, is_deleted: bool = False):
@@ -137,8 +178,10 @@ class Comment:
         self.content = content
         self.author_id = author_id
         self.parent_id = parent_id  # For nested replies
-        self.created_at = created_at or datetime.now().isoformat()
-        self.updated_at = updated_at or datetime.now().isoformat()
+        # One clock read serves both defaults (from_dict passes stored values)
+        now = None if created_at and updated_at else datetime.now().isoformat()
+        self.created_at = created_at or now
+        self.updated_at = updated_at or now
         self.upvotes = upvotes
         self.downvotes = downvotes
         self.is_deleted = is_deleted
@@ -154,6 +197,7 @@ class Comment:
             'updated_at': self.updated_at,
             'upvotes': self.upvotes,
             'downvotes': self.downvotes,
+            'score': self.score,
             'is_deleted': self.is_deleted
         }
     
@@ -181,6 +225,8 @@ class Comment:
 class Vote:
     """Vote model for posts and comments"""
     
+    __slots__ = ('vote_id', 'user_id', 'target_type', 'target_id', 'vote_type', 'created_at')
+    
     def __init__(self, vote_id: str, user_id: str, target_type: str, target_id: str,
                  vote_type: str, created_at: str = None):  # vote_type: 'upvote' or 'downvote'
         self.vote_id = vote_id
@@ -218,9 +264,16 @@ class PeerHubDatabase:
     def __init__(self, data_dir: str = "peerhub_data"):
         self.data_dir = data_dir
         self.users_file = os.path.join(data_dir, "users.json")
-        self.posts_file = os.path.join(data_dir, "posts.json")
-        self.comments_file = os.path.join(data_dir, "comments.json")
-        self.votes_file = os.path.join(data_dir, "votes.json")
+        self.posts_file = os.path.join(data_dir, "posts" + HOT_FILE_EXT)
+        self.comments_file = os.path.join(data_dir, "comments" + HOT_FILE_EXT)
+        self.votes_file = os.path.join(data_dir, "votes" + HOT_FILE_EXT)
+        
+        # Parsed file contents by path, and the paths changed since the last flush
+        self._cache: Dict[str, List[dict]] = {}
+        self._dirty = set()
+        self._batch_depth = 0
+        # Built lazily by _index; values are the cached records themselves
+        self._indexes: Dict[str, dict] = {}
         
         # Create data directory if it doesn't exist
         os.makedirs(data_dir, exist_ok=True)
@@ -229,274 +282,388 @@ class PeerHubDatabase:
         self._initialize_files()
     
     def _initialize_files(self):
-        """Initialize empty JSON files if they don't exist"""
+        """Initialize empty data files if they don't exist"""
         files = [self.users_file, self.posts_file, self.comments_file, self.votes_file]
         for file_path in files:
             if not os.path.exists(file_path):
-                with open(file_path, 'w') as f:
-                    json.dump([], f)
+                # A new .msgpack file starts from the .json one it replaces, if any
+                legacy_path = os.path.splitext(file_path)[0] + ".json"
+                self._write_file(file_path, self._read_file(legacy_path))
     
     def _load_data(self, file_path: str) -> List[dict]:
-        """Load data from JSON file"""
+        """Load data from the cache, reading the file on first use"""
+        if file_path not in self._cache:
+            data = self._read_file(file_path)
+            if file_path in (self.posts_file, self.comments_file):
+                # Records saved before score was stored
+                for record in data:
+                    if 'score' not in record:
+                        record['score'] = record.get('upvotes', 0) - record.get('downvotes', 0)
+            self._cache[file_path] = data
+        return self._cache[file_path]
+    
+    def _read_file(self, file_path: str) -> List[dict]:
+        """Read data from JSON or msgpack file"""
         try:
+            if file_path.endswith('.msgpack'):
+                with open(file_path, 'rb') as f:
+                    return msgspec.msgpack.decode(f.read())
+            if orjson is not None:
+                with open(file_path, 'rb') as f:
+                    return orjson.loads(f.read())
             with open(file_path, 'r') as f:
                 return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        except (FileNotFoundError, ValueError):  # json, orjson and msgspec decode errors
             return []
     
     def _save_data(self, file_path: str, data: List[dict]):
-        """Save data to JSON file"""
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        """Save data to the cache; written to disk now, or when the current batch ends"""
+        if self._cache.get(file_path) is not data:
+            # A new list: its indexes are rebuilt on next use
+            for name, _, _, _ in self._built_indexes(file_path):
+                del self._indexes[name]
+        self._cache[file_path] = data
+        self._dirty.add(file_path)
+        if not self._batch_depth:
+            self.flush()
+    
+    def flush(self):
+        """Write every changed file to disk"""
+        while self._dirty:
+            file_path = self._dirty.pop()
+            self._write_file(file_path, self._cache[file_path])
+    
+    @contextmanager
+    def batched(self):
+        """Defer file writes until the outermost batch exits"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+    
+    def _write_file(self, file_path: str, data: List[dict]):
+        """Write data to JSON or msgpack file, replacing it atomically"""
+        if file_path.endswith('.msgpack'):
+            payload = msgspec.msgpack.encode(data)
+        elif orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2).encode()
+        
+        # Readers see the old file or the new one, never a partial write
+        tmp_path = file_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, file_path)
+    
+    # Indexes
+    def _index(self, name: str) -> dict:
+        """Hash index over a cached file, built on first use"""
+        if name not in self._indexes:
+            file_attr, key_of, unique = _INDEXES[name]
+            index = {} if unique else defaultdict(list)
+            for record in self._load_data(getattr(self, file_attr)):
+                if unique:
+                    index.setdefault(key_of(record), record)  # first match, like a scan
+                else:
+                    index[key_of(record)].append(record)
+            self._indexes[name] = index
+        return self._indexes[name]
+    
+    def _built_indexes(self, file_path: str):
+        """(name, key function, unique, index) for each built index over file_path"""
+        for name, index in list(self._indexes.items()):
+            file_attr, key_of, unique = _INDEXES[name]
+            if getattr(self, file_attr) == file_path:
+                yield name, key_of, unique, index
+    
+    def _append(self, file_path: str, record: dict):
+        """Add a record to a file and its built indexes"""
+        data = self._load_data(file_path)
+        data.append(record)
+        for _, key_of, unique, index in self._built_indexes(file_path):
+            if unique:
+                index.setdefault(key_of(record), record)
+            else:
+                index[key_of(record)].append(record)
+        self._save_data(file_path, data)
+    
+    def _replace(self, file_path: str, record: dict, new_record: dict):
+        """Overwrite a record in place, keeping the indexes pointing at it"""
+        for name, key_of, _, _ in self._built_indexes(file_path):
+            if key_of(record) != key_of(new_record):
+                del self._indexes[name]  # rebuilt on next use
+        record.clear()
+        record.update(new_record)
+        self._save_data(file_path, self._load_data(file_path))
+    
+    def _remove(self, file_path: str, record: dict):
+        """Remove a record from a file and its built indexes"""
+        data = self._load_data(file_path)
+        del data[next(i for i, r in enumerate(data) if r is record)]
+        for _, key_of, unique, index in self._built_indexes(file_path):
+            key = key_of(record)
+            if unique:
+                if index.get(key) is record:
+                    del index[key]
+            elif key in index:
+                index[key] = [r for r in index[key] if r is not record]
+        self._save_data(file_path, data)
     
     # User operations
     def create_user(self, user: User) -> bool:
         """Create a new user"""
-        users = self._load_data(self.users_file)
-        if any(u['user_id'] == user.user_id for u in users):
+        if user.user_id in self._index('users_by_id'):
             return False
-        users.append(user.to_dict())
-        self._save_data(self.users_file, users)
+        self._append(self.users_file, user.to_dict())
         return True
     
     def get_user(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
-        users = self._load_data(self.users_file)
-        for user_data in users:
-            if user_data['user_id'] == user_id:
-                return User.from_dict(user_data)
-        return None
+        user_data = self._index('users_by_id').get(user_id)
+        return User.from_dict(user_data) if user_data else None
     
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get user by username"""
-        users = self._load_data(self.users_file)
-        for user_data in users:
-            if user_data['username'] == username:
-                return User.from_dict(user_data)
-        return None
+        user_data = self._index('users_by_username').get(username)
+        return User.from_dict(user_data) if user_data else None
     
     def update_user(self, user: User) -> bool:
         """Update user information"""
-        users = self._load_data(self.users_file)
-        for i, user_data in enumerate(users):
-            if user_data['user_id'] == user.user_id:
-                users[i] = user.to_dict()
-                self._save_data(self.users_file, users)
-                return True
-        return False
+        user_data = self._index('users_by_id').get(user.user_id)
+        if not user_data:
+            return False
+        self._replace(self.users_file, user_data, user.to_dict())
+        return True
     
     # Post operations
     def create_post(self, post: Post) -> bool:
         """Create a new post"""
-        posts = self._load_data(self.posts_file)
-        posts.append(post.to_dict())
-        self._save_data(self.posts_file, posts)
-        
-        # Update user's post count
-        user = self.get_user(post.author_id)
-        if user:
-            user.posts_count += 1
-            self.update_user(user)
-        
-        return True
+        with self.batched():
+            self._append(self.posts_file, post.to_dict())
+            
+            # Update user's post count
+            user = self.get_user(post.author_id)
+            if user:
+                user.posts_count += 1
+                self.update_user(user)
+            
+            return True
     
     def get_post(self, post_id: str) -> Optional[Post]:
         """Get post by ID"""
-        posts = self._load_data(self.posts_file)
-        for post_data in posts:
-            if post_data['post_id'] == post_id and not post_data.get('is_deleted', False):
-                return Post.from_dict(post_data)
+        post_data = self._index('posts_by_id').get(post_id)
+        if post_data and not post_data.get('is_deleted', False):
+            return Post.from_dict(post_data)
         return None
     
     def get_posts(self, limit: int = 50, offset: int = 0, tag: str = None, 
-                  author_id: str = None, course_code: str = None, sort_by: str = "created_at") -> List[Post]:
-        """Get posts with filtering and sorting"""
-        posts = self._load_data(self.posts_file)
+                  author_id: str = None, course_code: str = None, sort_by: str = "created_at",
+                  after_id: str = None) -> List[Post]:
+        """
+        Get posts with filtering and sorting
         
-        # Filter out deleted posts
-        posts = [p for p in posts if not p.get('is_deleted', False)]
+        Pass the id of the last post of the previous page as after_id to
+        fetch the next page by keyset instead of offset.
+        """
+        # Filter out deleted posts and apply filters in one pass
+        posts = [
+            p for p in self._load_data(self.posts_file)
+            if not p.get('is_deleted', False)
+            and (not tag or tag in p.get('tags', ()))
+            and (not author_id or p['author_id'] == author_id)
+            and (not course_code or p.get('course_code') == course_code)
+        ]
         
-        # Apply filters
-        if tag:
-            posts = [p for p in posts if tag in p.get('tags', [])]
-        if author_id:
-            posts = [p for p in posts if p['author_id'] == author_id]
-        if course_code:
-            posts = [p for p in posts if p.get('course_code') == course_code]
+        # Sort posts; post_id breaks ties so keyset pages are stable
+        sort_key = {
+            "created_at": itemgetter('created_at', 'post_id'),
+            "score": itemgetter('score', 'post_id'),
+            "comments": itemgetter('comments_count', 'post_id'),
+        }.get(sort_by)
         
-        # Sort posts
-        if sort_by == "created_at":
-            posts.sort(key=lambda x: x['created_at'], reverse=True)
-        elif sort_by == "score":
-            posts.sort(key=lambda x: x['upvotes'] - x['downvotes'], reverse=True)
-        elif sort_by == "comments":
-            posts.sort(key=lambda x: x['comments_count'], reverse=True)
+        # Keyset pagination: keep the posts ordered after after_id
+        if after_id and sort_key:
+            after = self._index('posts_by_id').get(after_id)
+            if after is None:
+                return []
+            after_key = sort_key(after)
+            posts = [p for p in posts if sort_key(p) < after_key]
+            offset = 0
         
-        # Apply pagination
-        posts = posts[offset:offset + limit]
+        # Apply pagination; a short first page only needs the top of the order
+        end = offset + limit
+        if sort_key and end < len(posts) // 2:
+            posts = heapq.nlargest(end, posts, key=sort_key)[offset:]
+        else:
+            if sort_key:
+                posts.sort(key=sort_key, reverse=True)
+            posts = posts[offset:end]
         
         return [Post.from_dict(p) for p in posts]
     
     def update_post(self, post: Post) -> bool:
         """Update post"""
-        posts = self._load_data(self.posts_file)
-        for i, post_data in enumerate(posts):
-            if post_data['post_id'] == post.post_id:
-                posts[i] = post.to_dict()
-                self._save_data(self.posts_file, posts)
-                return True
-        return False
+        post_data = self._index('posts_by_id').get(post.post_id)
+        if not post_data:
+            return False
+        self._replace(self.posts_file, post_data, post.to_dict())
+        return True
     
     def delete_post(self, post_id: str) -> bool:
         """Soft delete post"""
-        posts = self._load_data(self.posts_file)
-        for i, post_data in enumerate(posts):
-            if post_data['post_id'] == post_id:
-                posts[i]['is_deleted'] = True
-                posts[i]['updated_at'] = datetime.now().isoformat()
-                self._save_data(self.posts_file, posts)
-                
-                # Update user's post count
-                user = self.get_user(post_data['author_id'])
-                if user:
-                    user.posts_count = max(0, user.posts_count - 1)
-                    self.update_user(user)
-                
-                return True
-        return False
+        post_data = self._index('posts_by_id').get(post_id)
+        if not post_data:
+            return False
+        with self.batched():
+            post_data['is_deleted'] = True
+            post_data['updated_at'] = datetime.now().isoformat()
+            self._save_data(self.posts_file, self._load_data(self.posts_file))
+            
+            # Update user's post count
+            user = self.get_user(post_data['author_id'])
+            if user:
+                user.posts_count = max(0, user.posts_count - 1)
+                self.update_user(user)
+            
+            return True
     
     # Comment operations
     def create_comment(self, comment: Comment) -> bool:
         """Create a new comment"""
-        comments = self._load_data(self.comments_file)
-        comments.append(comment.to_dict())
-        self._save_data(self.comments_file, comments)
+        with self.batched():
+            self._append(self.comments_file, comment.to_dict())
+            
+            # Update post's comment count
+            post = self.get_post(comment.post_id)
+            if post:
+                post.comments_count += 1
+                self.update_post(post)
+            
+            # Update user's comment count
+            user = self.get_user(comment.author_id)
+            if user:
+                user.comments_count += 1
+                self.update_user(user)
+            
+            return True
+    
+    def get_comments(self, post_id: str, limit: int = None, after_id: str = None) -> List[Comment]:
+        """
+        Get comments for a post, oldest first
         
-        # Update post's comment count
-        post = self.get_post(comment.post_id)
-        if post:
-            post.comments_count += 1
-            self.update_post(post)
+        Long threads can be paged: pass limit, and the id of the last comment
+        of the previous page as after_id.
+        """
+        post_comments = [
+            c for c in self._index('comments_by_post').get(post_id, ())
+            if not c.get('is_deleted', False)
+        ]
         
-        # Update user's comment count
-        user = self.get_user(comment.author_id)
-        if user:
-            user.comments_count += 1
-            self.update_user(user)
-        
-        return True
-    
-    def get_comments(self, post_id: str) -> List[Comment]:
-        """Get comments for a post (with nested structure)"""
-        comments = self._load_data(self.comments_file)
-        post_comments = [c for c in comments if c['post_id'] == post_id and not c.get('is_deleted', False)]
-        
-        # Sort by creation time
-        post_comments.sort(key=lambda x: x['created_at'])
+        # Sort by creation time; comment_id breaks ties so pages are stable
+        sort_key = itemgetter('created_at', 'comment_id')
+        if after_id:
+            after = self._index('comments_by_id').get(after_id)
+            if after is None:
+                return []
+            after_key = sort_key(after)
+            post_comments = [c for c in post_comments if sort_key(c) > after_key]
+        post_comments.sort(key=sort_key)
+        if limit:
+            post_comments = post_comments[:limit]
         
         return [Comment.from_dict(c) for c in post_comments]
     
     def get_comment(self, comment_id: str) -> Optional[Comment]:
         """Get comment by ID"""
-        comments = self._load_data(self.comments_file)
-        for comment_data in comments:
-            if comment_data['comment_id'] == comment_id and not comment_data.get('is_deleted', False):
-                return Comment.from_dict(comment_data)
+        comment_data = self._index('comments_by_id').get(comment_id)
+        if comment_data and not comment_data.get('is_deleted', False):
+            return Comment.from_dict(comment_data)
         return None
     
     def update_comment(self, comment: Comment) -> bool:
         """Update comment"""
-        comments = self._load_data(self.comments_file)
-        for i, comment_data in enumerate(comments):
-            if comment_data['comment_id'] == comment.comment_id:
-                comments[i] = comment.to_dict()
-                self._save_data(self.comments_file, comments)
-                return True
-        return False
+        comment_data = self._index('comments_by_id').get(comment.comment_id)
+        if not comment_data:
+            return False
+        self._replace(self.comments_file, comment_data, comment.to_dict())
+        return True
     
     def delete_comment(self, comment_id: str) -> bool:
         """Soft delete comment"""
-        comments = self._load_data(self.comments_file)
-        for i, comment_data in enumerate(comments):
-            if comment_data['comment_id'] == comment_id:
-                comments[i]['is_deleted'] = True
-                comments[i]['updated_at'] = datetime.now().isoformat()
-                self._save_data(self.comments_file, comments)
-                
-                # Update post's comment count
-                post = self.get_post(comment_data['post_id'])
-                if post:
-                    post.comments_count = max(0, post.comments_count - 1)
-                    self.update_post(post)
-                
-                # Update user's comment count
-                user = self.get_user(comment_data['author_id'])
-                if user:
-                    user.comments_count = max(0, user.comments_count - 1)
-                    self.update_user(user)
-                
-                return True
-        return False
+        comment_data = self._index('comments_by_id').get(comment_id)
+        if not comment_data:
+            return False
+        with self.batched():
+            comment_data['is_deleted'] = True
+            comment_data['updated_at'] = datetime.now().isoformat()
+            self._save_data(self.comments_file, self._load_data(self.comments_file))
+            
+            # Update post's comment count
+            post = self.get_post(comment_data['post_id'])
+            if post:
+                post.comments_count = max(0, post.comments_count - 1)
+                self.update_post(post)
+            
+            # Update user's comment count
+            user = self.get_user(comment_data['author_id'])
+            if user:
+                user.comments_count = max(0, user.comments_count - 1)
+                self.update_user(user)
+            
+            return True
     
     # Vote operations
     def create_vote(self, vote: Vote) -> bool:
         """Create a new vote"""
-        votes = self._load_data(self.votes_file)
-        
-        # Check if user already voted on this target
-        existing_vote = None
-        for i, v in enumerate(votes):
-            if (v['user_id'] == vote.user_id and 
-                v['target_type'] == vote.target_type and 
-                v['target_id'] == vote.target_id):
-                existing_vote = i
-                break
-        
-        if existing_vote is not None:
-            # Update existing vote
-            votes[existing_vote] = vote.to_dict()
-        else:
-            # Create new vote
-            votes.append(vote.to_dict())
-        
-        self._save_data(self.votes_file, votes)
-        
-        # Update target's vote counts
-        self._update_vote_counts(vote.target_type, vote.target_id)
-        
-        return True
+        with self.batched():
+            # Update the user's existing vote on this target, or add one
+            existing_vote = self._index('votes_by_key').get((vote.user_id, vote.target_type, vote.target_id))
+            old_vote_type = existing_vote['vote_type'] if existing_vote else None
+            if existing_vote:
+                self._replace(self.votes_file, existing_vote, vote.to_dict())
+            else:
+                self._append(self.votes_file, vote.to_dict())
+            
+            # Update target's vote counts
+            self._update_vote_counts(vote.target_type, vote.target_id, old_vote_type, vote.vote_type)
+            
+            return True
     
     def get_user_vote(self, user_id: str, target_type: str, target_id: str) -> Optional[Vote]:
         """Get user's vote on a target"""
-        votes = self._load_data(self.votes_file)
-        for vote_data in votes:
-            if (vote_data['user_id'] == user_id and 
-                vote_data['target_type'] == target_type and 
-                vote_data['target_id'] == target_id):
-                return Vote.from_dict(vote_data)
-        return None
+        vote_data = self._index('votes_by_key').get((user_id, target_type, target_id))
+        return Vote.from_dict(vote_data) if vote_data else None
     
-    def _update_vote_counts(self, target_type: str, target_id: str):
-        """Update vote counts for a target"""
-        votes = self._load_data(self.votes_file)
-        target_votes = [v for v in votes if v['target_type'] == target_type and v['target_id'] == target_id]
-        
-        upvotes = len([v for v in target_votes if v['vote_type'] == 'upvote'])
-        downvotes = len([v for v in target_votes if v['vote_type'] == 'downvote'])
+    def delete_vote(self, user_id: str, target_type: str, target_id: str) -> bool:
+        """Remove user's vote on a target"""
+        vote_data = self._index('votes_by_key').get((user_id, target_type, target_id))
+        if not vote_data:
+            return False
+        with self.batched():
+            self._remove(self.votes_file, vote_data)
+            self._update_vote_counts(target_type, target_id, vote_data['vote_type'], None)
+            return True
+    
+    def _update_vote_counts(self, target_type: str, target_id: str,
+                            old_vote_type: Optional[str], new_vote_type: Optional[str]):
+        """Move a target's vote counts from a user's old vote to their new one (None for no vote)"""
+        if old_vote_type == new_vote_type:
+            return
         
         if target_type == 'post':
-            posts = self._load_data(self.posts_file)
-            for i, post in enumerate(posts):
-                if post['post_id'] == target_id:
-                    posts[i]['upvotes'] = upvotes
-                    posts[i]['downvotes'] = downvotes
-                    self._save_data(self.posts_file, posts)
-                    break
+            target_file, target = self.posts_file, self._index('posts_by_id').get(target_id)
         elif target_type == 'comment':
-            comments = self._load_data(self.comments_file)
-            for i, comment in enumerate(comments):
-                if comment['comment_id'] == target_id:
-                    comments[i]['upvotes'] = upvotes
-                    comments[i]['downvotes'] = downvotes
-                    self._save_data(self.comments_file, comments)
-                    break
+            target_file, target = self.comments_file, self._index('comments_by_id').get(target_id)
+        else:
+            return
+        if target:
+            for vote_type, field in (('upvote', 'upvotes'), ('downvote', 'downvotes')):
+                delta = (new_vote_type == vote_type) - (old_vote_type == vote_type)
+                if delta:
+                    target[field] = max(0, target.get(field, 0) + delta)
+            target['score'] = target.get('upvotes', 0) - target.get('downvotes', 0)
+            self._save_data(target_file, self._load_data(target_file))
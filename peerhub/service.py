@@ -74,9 +74,10 @@ class PeerHubService:
         return self.db.get_post(post_id)
     
     def get_posts(self, limit: int = 50, offset: int = 0, tag: str = None,
-                  author_id: str = None, course_code: str = None, sort_by: str = "created_at") -> List[Post]:
+                  author_id: str = None, course_code: str = None, sort_by: str = "created_at",
+                  after_id: str = None) -> List[Post]:
         """Get posts with filtering and sorting"""
-        return self.db.get_posts(limit, offset, tag, author_id, course_code, sort_by)
+        return self.db.get_posts(limit, offset, tag, author_id, course_code, sort_by, after_id)
     
     def update_post(self, post: Post) -> bool:
         """Update post"""
@@ -475,9 +476,9 @@ class PeerHubService:
             return comment
         return None
     
-    def get_comments(self, post_id: str) -> List[Comment]:
+    def get_comments(self, post_id: str, limit: int = None, after_id: str = None) -> List[Comment]:
         """Get comments for a post"""
-        return self.db.get_comments(post_id)
+        return self.db.get_comments(post_id, limit, after_id)
     
     def get_comment(self, comment_id: str) -> Optional[Comment]:
         """Get comment by ID"""
@@ -539,18 +540,7 @@ class PeerHubService:
     
     def remove_vote(self, user_id: str, target_type: str, target_id: str) -> bool:
         """Remove user's vote"""
-        votes = self.db._load_data(self.db.votes_file)
-        
-        for i, vote_data in enumerate(votes):
-            if (vote_data['user_id'] == user_id and 
-                vote_data['target_type'] == target_type and 
-                vote_data['target_id'] == target_id):
-                del votes[i]
-                self.db._save_data(self.db.votes_file, votes)
-                self.db._update_vote_counts(target_type, target_id)
-                return True
-        
-        return False
+        return self.db.delete_vote(user_id, target_type, target_id)
     
     # Statistics and analytics
     def get_user_stats(self, user_id: str) -> Dict[str, Any]:
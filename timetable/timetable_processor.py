@@ -3,6 +3,7 @@ Timetable Processing Module for EdFast Application.
 Adapts the TimeTable-Sorter functionality for Streamlit interface.
 """
 
+import numpy as np
 import pandas as pd
 import os
 import random
@@ -11,6 +12,15 @@ import shutil
 from typing import List, Dict, Tuple, Optional
 
 
+# Low-cardinality columns stored as categoricals after processing
+CATEGORICAL_COLUMNS = ['Course', 'Section', 'Day', 'Type', 'Class']
+
+# Time slot bitmasks used for conflict detection
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+MASK_WORDS = (SLOTS_PER_DAY + 63) // 64
+
+
 class TimetableProcessor:
     """Class to handle timetable data processing and filtering."""
     
@@ -55,6 +65,8 @@ class TimetableProcessor:
                 # Process the file based on its extension
                 if uploaded_file.name.endswith('.xlsx'):
                     df = self._process_excel_file(temp_path)
+                    # Keep the last processed workbook for conflict checking
+                    self.store_processed_data(df)
                 elif uploaded_file.name.endswith('.csv'):
                     df = self._process_csv_file(temp_path)
                 else:
@@ -126,10 +138,7 @@ class TimetableProcessor:
             for day, count in day_summary.items():
                 print(f"  {day}: {count}")
         
-        # Store the processed data for conflict checking
-        self.store_processed_data(combined_df)
-        
-        return combined_df
+        return self._optimize_dtypes(combined_df)
     
     def _try_read_excel_sheet(self, file, sheet):
         """Try reading Excel sheet with different parameters."""
@@ -293,7 +302,7 @@ class TimetableProcessor:
         """
         try:
             df = pd.read_csv(file_path)
-            return self._clean_dataframe(df)
+            return self._optimize_dtypes(self._clean_dataframe(df))
         except Exception as e:
             print(f"Error processing CSV file: {str(e)}")
             return pd.DataFrame()
@@ -340,7 +349,51 @@ class TimetableProcessor:
         
         return df
     
-    def filter_timetable(self, df: pd.DataFrame, courses: List[str], departments: List[str]) -> pd.DataFrame:
+    @staticmethod
+    def _optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+        """Shrink dtypes: low-cardinality columns become categoricals and
+        integer columns are downcast to the smallest integer type.
+        
+        Args:
+            df: Processed DataFrame
+            
+        Returns:
+            DataFrame with compact dtypes
+        """
+        if df.empty:
+            return df
+        
+        for column in CATEGORICAL_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+        
+        for column in df.select_dtypes(include='integer').columns:
+            df[column] = pd.to_numeric(df[column], downcast='integer')
+        
+        return df
+    
+    @staticmethod
+    def count_unique(column: pd.Series) -> int:
+        """Number of distinct values in a column.
+        
+        Categorical columns report their category count directly (frames
+        from this processor never carry unused categories); other columns
+        use unique().size, which is cheaper than nunique().
+        """
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            return len(column.cat.categories)
+        return column.unique().size
+    
+    @staticmethod
+    def _isin_mask(column: pd.Series, values) -> np.ndarray:
+        """Boolean membership mask, matched on category codes when possible."""
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = pd.Categorical(list(values), categories=column.cat.categories).codes
+            return np.isin(column.cat.codes.values, codes[codes >= 0])
+        return column.isin(values).values
+    
+    @staticmethod
+    def filter_timetable(df: pd.DataFrame, courses: List[str], departments: List[str]) -> pd.DataFrame:
         """Filter timetable data based on courses and departments.
         
         Args:
@@ -355,23 +408,35 @@ class TimetableProcessor:
             return df
         
         # Clean and prepare filter data
-        courses = [course.strip() for course in courses if course.strip()]
-        departments = [dept.strip() for dept in departments if dept.strip()]
+        courses = {course.strip() for course in courses if course.strip()}
+        departments = {dept.strip() for dept in departments if dept.strip()}
         
         # Filter by courses
         if courses:
-            course_filter = df['Course'].str.strip().isin(courses)
+            course_filter = TimetableProcessor._isin_mask(df['Course'], courses)
         else:
-            course_filter = pd.Series([True] * len(df))
+            course_filter = np.ones(len(df), dtype=bool)
         
         # Filter by departments (check first 2 characters of section)
         if departments:
-            dept_filter = df['Section'].str[:2].isin(departments)
+            sections = df['Section']
+            if isinstance(sections.dtype, pd.CategoricalDtype):
+                # Match prefixes once per category instead of once per row
+                prefixes = sections.cat.categories.astype(str).str[:2]
+                wanted = np.flatnonzero(prefixes.isin(departments))
+                dept_filter = np.isin(sections.cat.codes.values, wanted)
+            else:
+                dept_filter = sections.str[:2].isin(departments).values
         else:
-            dept_filter = pd.Series([True] * len(df))
+            dept_filter = np.ones(len(df), dtype=bool)
         
         # Apply both filters
-        filtered_df = df[course_filter & dept_filter]
+        filtered_df = df[course_filter & dept_filter].copy()
+        
+        # Drop categories that no longer occur so category counts stay exact
+        for column in CATEGORICAL_COLUMNS:
+            if column in filtered_df.columns and isinstance(filtered_df[column].dtype, pd.CategoricalDtype):
+                filtered_df[column] = filtered_df[column].cat.remove_unused_categories()
         
         return filtered_df
     
@@ -454,7 +519,8 @@ class TimetableProcessor:
         ]
         return random.choice(colors)
     
-    def get_course_statistics(self, df: pd.DataFrame) -> Dict:
+    @staticmethod
+    def get_course_statistics(df: pd.DataFrame) -> Dict:
         """Get statistics about the filtered timetable.
         
         Args:
@@ -468,84 +534,96 @@ class TimetableProcessor:
         
         stats = {
             'total_classes': len(df),
-            'unique_courses': df['Course'].nunique(),
+            'unique_courses': TimetableProcessor.count_unique(df['Course']),
             'theory_classes': len(df[df['Type'] == 'Theory']),
             'lab_classes': len(df[df['Type'] == 'Lab']),
-            'days_with_classes': df['Day'].nunique(),
-            'unique_rooms': df['Class'].nunique()
+            'days_with_classes': TimetableProcessor.count_unique(df['Day']),
+            'unique_rooms': TimetableProcessor.count_unique(df['Class'])
         }
         
         return stats
     
-    def check_time_conflicts(self, selected_courses: List[str], selected_sections: List[str] = None) -> Dict:
+    def check_time_conflicts(self, selected_courses: List[str], selected_sections: List[str] = None,
+                             df: pd.DataFrame = None, slot_masks: np.ndarray = None) -> Dict:
         """Check for time conflicts in selected courses.
         
+        Overlaps are found by AND-ing the per-row slot bitmasks of every
+        pair of classes on the same day, instead of parsing and comparing
+        time strings pair by pair.
+        
         Args:
             selected_courses: List of course names to check
             selected_sections: Optional list of specific sections
+            df: Timetable DataFrame to check; defaults to the stored processed data
+            slot_masks: Masks from compute_slot_masks(df); computed on demand if omitted
             
         Returns:
             Dictionary with conflict information
         """
-        if not hasattr(self, '_processed_data') or self._processed_data.empty:
+        if df is None:
+            df = getattr(self, '_processed_data', None)
+        if df is None or df.empty:
             return {'conflicts': [], 'conflict_free_schedule': pd.DataFrame(), 'recommendations': []}
         
-        df = self._processed_data
-        
         # Filter for selected courses
-        course_filter = df['Course'].isin(selected_courses)
+        row_filter = self._isin_mask(df['Course'], selected_courses)
         if selected_sections:
-            section_filter = df['Section'].isin(selected_sections)
-            filtered_df = df[course_filter & section_filter]
+            row_filter &= self._isin_mask(df['Section'], selected_sections)
+        filtered_df = df[row_filter]
+        
+        if slot_masks is not None and len(slot_masks) == len(df):
+            masks = slot_masks[row_filter]
         else:
-            filtered_df = df[course_filter]
+            masks = self.compute_slot_masks(filtered_df)
         
         conflicts = []
-        conflict_free_schedule = []
+        conflict_free_positions = []
         recommendations = []
         
+        courses = filtered_df['Course'].astype(object).values
+        sections = filtered_df['Section'].astype(object).values
+        times = filtered_df['Time'].astype(object).values
+        rooms = filtered_df['Class'].astype(object).values
+        starts, ends = self._minute_ranges(filtered_df)
+        
         # Group by day to check for time overlaps
-        for day in filtered_df['Day'].unique():
-            day_classes = filtered_df[filtered_df['Day'] == day].copy()
+        for day, positions in filtered_df.groupby('Day', observed=True, sort=False).indices.items():
+            # Sort by start time so course1 is always the earlier class
+            positions = positions[np.argsort(filtered_df['Time'].astype(str).values[positions], kind='stable')]
+            day_masks = masks[positions]
             
-            # Parse time slots for overlap detection
-            day_classes['start_time'], day_classes['end_time'] = zip(*day_classes['Time'].apply(self._parse_time_slot))
+            # Pairwise AND of all slot masks for the day
+            first, second = np.triu_indices(len(positions), 1)
+            overlaps = (day_masks[first] & day_masks[second]).any(axis=1)
             
-            # Sort by start time
-            day_classes = day_classes.sort_values('start_time')
+            # Slots are 5 minutes wide, so confirm candidates on exact minutes
+            day_starts = starts[positions]
+            day_ends = ends[positions]
+            overlaps &= (day_starts[first] < day_ends[second]) & (day_starts[second] < day_ends[first])
             
-            # Check for overlaps
-            for i in range(len(day_classes)):
-                for j in range(i + 1, len(day_classes)):
-                    class1 = day_classes.iloc[i]
-                    class2 = day_classes.iloc[j]
-                    
-                    # Check if times overlap
-                    if self._times_overlap(class1['start_time'], class1['end_time'], 
-                                         class2['start_time'], class2['end_time']):
-                        conflict = {
-                            'day': day,
-                            'course1': class1['Course'],
-                            'section1': class1['Section'],
-                            'time1': class1['Time'],
-                            'room1': class1['Class'],
-                            'course2': class2['Course'],
-                            'section2': class2['Section'],
-                            'time2': class2['Time'],
-                            'room2': class2['Class'],
-                            'type': 'Time Overlap'
-                        }
-                        conflicts.append(conflict)
-                    else:
-                        # No conflict, add both to conflict-free schedule
-                        conflict_free_schedule.append(class1.to_dict())
-                        conflict_free_schedule.append(class2.to_dict())
-        
-        # Remove duplicates from conflict-free schedule
-        if conflict_free_schedule:
-            conflict_free_df = pd.DataFrame(conflict_free_schedule).drop_duplicates()
+            for i, j in zip(positions[first[overlaps]], positions[second[overlaps]]):
+                conflicts.append({
+                    'day': day,
+                    'course1': courses[i],
+                    'section1': sections[i],
+                    'time1': times[i],
+                    'room1': rooms[i],
+                    'course2': courses[j],
+                    'section2': sections[j],
+                    'time2': times[j],
+                    'room2': rooms[j],
+                    'type': 'Time Overlap'
+                })
+            
+            # Classes in at least one non-overlapping pair form the conflict-free schedule
+            conflict_free_positions.append(positions[first[~overlaps]])
+            conflict_free_positions.append(positions[second[~overlaps]])
+        
+        if conflict_free_positions:
+            free = np.unique(np.concatenate(conflict_free_positions))
         else:
-            conflict_free_df = filtered_df.copy()
+            free = np.array([], dtype=int)
+        conflict_free_df = filtered_df.iloc[free] if free.size else filtered_df.copy()
         
         # Generate recommendations for conflicts
         for conflict in conflicts:
@@ -561,6 +639,69 @@ class TimetableProcessor:
             'conflicted_courses': len(set([c['course1'] for c in conflicts] + [c['course2'] for c in conflicts]))
         }
     
+    def compute_slot_masks(self, df: pd.DataFrame) -> np.ndarray:
+        """Encode each row's time range as a bitmask of 5-minute slots.
+        
+        Args:
+            df: DataFrame with a Time column like "09:00-10:20"
+            
+        Returns:
+            uint64 array of shape (len(df), MASK_WORDS); two rows on the same
+            day overlap when their masks share a set bit
+        """
+        if df.empty or 'Time' not in df.columns:
+            return np.zeros((len(df), MASK_WORDS), dtype=np.uint64)
+        
+        # Parse each distinct time string once
+        unique_times, inverse = np.unique(df['Time'].astype(str).values, return_inverse=True)
+        unique_masks = np.zeros((len(unique_times), MASK_WORDS), dtype=np.uint64)
+        
+        for i, time_str in enumerate(unique_times):
+            first_slot, end_slot = self._slot_range(time_str)
+            if first_slot >= end_slot:
+                continue
+            bits = np.zeros(MASK_WORDS * 64, dtype=bool)
+            bits[first_slot:end_slot] = True
+            unique_masks[i] = np.packbits(bits, bitorder='little').view(np.uint64)
+        
+        return unique_masks[inverse.ravel()]
+    
+    def _minute_ranges(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Return per-row start and end minutes; unparseable rows get an empty range."""
+        if df.empty or 'Time' not in df.columns:
+            return np.zeros(len(df), dtype=int), np.zeros(len(df), dtype=int)
+        
+        unique_times, inverse = np.unique(df['Time'].astype(str).values, return_inverse=True)
+        ranges = np.array([self._minute_range(t) for t in unique_times], dtype=int).reshape(-1, 2)
+        ranges = ranges[inverse.ravel()]
+        return ranges[:, 0], ranges[:, 1]
+    
+    def _minute_range(self, time_str: str) -> Tuple[int, int]:
+        """Return the [start, end) minutes covered by a time string."""
+        start, end = self._parse_time_slot(time_str)
+        try:
+            return self._time_to_minutes(start), self._time_to_minutes(end)
+        except ValueError:
+            return 0, 0
+    
+    def _slot_range(self, time_str: str) -> Tuple[int, int]:
+        """Return the [first, end) slot indexes covered by a time string.
+        
+        The end is rounded up so the masks never miss an overlap; candidates
+        are confirmed on exact minutes in check_time_conflicts.
+        """
+        start_min, end_min = self._minute_range(time_str)
+        
+        first_slot = max(start_min // SLOT_MINUTES, 0)
+        end_slot = min(-(-end_min // SLOT_MINUTES), SLOTS_PER_DAY)
+        return first_slot, end_slot
+    
+    @staticmethod
+    def _time_to_minutes(time_str: str) -> int:
+        """Convert "HH:MM" to minutes since midnight."""
+        hours, minutes = map(int, time_str.split(':'))
+        return hours * 60 + minutes
+    
     def _parse_time_slot(self, time_str: str) -> Tuple[str, str]:
         """Parse time slot string into start and end times.
         
@@ -597,14 +738,10 @@ class TimetableProcessor:
         """
         try:
             # Convert to minutes for easier comparison
-            def time_to_minutes(time_str):
-                hours, minutes = map(int, time_str.split(':'))
-                return hours * 60 + minutes
-            
-            start1_min = time_to_minutes(start1)
-            end1_min = time_to_minutes(end1)
-            start2_min = time_to_minutes(start2)
-            end2_min = time_to_minutes(end2)
+            start1_min = self._time_to_minutes(start1)
+            end1_min = self._time_to_minutes(end1)
+            start2_min = self._time_to_minutes(start2)
+            end2_min = self._time_to_minutes(end2)
             
             # Check for overlap
             return not (end1_min <= start2_min or end2_min <= start1_min)
@@ -639,21 +776,21 @@ class TimetableProcessor:
         }
         
         if not course1_alternatives.empty:
-            for _, alt in course1_alternatives.iterrows():
+            for alt in course1_alternatives[['Section', 'Time', 'Class']].itertuples(index=False):
                 recommendation['suggestions'].append({
                     'course': course1,
-                    'alternative_section': alt['Section'],
-                    'alternative_time': alt['Time'],
-                    'alternative_room': alt['Class']
+                    'alternative_section': alt.Section,
+                    'alternative_time': alt.Time,
+                    'alternative_room': alt.Class
                 })
         
         if not course2_alternatives.empty:
-            for _, alt in course2_alternatives.iterrows():
+            for alt in course2_alternatives[['Section', 'Time', 'Class']].itertuples(index=False):
                 recommendation['suggestions'].append({
                     'course': course2,
-                    'alternative_section': alt['Section'],
-                    'alternative_time': alt['Time'],
-                    'alternative_room': alt['Class']
+                    'alternative_section': alt.Section,
+                    'alternative_time': alt.Time,
+                    'alternative_room': alt.Class
                 })
         
         return recommendation
@@ -677,7 +814,7 @@ class TimetableProcessor:
         for course in selected_courses:
             course_data = df[df['Course'] == course]
             if not course_data.empty:
-                available_options[course] = course_data.groupby(['Section', 'Day', 'Time']).first().reset_index()
+                available_options[course] = course_data.groupby(['Section', 'Day', 'Time'], observed=True).first().reset_index()
         
         # Try to find the best combination with minimal conflicts
         best_schedule = self._find_optimal_schedule(available_options)
@@ -792,4 +929,26 @@ class TimetableProcessor:
         Args:
             df: Processed DataFrame to store
         """
-        self._processed_data = df 
\ No newline at end of file
+        self._processed_data = df
+
+
+def parse_timetable_file(filename: str, file_path: str,
+                         processor: Optional[TimetableProcessor] = None) -> Optional[pd.DataFrame]:
+    """Parse one uploaded timetable file based on its extension.
+    
+    Defined at module level so it can run in a worker process.
+    
+    Args:
+        filename: Original file name, used to pick the parser
+        file_path: Path to the saved file
+        processor: Processor to use; a new one is created if omitted
+        
+    Returns:
+        Processed DataFrame, or None for unsupported file types
+    """
+    processor = processor or TimetableProcessor()
+    if filename.endswith('.xlsx'):
+        return processor._process_excel_file(file_path)
+    if filename.endswith('.csv'):
+        return processor._process_csv_file(file_path)
+    return None
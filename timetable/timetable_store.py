@@ -0,0 +1,140 @@
+"""
+Timetable Storage for EdFast Application.
+Keeps processed timetables per user, in process memory or in Redis.
+"""
+
+import json
+import os
+import pickle
+import threading
+from typing import Dict, List, Optional
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+def _add_to_summary(user_summary: Optional[Dict], timetable_id: str, summary: Dict) -> Dict:
+    """Add one timetable to a user's summary, shaped like the debug endpoint output."""
+    user_summary = user_summary or {'timetable_ids': [], 'timetable_count': 0}
+    if timetable_id not in user_summary['timetable_ids']:
+        user_summary['timetable_ids'].append(timetable_id)
+    user_summary['timetable_count'] = len(user_summary['timetable_ids'])
+    user_summary[timetable_id] = summary
+    return user_summary
+
+
+class InMemoryTimetableStore:
+    """Timetables held in a dict; private to one worker process."""
+
+    def __init__(self):
+        self._data = {}
+        self._summary = {}
+        self._lock = threading.Lock()
+
+    def get(self, username: str, timetable_id: str) -> Optional[Dict]:
+        """Return one timetable record, or None if it does not exist."""
+        return self._data.get(username, {}).get(timetable_id)
+
+    def list(self, username: str) -> Dict[str, Dict]:
+        """Return all timetable records of a user keyed by timetable ID."""
+        return dict(self._data.get(username, {}))
+
+    def put(self, username: str, timetable_id: str, record: Dict, summary: Optional[Dict] = None):
+        """Store a timetable record and, if given, its summary."""
+        with self._lock:
+            self._data.setdefault(username, {})[timetable_id] = record
+            if summary is not None:
+                self._summary[username] = _add_to_summary(self._summary.get(username), timetable_id, summary)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Return the per-user summaries maintained by put()."""
+        with self._lock:
+            return {
+                username: dict(user_summary, timetable_ids=list(user_summary['timetable_ids']))
+                for username, user_summary in self._summary.items()
+            }
+
+    def users(self) -> List[str]:
+        """Return usernames that have stored timetables."""
+        return list(self._data.keys())
+
+    def clear(self):
+        """Remove all stored timetables."""
+        with self._lock:
+            self._data.clear()
+            self._summary.clear()
+
+
+class RedisTimetableStore:
+    """Timetables pickled into one Redis hash per user, shared by all workers."""
+
+    def __init__(self, client, prefix: str = "tt:", summary_key: str = "ttsummary"):
+        self._client = client
+        self._prefix = prefix
+        self._summary_key = summary_key
+
+    def _key(self, username: str) -> str:
+        return f"{self._prefix}{username}"
+
+    def get(self, username: str, timetable_id: str) -> Optional[Dict]:
+        """Return one timetable record, or None if it does not exist."""
+        payload = self._client.hget(self._key(username), timetable_id)
+        return pickle.loads(payload) if payload is not None else None
+
+    def list(self, username: str) -> Dict[str, Dict]:
+        """Return all timetable records of a user keyed by timetable ID."""
+        return {
+            timetable_id.decode(): pickle.loads(payload)
+            for timetable_id, payload in self._client.hgetall(self._key(username)).items()
+        }
+
+    def put(self, username: str, timetable_id: str, record: Dict, summary: Optional[Dict] = None):
+        """Store a timetable record and, if given, its summary."""
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        self._client.hset(self._key(username), timetable_id, payload)
+        if summary is not None:
+            current = self._client.hget(self._summary_key, username)
+            user_summary = _add_to_summary(json.loads(current) if current else None, timetable_id, summary)
+            self._client.hset(self._summary_key, username, json.dumps(user_summary))
+
+    def summary(self) -> Dict[str, Dict]:
+        """Return the per-user summaries maintained by put()."""
+        return {
+            username.decode(): json.loads(user_summary)
+            for username, user_summary in self._client.hgetall(self._summary_key).items()
+        }
+
+    def users(self) -> List[str]:
+        """Return usernames that have stored timetables."""
+        return [
+            key.decode()[len(self._prefix):]
+            for key in self._client.scan_iter(match=f"{self._prefix}*")
+        ]
+
+    def clear(self):
+        """Remove all stored timetables."""
+        keys = list(self._client.scan_iter(match=f"{self._prefix}*"))
+        self._client.delete(self._summary_key, *keys)
+
+
+def create_timetable_store():
+    """Create the timetable store for this process.
+
+    Uses Redis when REDIS_URL is set and the redis package is installed,
+    otherwise falls back to process memory.
+    """
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url and redis is not None:
+        try:
+            client = redis.Redis.from_url(redis_url)
+            client.ping()
+            print(f"Timetable store: Redis at {redis_url}")
+            return RedisTimetableStore(client)
+        except Exception as e:
+            print(f"Could not connect to Redis ({str(e)}), storing timetables in memory")
+    elif redis_url:
+        print("Warning: REDIS_URL is set but redis is not installed, storing timetables in memory")
+
+    return InMemoryTimetableStore()